@@ -1,6 +1,8 @@
 """Command handlers for VoiceShell interactive mode."""
 from typing import Any, Optional, Tuple
 
+from .nbest import hypotheses_for, translate_nbest
+
 
 class InteractiveCommandHandlers:
     """Handles built-in commands for VoiceShell interactive mode."""
@@ -83,23 +85,34 @@ class InteractiveCommandHandlers:
         if not cmd:
             return None
 
-        # Try translation
-        translated = self.deps.nlp2cmd_translate(cmd, config=self.config)
+        # Try translation (all STT n-best hypotheses concurrently when available)
+        hyps = hypotheses_for(self.shell, cmd, self.config)
+        hyp, translated = translate_nbest(lambda t: self.deps.nlp2cmd_translate(t, config=self.config), hyps)
         looks_fn = getattr(self.deps, "_looks_like_natural_language", None)
         if (not translated) and callable(looks_fn) and looks_fn(cmd):
-            translated = self.deps.nlp2cmd_translate(cmd, config=self.config, force=True)
+            hyp, translated = translate_nbest(
+                lambda t: self.deps.nlp2cmd_translate(t, config=self.config, force=True), hyps
+            )
+        if translated and hyp:
+            cmd = hyp
 
         if translated:
             if self.deps.nlp2cmd_confirm(translated):
                 try:
-                    self.deps.emit_stt_event_yaml(cmd, action="execute", translated=translated, reason=None)
+                    self.deps.emit_stt_event_yaml(
+                        cmd, action="execute", translated=translated, reason=None, transcript=getattr(self.shell, "last_transcript", None)
+                    )
                 except Exception:
                     pass
                 return translated
             else:
                 try:
                     self.deps.emit_stt_event_yaml(
-                        cmd, action="skipped", translated=translated, reason="confirm_declined"
+                        cmd,
+                        action="skipped",
+                        translated=translated,
+                        reason="confirm_declined",
+                        transcript=getattr(self.shell, "last_transcript", None),
                     )
                 except Exception:
                     pass
@@ -111,7 +124,13 @@ class InteractiveCommandHandlers:
             )
             if not allow_raw:
                 try:
-                    self.deps.emit_stt_event_yaml(cmd, action="skipped", translated=None, reason="no_translation")
+                    self.deps.emit_stt_event_yaml(
+                        cmd,
+                        action="skipped",
+                        translated=None,
+                        reason="no_translation",
+                        transcript=getattr(self.shell, "last_transcript", None),
+                    )
                 except Exception:
                     pass
                 return None
@@ -48,6 +48,49 @@ DEFAULT_CONFIG: dict[str, Any] = {
     "piper_release_tag": "2023.11.14-2",
     "piper_voice_version": "v1.0.0",
     "nlp2cmd_parallel": False,
+    "nlp2cmd_workers": 1,
+    "nlp2cmd_ready_timeout_s": 15,
+    "nlp2cmd_cache": True,
+    "nlp2cmd_cache_ttl_s": 604800,
+    "nlp2cmd_socket": "auto",
+    "nlp2cmd_speculative": True,
+    "nlp2cmd_async": True,
+    "nlp2cmd_hedge_ms": 500,
+    "nlp2cmd_health_interval_s": 10,
+    "nlp2cmd_breaker_failures": 3,
+    "nlp2cmd_breaker_reset_s": 30,
+    "daemon_pipeline": True,
+    "daemon_queue_size": 2,
+    "daemon_wake_window_s": 8,
+    "daemon_devices": [],
+    "daemon_control_socket": "auto",
+    "daemon_deadline_s": 45,
+    "daemon_coalesce_s": 2,
+    "daemon_max_queries": 3,
+    "daemon_local_tier_exec": "local",
+    "daemon_exec_workers": 2,
+    "daemon_exec_timeout_s": 60,
+    "daemon_exec_timeouts": {},
+    "daemon_exec_serialize": [],
+    "daemon_log_format": "text",
+    "daemon_log_max_mb": 10,
+    "daemon_log_backups": 3,
+    "daemon_log_rotate_h": 0,
+    "wake_spotter": "auto",
+    "wake_spotter_model": None,
+    "wake_spotter_window_s": 2.5,
+    "intents_enabled": True,
+    "intent_threshold": 0.85,
+    "intents_file": None,
+    "tier_audit_log": None,
+    "stt_workers": 0,
+    "stt_worker_timeout_s": 120,
+    "stt_draft_provider": None,
+    "stt_draft_model": None,
+    "stt_cascade_min_confidence": 0.6,
+    "stt_reject_non_speech": True,
+    "stt_max_no_speech_prob": 0.6,
+    "stt_nbest": 1,
 }
 
 
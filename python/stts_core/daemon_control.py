@@ -0,0 +1,179 @@
+"""Local control and metrics endpoint for the running daemon.
+
+A Unix socket (default `~/.config/stts-python/daemon.sock`, mode 0600)
+speaking JSON lines, one request per line, like `nlp2cmd_socket`:
+
+    -> {"op": "metrics"}
+    <- {"op": "metrics", "ok": true, "metrics": {...}}
+    -> {"op": "pause"} / {"op": "resume"}
+    -> {"op": "reload", "wake_word": "hejken"}   (wake_word optional)
+
+`metrics` reports utterance rate, per-stage latency histograms, queue
+depths, HTTP / nlp2cmd / cache / STT pool counters and model state.
+`reload` re-reads triggers, local intents and the hot-reloadable config
+keys (`HOT_RELOAD_KEYS`) without restarting the daemon. From a shell:
+
+    python3 -m stts_core.daemon_control metrics
+    python3 -m stts_core.daemon_control pause|resume|reload [--wake-word W]
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import jsonl_socket
+from .jsonl_socket import JsonLinesHandler, JsonLinesServer
+
+# Settings read on every use, safe to change while the daemon runs.
+HOT_RELOAD_KEYS = (
+    "timeout",
+    "vad_silence_ms",
+    "vad_threshold_db",
+    "auto_tts",
+    "stt_reject_non_speech",
+    "stt_max_no_speech_prob",
+    "intent_threshold",
+    "intents_enabled",
+    "nlp2cmd_cache",
+    "daemon_wake_window_s",
+    "safe_mode",
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds), cheap to update."""
+
+    BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, bounds_ms: Sequence[float] = BOUNDS_MS):
+        self.bounds_ms = tuple(float(b) for b in bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.total_ms = 0.0
+        self.n = 0
+
+    def record(self, seconds: float) -> None:
+        ms = float(seconds) * 1000.0
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.total_ms += ms
+        self.n += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound holding the q-quantile (None above the last bound)."""
+        if not self.n:
+            return 0.0
+        rank = q * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.bounds_ms[i] if i < len(self.bounds_ms) else None
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b:g}" for b in self.bounds_ms] + ["inf"]
+        return {
+            "n": self.n,
+            "mean_ms": round(self.total_ms / self.n, 1) if self.n else 0.0,
+            "p50_le_ms": self.quantile(0.5),
+            "p95_le_ms": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class _Handler(JsonLinesHandler):
+    def handle_request(self, req: Dict[str, Any]) -> None:
+        srv: "DaemonControlServer" = self.server  # type: ignore[assignment]
+        try:
+            resp = srv.dispatch(req)
+        except Exception as e:
+            resp = {"op": req.get("op"), "ok": False, "error": str(e)}
+        self.send(resp)
+
+
+class DaemonControlServer(JsonLinesServer):
+    """Control socket bound to a `DaemonHandlers` (and its pipeline, if any)."""
+
+    def __init__(self, path: str, handlers: Any, pipeline: Any = None):
+        self.handlers = handlers
+        self.pipeline = pipeline
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(path, _Handler, in_use_message="daemon control socket in use")
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "DaemonControlServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.2}, name="stts-daemon-control", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def dispatch(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        op = str(req.get("op") or "")
+        h = self.handlers
+        if op == "ping":
+            return {"op": op, "ok": True, "pid": os.getpid()}
+        if op == "metrics":
+            return {"op": op, "ok": True, "metrics": h.metrics(self.pipeline)}
+        if op == "pause":
+            h.pause()
+            return {"op": op, "ok": True, "paused": True}
+        if op == "resume":
+            h.resume()
+            return {"op": op, "ok": True, "paused": False}
+        if op == "reload":
+            return {"op": op, "ok": True, "reloaded": h.reload(wake_word=req.get("wake_word"))}
+        return {"op": op, "ok": False, "error": f"unknown op: {op!r}"}
+
+
+class DaemonControlClient:
+    """One short connection per call; None when the daemon is not reachable."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+
+    def call(self, payload: Dict[str, Any], timeout_s: float = 5.0) -> Optional[Dict[str, Any]]:
+        return jsonl_socket.call(self.path, payload, timeout_s)
+
+
+def control_socket_path(config: Dict[str, Any], config_dir: Path) -> Optional[Path]:
+    """Socket path from config `daemon_control_socket` (auto / path / 0)."""
+    v = str(config.get("daemon_control_socket", "auto") or "").strip()
+    if v.lower() in ("", "0", "off", "false", "no", "n"):
+        return None
+    if v.lower() in ("auto", "1", "on", "true", "yes", "y"):
+        return Path(config_dir) / "daemon.sock"
+    return Path(v).expanduser()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .config import CONFIG_DIR
+
+    ap = argparse.ArgumentParser(description="Control a running stts daemon")
+    ap.add_argument("action", choices=["metrics", "pause", "resume", "reload", "ping"])
+    ap.add_argument("--socket", default=str(CONFIG_DIR / "daemon.sock"))
+    ap.add_argument("--wake-word", help="reload: switch to this wake-word phrase")
+    a = ap.parse_args(argv)
+    req: Dict[str, Any] = {"op": a.action}
+    if a.wake_word:
+        req["wake_word"] = a.wake_word
+    resp = DaemonControlClient(str(Path(a.socket).expanduser())).call(req)
+    if resp is None:
+        print("daemon not running", file=sys.stderr)
+        return 1
+    print(json.dumps(resp.get("metrics", resp), indent=2, ensure_ascii=False, default=str))
+    return 0 if resp.get("ok") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
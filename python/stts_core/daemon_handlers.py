@@ -1,8 +1,16 @@
 """Daemon mode handlers for VoiceShell."""
-import datetime
+import contextlib
 import json
 import sys
-from typing import Any, List, Optional, Tuple
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import Future
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from .exec_pool import DeadlineExpired
+from .log_writer import DaemonLogger
+from .triggers import TriggerIndex, as_index
 
 
 class DaemonHandlers:
@@ -16,11 +24,23 @@ class DaemonHandlers:
         self.nlp2cmd_url: str = "http://localhost:8000"
         self.nlp2cmd_timeout: float = 30.0
         self.execute: bool = True
-        self.triggers: List[Tuple[str, str, bool]] = []
+        self.triggers: TriggerIndex = TriggerIndex()
         self.wake_word: str = "hejken"
         self.wake_patterns: Optional[List[str]] = None
         self.wake_only_two_stage: bool = False
         self.prev_grammar: Optional[str] = None
+        self.client: Any = None
+        self.speak_sink: Optional[Callable[[str], None]] = None
+        self.spotter: Any = None
+        self.trigger_loader: Optional[Callable[[], List[Tuple[str, str, bool]]]] = None
+        self.paused = threading.Event()
+        self._armed_until: Dict[Optional[str], float] = {}
+        self.wake_variants: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self._exec_lock = threading.Lock()
+        self._exec_local = threading.local()
+        self.exec_pool: Any = None
+        self.logger = DaemonLogger()
 
     def init(
         self,
@@ -33,10 +53,11 @@ class DaemonHandlers:
     ) -> int:
         """Initialize daemon mode. Returns exit code if should stop, 0 to continue."""
         self.log_file = log_file
+        self.logger = self._build_logger(log_file)
         self.nlp2cmd_url = nlp2cmd_url
         self.nlp2cmd_timeout = nlp2cmd_timeout
         self.execute = execute
-        self.triggers = list(triggers or [])
+        self.triggers = as_index(triggers)
         self.wake_word = (wake_word or "hejken").strip() or "hejken"
 
         # Mark as daemon mode
@@ -46,6 +67,7 @@ class DaemonHandlers:
             pass
 
         self.shell._suppress_wake_word_logging = True
+        self.shell.event_sink = self.log_event
 
         # Print welcome
         self.deps.cprint(
@@ -77,40 +99,277 @@ class DaemonHandlers:
         except Exception:
             self.wake_only_two_stage = False
 
+        # STT cascade: a draft that matches no wake pattern / trigger is re-decoded
+        if getattr(self.shell.stt, "name", None) == "cascade":
+            self.shell.stt.accept_patterns = self._cascade_accept_patterns()
+            self.log("stt: cascade (draft + accurate on demand)")
+
         if self.wake_only_two_stage:
             try:
                 self.prev_grammar = self.config.get("stt_vosk_grammar")
             except Exception:
                 self.prev_grammar = None
+        else:
+            from .wake_spotter import build_wake_spotter
+
+            try:
+                self.spotter = build_wake_spotter(
+                    self.config, self.wake_word, getattr(self.deps, "generate_wake_word_variants", None)
+                )
+            except Exception as e:
+                self.log(f"⚠️  wake-word spotter disabled: {e}")
+                self.spotter = None
+            if self.spotter is not None:
+                self.log(f"wake-word spotter: {self.spotter.name} ({Path(self.spotter.model_path).name})")
+
+        from .exec_pool import build_exec_pool
+
+        self.exec_pool = build_exec_pool(self.config)
+        if self.exec_pool is not None:
+            self.log(f"exec: {self.exec_pool.max_workers} workers, timeout {self.exec_pool.timeout_s:g}s")
+
+        self.client = self._build_client()
+        if len(self.client.urls) > 1:
+            self.log(f"nlp2cmd services: {len(self.client.urls)} (hedge after {self.client.hedge_delay_s * 1000:.0f} ms)")
+        if self.execute and not self.client.execute:
+            self.log("exec: hedged queries are translation-only, every command runs locally")
+        elif self.client.execute and self._local_tiers_enabled():
+            self.log("exec: intent / cache hits run locally, service answers on the nlp2cmd service "
+                     "(daemon_local_tier_exec: service to send everything there)")
 
         # Health check
         self.log("🔎 Checking nlp2cmd /health ...")
-        if not self.deps.nlp2cmd_service_health(nlp2cmd_url, timeout=2.5):
+        if not self.client.check_health(timeout_s=2.5):
             self.log("❌ nlp2cmd service is not healthy / not reachable")
             self.log("   Start it first, e.g.: nlp2cmd service --host 0.0.0.0 --port 8008")
             if self.shell.tts:
                 try:
-                    self.shell.speak("Serwis nlp2cmd nie odpowiada")
+                    self.speak("Serwis nlp2cmd nie odpowiada")
                 except Exception:
                     pass
+            self.close()
             return 2
+        self.client.start_health_monitor()
 
         if self.shell.tts and self.config.get("startup_tts", True):
-            self.shell.speak(f"Słucham. Powiedz {self.wake_word} i wydaj polecenie.")
+            self.speak(f"Słucham. Powiedz {self.wake_word} i wydaj polecenie.")
 
         return 0
 
-    def log(self, msg: str) -> None:
-        """Log message to stderr and optionally to file."""
-        ts = datetime.datetime.now().strftime("%H:%M:%S")
-        line = f"[{ts}] {msg}"
-        print(line, file=sys.stderr, flush=True)
-        if self.log_file:
+    def speak(self, text: str) -> None:
+        """Speak via `speak_sink` when set (pipeline TTS stage), else directly."""
+        if self.speak_sink is not None:
+            self.speak_sink(text)
+        else:
+            self.shell.speak(text)
+
+    def _build_client(self) -> Any:
+        """Async nlp2cmd client over the comma-separated service URL(s)."""
+        from .nlp2cmd_async import AsyncNLP2CMDClient
+
+        def cfg_float(key: str, default: float) -> float:
             try:
-                with open(self.log_file, "a") as f:
-                    f.write(line + "\n")
+                return float(self.config.get(key, default))
+            except Exception:
+                return default
+
+        def on_health_change(url: str, ok: bool) -> None:
+            self.log(f"{'💚' if ok else '💔'} nlp2cmd {url}: {'healthy' if ok else 'not reachable'}")
+
+        return AsyncNLP2CMDClient(
+            urls=str(self.nlp2cmd_url or "").split(","),
+            timeout_s=float(self.nlp2cmd_timeout or 30.0),
+            execute=self.execute,
+            hedge_delay_s=cfg_float("nlp2cmd_hedge_ms", 500.0) / 1000.0,
+            health_interval_s=cfg_float("nlp2cmd_health_interval_s", 10.0),
+            breaker_failures=int(cfg_float("nlp2cmd_breaker_failures", 3)),
+            breaker_reset_s=cfg_float("nlp2cmd_breaker_reset_s", 30.0),
+            query_fn=self.deps.nlp2cmd_service_query,
+            health_fn=self.deps.nlp2cmd_service_health,
+            on_health_change=on_health_change,
+        )
+
+    def pause(self) -> None:
+        if not self.paused.is_set():
+            self.paused.set()
+            self.log("⏸️  Listening paused")
+
+    def resume(self) -> None:
+        if self.paused.is_set():
+            self.paused.clear()
+            self.log("▶️  Listening resumed")
+
+    def set_wake_word(self, wake_word: str) -> None:
+        """Switch the wake-word phrase (patterns, STT log suppression, spotter)."""
+        self.wake_word = str(wake_word).strip() or self.wake_word
+        pat = self.deps._wake_word_phrase_to_pattern(self.wake_word)
+        self.wake_patterns = [pat] if pat else None
+        if pat:
+            self.config["daemon_wake_patterns"] = [pat]
+        if self.spotter is not None:
+            from .wake_spotter import build_wake_spotter
+
+            self.spotter = build_wake_spotter(
+                self.config, self.wake_word, getattr(self.deps, "generate_wake_word_variants", None)
+            )
+        if getattr(self.shell.stt, "name", None) == "cascade":
+            self.shell.stt.accept_patterns = self._cascade_accept_patterns()
+        self.log(f"wake-word: {self.wake_word}")
+
+    def reload(self, wake_word: Optional[str] = None) -> List[str]:
+        """Hot-reload triggers, local intents, tunable config keys and (optionally) the wake word."""
+        from .daemon_control import HOT_RELOAD_KEYS
+
+        done: List[str] = []
+        if self.trigger_loader is not None:
+            self.reload_triggers()
+            done.append(f"triggers ({len(self.triggers)})")
+        load_config = getattr(self.deps, "load_config", None)
+        if callable(load_config):
+            fresh = load_config()
+            changed = [k for k in HOT_RELOAD_KEYS if k in fresh and fresh[k] != self.config.get(k)]
+            for k in changed:
+                self.config[k] = fresh[k]
+            done.append(f"config ({', '.join(changed) or 'no changes'})")
+        reset_intents = getattr(self.deps, "reset_intent_engine", None)
+        if callable(reset_intents):
+            reset_intents()
+            done.append("intents")
+        if wake_word:
+            self.set_wake_word(wake_word)
+            done.append(f"wake-word ({self.wake_word})")
+        self.log(f"🔄 Reloaded: {'; '.join(done) or 'nothing'}")
+        return done
+
+    def reload_triggers(self) -> None:
+        """Re-run `trigger_loader` (compiles a fresh `TriggerIndex`)."""
+        self.triggers = as_index(self.trigger_loader())
+        if getattr(self.shell.stt, "name", None) == "cascade":
+            self.shell.stt.accept_patterns = self._cascade_accept_patterns()
+
+    def metrics(self, pipeline: Any = None) -> dict:
+        """Live metrics for the control socket (pipeline, HTTP, nlp2cmd, cache, STT)."""
+        out: dict = {"paused": self.paused.is_set(), "wake_word": self.wake_word, "triggers": len(self.triggers)}
+        if pipeline is not None:
+            out["pipeline"] = pipeline.snapshot()
+        try:
+            from .http_client import get_client
+
+            out["http"] = get_client().metrics.snapshot()
+        except Exception:
+            pass
+        if self.client is not None:
+            out["nlp2cmd_service"] = {
+                "healthy": self.client.healthy(),
+                "pending": self.client.pending(),
+                **dict(self.client.stats),
+            }
+        ready_state = getattr(self.deps, "nlp2cmd_ready_state", None)
+        if callable(ready_state):
+            out["nlp2cmd_workers"] = ready_state()
+        cache = self._cache()
+        if cache is not None:
+            st = dict(cache.stats)
+            lookups = st.get("hits", 0) + st.get("misses", 0)
+            st["hit_rate"] = round(st.get("hits", 0) / lookups, 3) if lookups else 0.0
+            out["cache"] = st
+        get_audit = getattr(self.deps, "get_tier_audit", None)
+        if callable(get_audit):
+            try:
+                out["tiers"] = dict(get_audit(self.config).counts)
             except Exception:
                 pass
+        stt = self.shell.stt
+        out["stt"] = {
+            "provider": getattr(stt, "name", None),
+            "model": getattr(stt, "model", None),
+            "loaded": stt is not None,
+        }
+        pool = getattr(self.shell, "_stt_pool", None)
+        if pool is not None:
+            out["stt"]["pool"] = dict(pool.stats)
+        if self.spotter is not None:
+            out["wake_spotter"] = dict(self.spotter.stats)
+        if self.exec_pool is not None:
+            out["exec"] = dict(self.exec_pool.stats)
+        if self.wake_variants:
+            with self._stats_lock:
+                out["wake_variants"] = dict(self.wake_variants)
+        return out
+
+    def close(self) -> None:
+        """Cancel outstanding nlp2cmd queries, stop the client and the exec pool."""
+        if self.exec_pool is not None:
+            pending = self.exec_pool.stats["running"] + self.exec_pool.stats["queued"]
+            if pending:
+                self.log(f"🛑 Stopping {pending} command(s) still running / queued")
+            self.exec_pool.close()
+            self.exec_pool = None
+        if self.client is not None:
+            n = self.client.cancel_all()
+            if n:
+                self.log(f"🛑 Cancelled {n} pending nlp2cmd quer{'y' if n == 1 else 'ies'}")
+            self.client.close()
+            self.client = None
+
+    def _cascade_accept_patterns(self) -> List[str]:
+        """Regexes a cascade draft must match to skip the accurate model."""
+        import re
+
+        pats = list(self.wake_patterns or [])
+        if not pats:
+            from .wake_word import WAKE_WORD_PATTERNS
+
+            pats = list(WAKE_WORD_PATTERNS)
+        for pattern, _cmd, is_regex in self.triggers:
+            pats.append(pattern if is_regex else re.escape(pattern))
+        return pats
+
+    def _build_logger(self, log_file: Optional[str]) -> DaemonLogger:
+        """Buffered daemon log (config `daemon_log_format`, `daemon_log_max_mb`, ...)."""
+        def cfg_float(key: str, default: float) -> float:
+            try:
+                return float(self.config.get(key, default))
+            except Exception:
+                return default
+
+        return DaemonLogger(
+            log_file or None,
+            json_lines=str(self.config.get("daemon_log_format", "text")).strip().lower() in ("json", "jsonl"),
+            max_bytes=int(cfg_float("daemon_log_max_mb", 10) * 1024 * 1024),
+            backups=int(cfg_float("daemon_log_backups", 3)),
+            max_age_s=cfg_float("daemon_log_rotate_h", 0) * 3600.0,
+        )
+
+    def log(self, msg: str) -> None:
+        """Log message to stderr and (buffered) to the log file."""
+        self.logger.log(msg)
+
+    def log_event(self, event: str, **fields: Any) -> None:
+        """Structured record for the JSON-lines log (stage timings, executions)."""
+        self.logger.event(event, **fields)
+
+    def log_context(self, **fields: Any) -> ContextManager[None]:
+        """Tag every log line / event of this thread with `fields` (e.g. utt=7)."""
+        return self.logger.context(**fields)
+
+    @contextlib.contextmanager
+    def exec_scope(self, deadline: Optional[float] = None) -> Iterator[List[Future]]:
+        """Commands this thread hands to the exec pool inside the block get `deadline`.
+
+        Yields the list their Futures are appended to, so the caller can wait
+        for (or time) the actual execution.
+        """
+        prev = getattr(self._exec_local, "scope", None)
+        futures: List[Future] = []
+        self._exec_local.scope = (deadline, futures)
+        try:
+            yield futures
+        finally:
+            self._exec_local.scope = prev
+
+    def close_log(self) -> None:
+        self.logger.close()
 
     def listen_with_wake_word(self) -> Optional[str]:
         """Listen for audio, optionally with wake-word grammar."""
@@ -134,24 +393,92 @@ class DaemonHandlers:
                     self.config["stt_vosk_grammar"] = self.prev_grammar
             except Exception:
                 pass
+        elif self.spotter is not None:
+            self.shell.last_transcript = None
+            audio_path = self.shell.capture()
+            text = self.shell.transcribe(audio_path) if audio_path and self.wake_gate(audio_path) else ""
         else:
             text = self.shell.listen()
 
         return text
 
-    def process_wake_word(self, text: str) -> Tuple[bool, str]:
-        """Process wake word detection. Returns (should_continue, command)."""
-        self.log(f"📝 Heard: {text}")
+    def wake_gate(self, audio_path: str, source: Optional[str] = None) -> bool:
+        """False when the wake-word spotter rules the recording out (skip full STT)."""
+        if self.spotter is None or self._armed(source):
+            return True
+        return self.spotter.detect(audio_path) is not False
+
+    def _armed(self, source: Optional[str] = None) -> bool:
+        return time.monotonic() <= self._armed_until.get(source, 0.0)
+
+    def _arm(self, source: Optional[str] = None) -> None:
+        try:
+            window = float(self.config.get("daemon_wake_window_s", 8))
+        except Exception:
+            window = 8.0
+        self._armed_until[source] = time.monotonic() + window
+
+    def note_transcript(self, text: str, source: Optional[str] = None) -> None:
+        """Arm `source` as soon as a bare wake word is transcribed.
+
+        Called on the STT thread: `process_wake_word` arms too, but only once
+        the NLP stage gets to the utterance, by which time the spotter may
+        already have rejected the command that followed the wake word.
+        """
+        if self.spotter is None or not text:
+            return
         matched, remaining = self.deps.check_wake_word(text, patterns=self.wake_patterns)
+        if matched and not self.deps.normalize_daemon_command(remaining or ""):
+            self._arm(source)
+
+    def _match_wake_word(self, text: str) -> Tuple[bool, str]:
+        """(matched, remaining); reuses the match `VoiceShell.transcribe` made for its log line."""
+        match_wake = getattr(self.deps, "match_wake_word", None)
+        if not callable(match_wake):
+            return self.deps.check_wake_word(text, patterns=self.wake_patterns)
+        cached = getattr(self.shell, "last_wake_match", None)
+        if cached is not None and cached[0] == text and cached[1] == tuple(self.wake_patterns or ()):
+            wm = cached[2]
+        else:
+            wm = match_wake(text, patterns=self.wake_patterns)
+        if wm is None:
+            return False, text
+        with self._stats_lock:
+            self.wake_variants[wm.pattern] = self.wake_variants.get(wm.pattern, 0) + 1
+        self.log_event("wake", variant=wm.variant, pattern=wm.pattern)
+        return True, wm.remaining
+
+    def process_wake_word(self, text: str, follow_up: bool = True, source: Optional[str] = None) -> Tuple[bool, str]:
+        """Process wake word detection. Returns (should_continue, command).
+
+        A bare wake word listens for the command right away (`follow_up`);
+        without it the next utterance from the same `source` (capture device)
+        within `daemon_wake_window_s` is taken as the command instead.
+        """
+        self.log(f"📝 Heard{f' [{source}]' if source else ''}: {text}")
+        matched, remaining = self._match_wake_word(text)
 
         if not matched:
+            if self._armed(source):
+                self._armed_until.pop(source, None)
+                remaining = self.deps.normalize_daemon_command(text)
+                self.log(f"📝 Command: {remaining}")
+                if not remaining:
+                    self.log("❌ Empty command after normalization")
+                    return False, ""
+                return True, remaining
             self.log("⏭️  No wake word, ignoring")
             return False, ""
 
+        self._armed_until.pop(source, None)
         if not remaining:
-            self.log("🔔 Wake word detected, listening for command...")
             if self.shell.tts:
-                self.shell.speak("Słucham")
+                self.speak("Słucham")
+            if not follow_up:
+                self.log("🔔 Wake word detected, waiting for command...")
+                self._arm(source)
+                return False, ""
+            self.log("🔔 Wake word detected, listening for command...")
             remaining = self.shell.listen()
             if not remaining:
                 self.log("❌ No command heard")
@@ -170,50 +497,178 @@ class DaemonHandlers:
 
     def check_triggers(self, command: str) -> bool:
         """Check if command matches a trigger. Returns True if handled."""
-        trig_cmd = self.deps.match_trigger(command, self.triggers)
+        trig_cmd = self.match_trigger_command(command)
         if not trig_cmd:
             return False
+        self.run_trigger(trig_cmd)
+        return True
 
+    def match_trigger_command(self, command: str) -> Optional[str]:
+        """Shell command of the trigger matching `command`, or None."""
+        if self.trigger_loader is not None and self.triggers.changed():
+            try:
+                self.reload_triggers()
+                self.log(f"🔄 Triggers file changed, reloaded: {len(self.triggers)}")
+            except Exception as e:
+                self.log(f"⚠️  Triggers reload failed: {e}")
+        trig_cmd = self.deps.match_trigger(command, self.triggers)
+        if not trig_cmd:
+            return None
         self.log(f"⚡ Trigger matched -> {trig_cmd}")
+        self._audit("trigger", command, trig_cmd)
+        return trig_cmd
+
+    def run_trigger(self, trig_cmd: str) -> None:
+        """Safety-check and run a matched trigger command."""
         ok, reason = self.deps.check_command_safety(trig_cmd, self.config, dry_run=False)
         if not ok:
             self.log(f"🚫 Trigger blocked: {reason}")
-            return True
+            return
 
+        if self.exec_pool is not None:
+            self._submit_exec(trig_cmd, "trigger")
+            return
+        t0 = time.perf_counter()
         out, code, printed = self.shell.run_command_any(trig_cmd)
+        self.log_event("exec", source="trigger", cmd=trig_cmd, exit_code=code, ms=round((time.perf_counter() - t0) * 1000, 1))
         if out.strip() and not printed:
             print(out)
         if code != 0:
             self.log(f"❌ Exit code: {code}")
-        return True
 
-    def query_nlp2cmd(self, command: str) -> Optional[dict]:
-        """Query nlp2cmd service. Returns result dict or None on failure."""
-        query_text = f"shell: {command}"
-        self.log(f"🚀 Sending to nlp2cmd: {query_text}")
+    def _audit(self, tier: str, text: str, cmd: Optional[str], confidence: Optional[float] = None) -> None:
+        get_audit = getattr(self.deps, "get_tier_audit", None)
+        if callable(get_audit):
+            try:
+                get_audit(self.config).record(tier, text, cmd, confidence)
+            except Exception:
+                pass
 
-        result = self.deps.nlp2cmd_service_query(
-            query=query_text,
-            url=self.nlp2cmd_url,
-            execute=self.execute,
-            timeout=float(self.nlp2cmd_timeout or 30.0),
-        )
+    def match_intent(self, command: str) -> Optional[dict]:
+        """Resolve command with the local intent matcher. Returns result dict or None."""
+        get_engine = getattr(self.deps, "get_intent_engine", None)
+        engine = get_engine(self.config) if callable(get_engine) else None
+        if engine is None:
+            return None
+        m = engine.match(command)
+        if m is None:
+            return None
+        self.log(f"⚡ Intent matched ({m.tier}, {m.confidence:.2f}): {m.intent} -> {m.command}")
+        self._audit("intent", command, m.command, m.confidence)
+        return {"success": True, "command": m.command, "confidence": m.confidence, "intent": m.intent}
+
+    def _local_tiers_enabled(self) -> bool:
+        """Intent / cache tiers answer unless commands must run on the nlp2cmd service.
+
+        Their commands are executed locally; with service-side execution in
+        effect and `daemon_local_tier_exec: service` every query goes to the
+        service instead, so all commands run in one place.
+        """
+        if str(self.config.get("daemon_local_tier_exec", "local")).strip().lower() != "service":
+            return True
+        return not (self.client is not None and self.client.execute)
 
+    def _local_result(self, command: str) -> Optional[dict]:
+        """Intent / cache tiers (no network). Returns result dict or None."""
+        if not self._local_tiers_enabled():
+            return None
+        intent = self.match_intent(command)
+        if intent is not None:
+            return intent
+
+        cache = self._cache()
+        if cache is not None:
+            cached = cache.get(command)
+            if cached:
+                self.log(f"⚡ nlp2cmd cache hit: {cached}")
+                self._audit("cache", command, cached)
+                return {"success": True, "command": cached, "confidence": 1.0, "cached": True}
+        return None
+
+    def _cache(self) -> Any:
+        get_cache = getattr(self.deps, "get_translation_cache", None)
+        return get_cache(self.config) if callable(get_cache) else None
+
+    def _service_result(self, command: str, result: Optional[dict]) -> Optional[dict]:
+        """Validate a service response (speaks/logs failures, fills the cache)."""
         if not result:
             self.log("❌ nlp2cmd query failed")
             if self.shell.tts:
-                self.shell.speak("Nie udało się przetworzyć")
+                self.speak("Nie udało się przetworzyć")
             return None
 
         if not result.get("success"):
             errors = result.get("errors") or ["Unknown error"]
             self.log(f"❌ nlp2cmd error: {errors}")
             if self.shell.tts:
-                self.shell.speak(f"Błąd: {errors[0][:50]}")
+                self.speak(f"Błąd: {errors[0][:50]}")
             return None
 
+        self._audit("service", command, result.get("command"), result.get("confidence"))
+        cache = self._cache()
+        if cache is not None and result.get("command"):
+            cache.put(command, str(result.get("command")))
         return result
 
+    def _submit_service(self, command: str) -> Future:
+        query_text = f"shell: {command}"
+        self.log(f"🚀 Sending to nlp2cmd: {query_text}")
+        if self.client is None:
+            self.client = self._build_client()
+        return self.client.submit(query_text)
+
+    def query_nlp2cmd(self, command: str) -> Optional[dict]:
+        """Query nlp2cmd (blocking). Returns result dict or None on failure."""
+        local = self._local_result(command)
+        if local is not None:
+            return local
+        try:
+            result = self._submit_service(command).result(timeout=float(self.nlp2cmd_timeout or 30.0) + 5.0)
+        except Exception:
+            result = None
+        return self._service_result(command, result)
+
+    def dispatch_nlp2cmd(self, command: str) -> Optional[Future]:
+        """Translate and execute `command` without blocking the listening loop.
+
+        Local tiers execute immediately, on this machine (see
+        `_local_tiers_enabled`). Service queries run in the background;
+        the returned Future (cancellable) resolves to the service response and
+        the result is handed to the exec pool (or, without one, executed from
+        a helper thread, one execution at a time).
+        """
+        local = self._local_result(command)
+        if local is not None:
+            with self._serial_exec():
+                self.execute_from_result(local)
+            return None
+        fut = self._submit_service(command)
+        if not self.config.get("nlp2cmd_async", True):
+            self._finish_query(command, fut)
+            return fut
+        threading.Thread(target=self._finish_query, args=(command, fut), name="stts-daemon-exec", daemon=True).start()
+        return fut
+
+    def _serial_exec(self) -> ContextManager[Any]:
+        """Inline execution (no exec pool) runs one command at a time."""
+        return self._exec_lock if self.exec_pool is None else contextlib.nullcontext()
+
+    def _finish_query(self, command: str, fut: Future) -> None:
+        try:
+            result = fut.result(timeout=float(self.nlp2cmd_timeout or 30.0) + 5.0)
+        except Exception:
+            if fut.cancelled():
+                self.log(f"⏹️  nlp2cmd query cancelled: {command}")
+                return
+            result = None
+        try:
+            with self._serial_exec():
+                result = self._service_result(command, result)
+                if result is not None:
+                    self.execute_from_result(result)
+        except Exception as e:
+            self.log(f"❌ Error: {e}")
+
     def execute_from_result(self, result: dict) -> None:
         """Execute command from nlp2cmd result."""
         cmd = result.get("command", "")
@@ -221,16 +676,25 @@ class DaemonHandlers:
         self.log(f"✅ Command: {cmd} (confidence: {confidence:.2f})")
 
         if self.shell.tts:
-            self.shell.speak(f"Wykonuję: {cmd[:80]}")
+            self.speak(f"Wykonuję: {cmd[:80]}")
 
         exec_result = result.get("execution_result")
         if exec_result:
             self._handle_service_execution(exec_result)
+        elif result.get("intent") or result.get("cached"):
+            self._handle_local_execution(cmd, "local tier")
         else:
             self._handle_local_execution(cmd)
 
     def _handle_service_execution(self, exec_result: dict) -> None:
         """Handle execution that was done by nlp2cmd service."""
+        self.log_event(
+            "exec",
+            source="service",
+            exit_code=exec_result.get("exit_code"),
+            ms=exec_result.get("duration_ms"),
+            ok=bool(exec_result.get("success")),
+        )
         if exec_result.get("success"):
             exit_code = exec_result.get("exit_code")
             duration_ms = exec_result.get("duration_ms")
@@ -253,7 +717,7 @@ class DaemonHandlers:
             if stdout.strip() and self.shell.tts:
                 lines = [l.strip() for l in stdout.splitlines() if l.strip()]
                 if lines:
-                    self.shell.speak(lines[-1][:100])
+                    self.speak(lines[-1][:100])
         else:
             exit_code = exec_result.get("exit_code")
             duration_ms = exec_result.get("duration_ms")
@@ -272,28 +736,71 @@ class DaemonHandlers:
                 except Exception:
                     pass
             if self.shell.tts:
-                self.shell.speak("Komenda nie powiodła się")
+                self.speak("Komenda nie powiodła się")
 
-    def _handle_local_execution(self, cmd: str) -> None:
-        """Handle local execution when service only returned translation."""
-        self.log(f"▶️  Executing locally (nlp2cmd returned only translation): {cmd}")
+    def _handle_local_execution(self, cmd: str, why: str = "nlp2cmd returned only translation") -> None:
+        """Handle local execution (service only returned a translation, or a local tier answered)."""
+        self.log(f"▶️  Executing locally ({why}): {cmd}")
 
         ok, reason = self.deps.check_command_safety(cmd, self.config, dry_run=False)
         if not ok:
             self.log(f"🚫 Blocked (local execute): {reason}")
             if self.shell.tts:
-                self.shell.speak("Zablokowano komendę")
+                self.speak("Zablokowano komendę")
             return
 
+        if self.exec_pool is not None:
+            self._submit_exec(cmd, "local")
+            return
+        t0 = time.perf_counter()
         out, code, _ = self.shell.run_command_any(cmd)
+        self.log_event("exec", source="local", cmd=cmd, exit_code=code, ms=round((time.perf_counter() - t0) * 1000, 1))
+        self._report_output(out, code)
+
+    def _report_output(self, out: str, code: int) -> None:
         if out.strip():
-            print(out, flush=True)
+            print(out, end="" if out.endswith("\n") else "\n", flush=True)
             lines = [l.strip() for l in out.splitlines() if l.strip()]
             if lines and self.shell.tts:
-                self.shell.speak(lines[-1][:100])
+                self.speak(lines[-1][:100])
         if code != 0:
             self.log(f"❌ Exit code: {code}")
 
+    def _submit_exec(self, cmd: str, source: str) -> Future:
+        """Run `cmd` on the exec pool; the outcome is logged / spoken when it finishes."""
+        queued = self.exec_pool.stats["running"] + self.exec_pool.stats["queued"]
+        if queued:
+            self.log(f"⏳ Queued ({queued} command(s) ahead or running): {cmd}")
+        deadline, futures = getattr(self._exec_local, "scope", None) or (None, None)
+        fut = self.exec_pool.submit(cmd, deadline=deadline)
+        if futures is not None:
+            futures.append(fut)
+        fields = dict(self.logger.current_context())
+        fut.add_done_callback(lambda f: self._exec_done(cmd, source, f, fields))
+        return fut
+
+    def _exec_done(self, cmd: str, source: str, fut: Future, fields: Dict[str, Any]) -> None:
+        with self.log_context(**fields):
+            if fut.cancelled():
+                self.log(f"⏹️  Not executed (daemon stopping): {cmd}")
+                return
+            exc = fut.exception()
+            if isinstance(exc, DeadlineExpired):
+                self.log(f"⌛ Not executed (waited too long in the exec queue): {cmd}")
+                return
+            if exc is not None:
+                self.log(f"❌ Error: {exc}")
+                return
+            res = fut.result()
+            self.log_event(
+                "exec", source=source, cmd=cmd, exit_code=res.exit_code, ms=round(res.duration_s * 1000, 1), timed_out=res.timed_out
+            )
+            if res.timed_out:
+                self.log(f"⏰ Killed after timeout: {cmd}")
+                if self.shell.tts:
+                    self.speak("Przekroczono czas wykonania")
+            self._report_output(res.output, res.exit_code)
+
     def handle_error(self, e: Exception) -> bool:
         """Handle daemon loop error. Returns True if should stop (KeyboardInterrupt)."""
         if isinstance(e, KeyboardInterrupt):
@@ -0,0 +1,548 @@
+"""Staged daemon engine: capture → STT → NLP → exec → TTS.
+
+The serial daemon loop stops listening while an utterance is decoded,
+translated and executed (up to the 60 s command timeout). Here every stage
+runs on its own thread, connected by bounded queues:
+
+    capture ─▶ [stt] ─▶ STT ─▶ [nlp] ─▶ wake word / trigger / nlp2cmd ─▶ [exec] ─▶ exec
+                                                                   speak() ─▶ [tts] ─▶ TTS
+
+A full queue blocks the stage feeding it (backpressure), so at most
+`queue_size` utterances wait per stage and the microphone pauses only when
+every later stage is saturated. Each stage has a single worker, which keeps
+utterances in order. The exec stage hands commands to the daemon's
+`ExecPool` (timeouts, bounded concurrency, see `exec_pool`), whose results
+come back through speak(); with `daemon_exec_workers: 0` it runs them
+itself, one at a time. Commands handed to the pool carry the utterance's
+deadline, so one still queued there when it expires is dropped too, and
+the end-to-end latency is recorded when the command actually finishes. Capture also pauses
+while TTS is playing so the daemon does not transcribe its own voice. Speech
+is queued separately; when the TTS backlog is full the oldest line is dropped.
+
+Under load the pipeline degrades instead of queueing without bound:
+
+  - admission: utterances older than `deadline_s` (since the end of the
+    recording) are dropped before STT, NLP and execution (also while
+    waiting in the exec pool); keep it above the nlp2cmd timeout,
+  - the same command heard again within `coalesce_s` (e.g. by two
+    microphones, or a repeated utterance) is dropped,
+  - nlp2cmd-bound commands are translated off the NLP thread (at most
+    `max_queries` at once, further ones are refused) and released to exec
+    in the order they were spoken, while trigger-matched commands skip
+    ahead of them (the exec queue is a `PriorityFifo`).
+
+Every decision is counted in `stats["admission"]`.
+
+With several capture `devices` (rooms) each gets its own capture thread and
+wake-word state, while the STT model and the nlp2cmd client stay shared. The
+STT and NLP queues are `FairQueue`s: bounded per device and served
+round-robin, so one busy room cannot starve the others.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Sequence
+
+from .daemon_control import LatencyHistogram
+from .exec_pool import DeadlineExpired
+
+
+@dataclass
+class Utterance:
+    """One captured utterance on its way through the pipeline."""
+
+    seq: int
+    device: Optional[str] = None
+    audio_path: Optional[str] = None
+    owns_audio: bool = True
+    text: str = ""
+    command: str = ""
+    trigger: Optional[str] = None
+    result: Optional[dict] = None
+    captured_at: float = field(default_factory=time.monotonic)
+    priority: int = 1  # 0: trigger-matched, 1: nlp2cmd-bound
+    answered: bool = False
+
+
+class FairQueue:
+    """Bounded per-key FIFOs served round-robin (`queue.Queue`-compatible subset).
+
+    `put` blocks (or raises `queue.Full`) only when the item's own key is at
+    `maxsize`; `get` takes the head of the next non-empty key in turn.
+    """
+
+    def __init__(self, maxsize: int = 2, key: Callable[[Any], Hashable] = lambda item: None):
+        self.maxsize = max(1, int(maxsize))
+        self._key = key
+        self._queues: "OrderedDict[Hashable, Deque[Any]]" = OrderedDict()
+        self._cond = threading.Condition()
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        k = self._key(item)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            q = self._queues.setdefault(k, deque())
+            while len(q) >= self.maxsize:
+                left = None if deadline is None else deadline - time.monotonic()
+                if not block or (left is not None and left <= 0):
+                    raise queue.Full
+                self._cond.wait(left)
+            q.append(item)
+            self._cond.notify_all()
+
+    def put_nowait(self, item: Any) -> None:
+        self.put(item, block=False)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for k in list(self._queues):
+                    q = self._queues[k]
+                    if q:
+                        item = q.popleft()
+                        self._queues.move_to_end(k)  # this key goes to the back of the line
+                        self._cond.notify_all()
+                        return item
+                left = None if deadline is None else deadline - time.monotonic()
+                if not block or (left is not None and left <= 0):
+                    raise queue.Empty
+                self._cond.wait(left)
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def depths(self) -> Dict[Hashable, int]:
+        with self._cond:
+            return {k: len(q) for k, q in self._queues.items()}
+
+
+class PriorityFifo(queue.Queue):
+    """Bounded queue served by `priority(item)` (lowest first), FIFO within a priority."""
+
+    def __init__(self, maxsize: int = 0, priority: Callable[[Any], int] = lambda item: 0):
+        self._priority = priority
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self.queue: List[Any] = []
+        self._order = itertools.count()
+
+    def _qsize(self) -> int:
+        return len(self.queue)
+
+    def _put(self, item: Any) -> None:
+        heapq.heappush(self.queue, (self._priority(item), next(self._order), item))
+
+    def _get(self) -> Any:
+        return heapq.heappop(self.queue)[-1]
+
+
+class StagedDaemonPipeline:
+    """Runs `DaemonHandlers` logic as concurrent stages with bounded queues."""
+
+    STAGES = ("capture", "stt", "nlp", "query", "exec", "tts")
+
+    def __init__(
+        self,
+        handlers: Any,
+        queue_size: int = 2,
+        tts_queue_size: int = 4,
+        tmp_dir: Optional[str] = None,
+        devices: Optional[Sequence[str]] = None,
+        deadline_s: float = 45.0,
+        coalesce_s: float = 2.0,
+        max_queries: int = 3,
+    ):
+        self.handlers = handlers
+        self.shell = handlers.shell
+        self.queue_size = max(1, int(queue_size))
+        self.tmp_dir = tmp_dir
+        # None = the configured `mic_device` (single-microphone daemon)
+        self.devices: List[Optional[str]] = list(dict.fromkeys(devices or [])) or [None]
+        by_device = lambda item: item.device  # noqa: E731
+        self.queues: Dict[str, Any] = {
+            "stt": FairQueue(self.queue_size, key=by_device),
+            "nlp": FairQueue(self.queue_size, key=by_device),
+            "exec": PriorityFifo(self.queue_size, priority=lambda item: item.priority),
+            "tts": queue.Queue(maxsize=max(1, int(tts_queue_size))),
+        }
+        self.stats: Dict[str, Any] = {
+            name: {"processed": 0, "errors": 0, "busy_s": 0.0} for name in self.STAGES
+        }
+        self.stats.update({"backpressure_waits": 0, "tts_dropped": 0})
+        self.stats["admission"] = {"admitted": 0, "shed_stale": 0, "shed_overload": 0, "coalesced": 0, "prioritized": 0}
+        self.deadline_s = float(deadline_s)
+        self.coalesce_s = float(coalesce_s)
+        self.max_queries = max(1, int(max_queries))
+        self._queries = ThreadPoolExecutor(max_workers=self.max_queries, thread_name_prefix="stts-daemon-query")
+        # nlp2cmd-bound utterances in spoken order, released to exec as their answers arrive
+        self._in_flight: Deque[Utterance] = deque()
+        self._release_lock = threading.Lock()
+        self._recent: "OrderedDict[str, float]" = OrderedDict()
+        self.stats["devices"] = {str(d or "default"): {"captured": 0, "transcribed": 0} for d in self.devices}
+        self.latency = {name: LatencyHistogram() for name in self.STAGES + ("end_to_end",)}
+        self.started_at = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._stop = threading.Event()
+        self._tts_pending = 0
+        self._tts_idle = threading.Event()
+        self._tts_idle.set()
+        self._threads: list = []
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def start(self) -> "StagedDaemonPipeline":
+        self.handlers.speak_sink = self._enqueue_speech
+        workers: List[Any] = [
+            (f"capture-{i}" if len(self.devices) > 1 else "capture", lambda d=d: self._capture_loop(d))
+            for i, d in enumerate(self.devices)
+        ]
+        workers += [
+            ("stt", lambda: self._worker("stt", self._stt_stage)),
+            ("nlp", lambda: self._worker("nlp", self._nlp_stage)),
+            ("exec", lambda: self._worker("exec", self._exec_stage)),
+            ("tts", lambda: self._worker("tts", self._tts_stage)),
+        ]
+        for name, target in workers:
+            t = threading.Thread(target=target, name=f"stts-daemon-{name}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self, timeout_s: float = 2.0) -> None:
+        """Stop all stages; recordings still queued are deleted."""
+        self._stop.set()
+        self.handlers.speak_sink = None
+        deadline = time.monotonic() + float(timeout_s)
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(max(0.0, deadline - time.monotonic()))
+        while True:
+            try:
+                item = self.queues["stt"].get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, Utterance):
+                self._discard_audio(item)
+        self._queries.shutdown(wait=False)
+
+    def run(self) -> None:
+        """Start the stages and block until `stop()` or Ctrl+C."""
+        self.start()
+        try:
+            while not self._stop.wait(0.5):
+                pass
+        finally:
+            self.stop()
+
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def depths(self) -> Dict[str, int]:
+        return {name: q.qsize() for name, q in self.queues.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, latency histograms and queue depths (for the control socket)."""
+        uptime = max(1e-9, time.monotonic() - self.started_at)
+        with self._stats_lock:
+            stages = {
+                name: {
+                    "processed": self.stats[name]["processed"],
+                    "errors": self.stats[name]["errors"],
+                    "busy_s": round(self.stats[name]["busy_s"], 3),
+                    "latency": self.latency[name].snapshot(),
+                }
+                for name in self.STAGES
+            }
+            devices = {k: dict(v) for k, v in self.stats["devices"].items()}
+            end_to_end = self.latency["end_to_end"].snapshot()
+            extra = {
+                "backpressure_waits": self.stats["backpressure_waits"],
+                "tts_dropped": self.stats["tts_dropped"],
+                "admission": dict(self.stats["admission"]),
+                "queries_in_flight": len(self._in_flight),
+            }
+        utterances = sum(d["captured"] for d in devices.values())
+        return {
+            "uptime_s": round(uptime, 1),
+            "utterances": utterances,
+            "utterances_per_s": round(utterances / uptime, 3),
+            "stages": stages,
+            "end_to_end": end_to_end,
+            "queues": self.depths(),
+            "devices": devices,
+            **extra,
+        }
+
+    # -- plumbing ------------------------------------------------------------
+
+    def _put(self, name: str, item: Any) -> bool:
+        """Blocking put (backpressure); gives up only when the pipeline stops."""
+        q = self.queues[name]
+        waited = False
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                if not waited:
+                    waited = True
+                    with self._stats_lock:
+                        self.stats["backpressure_waits"] += 1
+        return False
+
+    def _worker(self, name: str, fn: Callable[[Any], None]) -> None:
+        q = self.queues[name]
+        while not self._stop.is_set():
+            try:
+                item = q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if isinstance(item, Utterance):
+                with self.handlers.log_context(utt=item.seq, device=item.device):
+                    self._timed(name, fn, item)
+            else:
+                self._timed(name, fn, item)
+
+    def _timed(self, name: str, fn: Callable[[Any], Any], *args: Any) -> Any:
+        t0 = time.perf_counter()
+        ok = True
+        try:
+            return fn(*args)
+        except Exception as e:
+            ok = False
+            self.handlers.log(f"❌ Error ({name}): {e}")
+            return None
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._stats_lock:
+                st = self.stats[name]
+                st["processed"] += 1
+                st["busy_s"] += elapsed
+                self.latency[name].record(elapsed)
+                if not ok:
+                    st["errors"] += 1
+            self.handlers.log_event("stage", stage=name, ms=round(elapsed * 1000, 1), ok=ok)
+
+    def _discard_audio(self, item: Utterance) -> None:
+        if item.audio_path and item.owns_audio:
+            try:
+                os.unlink(item.audio_path)
+            except Exception:
+                pass
+            item.audio_path = None
+
+    def _enqueue_speech(self, text: str) -> None:
+        q = self.queues["tts"]
+        with self._stats_lock:
+            while True:
+                try:
+                    q.put_nowait(text)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                        self.stats["tts_dropped"] += 1
+                        self._tts_pending -= 1
+                    except queue.Empty:
+                        pass
+            self._tts_pending += 1
+            self._tts_idle.clear()
+
+    # -- stages --------------------------------------------------------------
+
+    def _device_stats(self, item: Utterance) -> Dict[str, int]:
+        return self.stats["devices"][str(item.device or "default")]
+
+    def _capture_one(self, device: Optional[str] = None) -> Optional[Utterance]:
+        fd, path = tempfile.mkstemp(prefix="stts_daemon_", suffix=".wav", dir=self.tmp_dir)
+        os.close(fd)
+        item = Utterance(seq=next(self._seq), device=device, audio_path=path)
+        if device is None:
+            audio = self.shell.capture(output_path=path)
+        else:
+            audio = self.shell.capture(output_path=path, device=device)
+        if not audio:
+            self._discard_audio(item)
+            return None
+        if audio != path:  # recorder ignored output_path: not ours to delete
+            self._discard_audio(item)
+            item.audio_path, item.owns_audio = audio, False
+        item.captured_at = time.monotonic()
+        with self._stats_lock:
+            self._device_stats(item)["captured"] += 1
+        self.handlers.log_event("captured", utt=item.seq, device=device)
+        return item
+
+    def _capture_loop(self, device: Optional[str] = None) -> None:
+        self.handlers.log(f"🎤 Listening{f' ({device})' if device else ''}...")
+        while not self._stop.is_set():
+            # keep the microphone closed while the daemon itself is talking (or is paused)
+            while not self._tts_idle.wait(0.2) or self.handlers.paused.is_set():
+                if self._stop.is_set():
+                    return
+                if self.handlers.paused.is_set():
+                    self._stop.wait(0.2)
+            item = self._timed("capture", self._capture_one, device)
+            if item is None:
+                continue
+            if not self._put("stt", item):
+                self._discard_audio(item)
+
+    def _stt_stage(self, item: Utterance) -> None:
+        try:
+            if self._stale(item, "stt"):
+                return
+            if not item.audio_path or not self.handlers.wake_gate(item.audio_path, source=item.device):
+                return
+            item.text = self.shell.transcribe(item.audio_path)
+            self.handlers.note_transcript(item.text, source=item.device)
+        finally:
+            self._discard_audio(item)
+        with self._stats_lock:
+            self._device_stats(item)["transcribed"] += 1
+        if item.text:
+            self._put("nlp", item)
+
+    def _nlp_stage(self, item: Utterance) -> None:
+        if self._stale(item, "nlp"):
+            return
+        handlers = self.handlers
+        ok, command = handlers.process_wake_word(item.text, follow_up=False, source=item.device)
+        if not ok:
+            return
+        item.command = command
+        if self._coalesced(item):
+            return
+        item.trigger = handlers.match_trigger_command(command)
+        if item.trigger is not None:
+            item.priority = 0
+            with self._stats_lock:
+                self.stats["admission"]["admitted"] += 1
+                if self._in_flight or self.queues["exec"].qsize():
+                    self.stats["admission"]["prioritized"] += 1
+            self._put("exec", item)
+            return
+        with self._release_lock:
+            busy = len(self._in_flight) >= self.max_queries
+            if not busy:
+                self._in_flight.append(item)
+        if busy:
+            self._shed(item, "overload", "nlp")
+            handlers.log(f"🚦 Busy ({self.max_queries} nlp2cmd queries pending), dropped: {command}")
+            if self.shell.tts:
+                handlers.speak("Jestem zajęty, powtórz za chwilę")
+            return
+        with self._stats_lock:
+            self.stats["admission"]["admitted"] += 1
+        self._queries.submit(self._query, item)
+
+    def _query(self, item: Utterance) -> None:
+        """Translate on a query thread; release answered commands to exec in spoken order."""
+        try:
+            with self.handlers.log_context(utt=item.seq, device=item.device):
+                item.result = self._timed("query", self.handlers.query_nlp2cmd, item.command)
+        finally:
+            with self._release_lock:
+                item.answered = True
+                while self._in_flight and self._in_flight[0].answered:
+                    head = self._in_flight.popleft()
+                    if head.result is not None and not self._stale(head, "query"):
+                        self._put("exec", head)
+
+    def _stale(self, item: Utterance, stage: str) -> bool:
+        """Admission check: True (and counted) when `item` is past its deadline."""
+        if self.deadline_s <= 0:
+            return False
+        age = time.monotonic() - item.captured_at
+        if age <= self.deadline_s:
+            return False
+        self._shed(item, "stale", stage, age_ms=round(age * 1000))
+        self.handlers.log(f"⌛ Dropped utterance #{item.seq} ({age:.1f}s old, before {stage})")
+        return True
+
+    def _coalesced(self, item: Utterance) -> bool:
+        """True when the same command was admitted less than `coalesce_s` ago."""
+        if self.coalesce_s <= 0:
+            return False
+        key = " ".join(item.command.lower().split())
+        with self._stats_lock:
+            while self._recent and next(iter(self._recent.values())) < item.captured_at - self.coalesce_s:
+                self._recent.popitem(last=False)
+            last = self._recent.get(key)
+            if last is None or item.captured_at - last >= self.coalesce_s:
+                self._recent[key] = item.captured_at
+                self._recent.move_to_end(key)
+                return False
+        self._shed(item, "coalesced", "nlp")
+        self.handlers.log(f"🔁 Repeated command within {self.coalesce_s:g}s, skipped: {item.command}")
+        return True
+
+    def _shed(self, item: Utterance, reason: str, stage: str, **fields: Any) -> None:
+        counter = "coalesced" if reason == "coalesced" else f"shed_{reason}"
+        with self._stats_lock:
+            self.stats["admission"][counter] += 1
+        self.handlers.log_event("shed", utt=item.seq, reason=reason, stage=stage, **fields)
+
+    def _exec_stage(self, item: Utterance) -> None:
+        if self._stale(item, "exec"):
+            return
+        deadline = item.captured_at + self.deadline_s if self.deadline_s > 0 else None
+        with self.handlers.exec_scope(deadline) as futures:
+            if item.trigger is not None:
+                self.handlers.run_trigger(item.trigger)
+            elif item.result is not None:
+                self.handlers.execute_from_result(item.result)
+        if not futures:
+            self._exec_done(item)  # ran inline (or nothing to run)
+            return
+        fields = {"utt": item.seq, "device": item.device}
+        for fut in futures:
+            fut.add_done_callback(lambda f: self._exec_done(item, f, fields))
+
+    def _exec_done(self, item: Utterance, fut: Any = None, fields: Optional[Dict[str, Any]] = None) -> None:
+        """Record end-to-end latency once the command has run (pool or inline)."""
+        with self.handlers.log_context(**(fields or {})):
+            if fut is not None:
+                if fut.cancelled():
+                    return
+                if isinstance(fut.exception(), DeadlineExpired):
+                    self._shed(item, "stale", "exec_pool", age_ms=round((time.monotonic() - item.captured_at) * 1000))
+                    return
+            e2e = time.monotonic() - item.captured_at
+            with self._stats_lock:
+                self.latency["end_to_end"].record(e2e)
+            self.handlers.log_event("done", end_to_end_ms=round(e2e * 1000, 1))
+
+    def _tts_stage(self, text: str) -> None:
+        try:
+            tts = self.shell.tts
+            if tts and self.shell.config.get("auto_tts", True):
+                tts.speak(str(text)[:200])
+        finally:
+            with self._stats_lock:
+                self._tts_pending = max(0, self._tts_pending - 1)
+                if self._tts_pending == 0:
+                    self._tts_idle.set()
+
+
+__all__ = ["FairQueue", "PriorityFifo", "StagedDaemonPipeline", "Utterance"]
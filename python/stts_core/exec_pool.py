@@ -0,0 +1,343 @@
+"""Bounded command execution for the daemon.
+
+Commands spoken to the daemon used to run synchronously on the exec
+thread (`run_command_any`: up to 60 s, unbounded with pexpect), so one slow
+`apt install` stalled every later command. `ExecPool` runs them on
+`max_workers` threads instead:
+
+  - every command has a timeout (`timeout_s`, or per command name via
+    `timeouts={"apt": 900}`); on expiry its whole process group is killed
+    and the result has exit code 124,
+  - commands of one class never overlap: the class of `apt install x` is
+    "dpkg" (shared with apt-get / dpkg), see `SERIAL_CLASSES`; other
+    commands are their own class only when listed in `serialize`. A command
+    line joined with `&&`, `;` or `|` holds the classes of all its parts,
+  - `submit()` returns a Future of `ExecResult` right away; callers attach
+    a callback to report the outcome (log, TTS). A command submitted with a
+    `deadline` (monotonic time) that is still queued when it passes is not
+    run; its Future fails with `DeadlineExpired`.
+"""
+
+from __future__ import annotations
+
+import collections
+import os
+import re
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+# Commands that must not run concurrently (shared package-manager locks).
+SERIAL_CLASSES: Dict[str, str] = {
+    "apt": "dpkg",
+    "apt-get": "dpkg",
+    "aptitude": "dpkg",
+    "dpkg": "dpkg",
+    "snap": "snap",
+    "dnf": "rpm",
+    "yum": "rpm",
+    "rpm": "rpm",
+    "zypper": "rpm",
+    "pacman": "pacman",
+    "flatpak": "flatpak",
+}
+
+_WRAPPERS = {"sudo", "doas", "nice", "ionice", "nohup", "time", "env", "command", "exec", "timeout"}
+# Wrapper options that take the next token as their value (`sudo -u root`).
+_WRAPPER_VALUE_OPTS: Dict[str, Set[str]] = {
+    "sudo": {"-u", "-g", "-C", "-D", "-h", "-p", "-r", "-t", "-T", "-U", "--user", "--group", "--host", "--prompt"},
+    "doas": {"-u", "-C"},
+    "nice": {"-n", "--adjustment"},
+    "ionice": {"-c", "-n", "-p", "--class", "--classdata"},
+    "env": {"-u", "-C", "-S", "--unset", "--chdir", "--split-string"},
+    "timeout": {"-s", "-k", "--signal", "--kill-after"},
+}
+# Wrappers followed by one positional argument before the command (`timeout 10 cmd`).
+_WRAPPER_POSITIONAL = {"timeout": 1}
+_ENV_ASSIGN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+_SEPARATOR_CHARS = set("&|;")
+
+
+def _split_commands(cmd: str) -> List[List[str]]:
+    """Tokens of each simple command in a `&&` / `;` / `|` chain."""
+    try:
+        lex = shlex.shlex(cmd.replace("\n", " ; "), posix=True, punctuation_chars=True)
+        lex.whitespace_split = True
+        tokens = list(lex)
+    except ValueError:
+        tokens = cmd.split()
+    parts: List[List[str]] = [[]]
+    for tok in tokens:
+        if set(tok) <= _SEPARATOR_CHARS:  # &&, ||, ;, |, &
+            parts.append([])
+        elif tok not in ("(", ")", "{", "}"):
+            parts[-1].append(tok)
+    return [p for p in parts if p]
+
+
+def _program(tokens: List[str]) -> str:
+    wrapper = ""
+    skip = 0
+    positional = 0
+    for tok in tokens:
+        if skip:
+            skip -= 1
+            continue
+        if _ENV_ASSIGN.match(tok):
+            continue  # VAR=value
+        if tok.startswith("-") and wrapper:
+            if tok in _WRAPPER_VALUE_OPTS.get(wrapper, ()):
+                skip = 1  # option value: `sudo -u root`, `nice -n 10`
+            continue
+        if tok in _WRAPPERS:
+            wrapper = tok
+            positional = _WRAPPER_POSITIONAL.get(tok, 0)
+            continue
+        if positional:
+            positional -= 1  # `timeout 10`
+            continue
+        return os.path.basename(tok)
+    return ""
+
+
+def command_names(cmd: str) -> List[str]:
+    """Program names of every command in a chain (`cd /tmp && apt install x` -> ["cd", "apt"])."""
+    return [name for name in (_program(p) for p in _split_commands(cmd)) if name]
+
+
+def command_name(cmd: str) -> str:
+    """Program name of a shell command (`sudo -u root apt install x` -> "apt")."""
+    names = command_names(cmd)
+    return names[0] if names else ""
+
+
+class DeadlineExpired(TimeoutError):
+    """A queued command's deadline passed before a worker could start it."""
+
+
+@dataclass
+class ExecResult:
+    cmd: str
+    output: str
+    exit_code: int
+    duration_s: float
+    timed_out: bool = False
+
+
+class ExecPool:
+    """Thread pool for shell commands with timeouts and per-class serialization."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        timeout_s: float = 60.0,
+        timeouts: Optional[Dict[str, float]] = None,
+        serialize: Iterable[str] = (),
+        kill_grace_s: float = 2.0,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.timeout_s = float(timeout_s)
+        self.timeouts = {str(k): float(v) for k, v in (timeouts or {}).items()}
+        self.classes = dict(SERIAL_CLASSES)
+        self.classes.update({str(name): str(name) for name in serialize})
+        self.kill_grace_s = float(kill_grace_s)
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "expired": 0, "running": 0, "queued": 0}
+        self._pending: Deque[Tuple[str, Tuple[str, ...], float, Future, Optional[float]]] = collections.deque()
+        self._busy: Set[str] = set()
+        self._procs: Set[subprocess.Popen] = set()
+        self._cv = threading.Condition()
+        self._closed = False
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._worker, name=f"stts-exec-{i}", daemon=True) for i in range(self.max_workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def exec_classes(self, cmd: str) -> Tuple[str, ...]:
+        """Serialization classes held by `cmd` (one per distinct class in the chain)."""
+        classes: List[str] = []
+        for name in command_names(cmd):
+            cls = self.classes.get(name)
+            if cls is not None and cls not in classes:
+                classes.append(cls)
+        return tuple(classes)
+
+    def exec_class(self, cmd: str) -> Optional[str]:
+        classes = self.exec_classes(cmd)
+        return classes[0] if classes else None
+
+    def _timeout_for(self, cmd: str) -> float:
+        """Longest configured timeout among the chain's commands (or the default)."""
+        limits = []
+        for name in command_names(cmd):
+            cls = self.classes.get(name, "")
+            if name in self.timeouts or cls in self.timeouts:
+                limits.append(self.timeouts.get(name, self.timeouts.get(cls, self.timeout_s)))
+        return max(limits) if limits else self.timeout_s
+
+    def submit(self, cmd: str, timeout_s: Optional[float] = None, deadline: Optional[float] = None) -> "Future[ExecResult]":
+        fut: "Future[ExecResult]" = Future()
+        classes = self.exec_classes(cmd)
+        if timeout_s is None:
+            timeout_s = self._timeout_for(cmd)
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("exec pool is closed")
+            self._pending.append((cmd, classes, float(timeout_s), fut, deadline))
+            self.stats["submitted"] += 1
+            self.stats["queued"] = len(self._pending)
+            self._cv.notify_all()
+        return fut
+
+    def close(self, kill: bool = True, timeout_s: float = 2.0) -> None:
+        """Stop the workers; cancel queued commands and (with `kill`) running ones."""
+        with self._cv:
+            self._closed = True
+            while self._pending:
+                self._pending.popleft()[3].cancel()
+            self.stats["queued"] = 0
+            procs = list(self._procs) if kill else []
+            self._cv.notify_all()
+        for proc in procs:
+            self._kill(proc)
+        deadline = time.monotonic() + timeout_s
+        for t in self._threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+
+    # -- workers -------------------------------------------------------------
+
+    def _take(self) -> Optional[Tuple[str, Tuple[str, ...], float, Future, Optional[float]]]:
+        """Oldest queued command whose classes are all idle (blocks); None once closed.
+
+        Commands whose deadline has passed are dropped on the way.
+        """
+        while True:
+            expired = []
+            with self._cv:
+                if self._closed:
+                    return None
+                now = time.monotonic()
+                for job in list(self._pending):
+                    if job[4] is not None and job[4] <= now:
+                        self._pending.remove(job)
+                        expired.append(job)
+                self.stats["expired"] += len(expired)
+                self.stats["queued"] = len(self._pending)
+                if not expired:
+                    for i, job in enumerate(self._pending):
+                        if self._busy.isdisjoint(job[1]):
+                            del self._pending[i]
+                            self._busy.update(job[1])
+                            self.stats["queued"] = len(self._pending)
+                            self.stats["running"] += 1
+                            return job
+                    deadlines = [job[4] for job in self._pending if job[4] is not None]
+                    self._cv.wait(max(0.0, min(deadlines) - now) if deadlines else None)
+            for job in expired:  # outside the lock: done callbacks may log / speak
+                if job[3].set_running_or_notify_cancel():
+                    job[3].set_exception(DeadlineExpired(f"deadline passed before start: {job[0]}"))
+
+    def _worker(self) -> None:
+        while True:
+            job = self._take()
+            if job is None:
+                return
+            cmd, classes, timeout_s, fut, _deadline = job
+            try:
+                if fut.set_running_or_notify_cancel():
+                    try:
+                        res = self._run(cmd, timeout_s)
+                    except Exception as e:
+                        with self._cv:
+                            self.stats["failed"] += 1
+                        fut.set_exception(e)
+                    else:
+                        with self._cv:
+                            self.stats["completed"] += 1
+                            if res.timed_out:
+                                self.stats["timeouts"] += 1
+                        fut.set_result(res)
+            finally:
+                with self._cv:
+                    self.stats["running"] -= 1
+                    self._busy.difference_update(classes)
+                    self._cv.notify_all()
+
+    def _run(self, cmd: str, timeout_s: float) -> ExecResult:
+        argv = ["/bin/bash", "-c", cmd] if os.name != "nt" else ["cmd", "/c", cmd]
+        t0 = time.monotonic()
+        proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            start_new_session=(os.name != "nt"),
+        )
+        with self._cv:
+            self._procs.add(proc)
+        try:
+            try:
+                out, _ = proc.communicate(timeout=timeout_s if timeout_s > 0 else None)
+                return ExecResult(cmd, out or "", proc.returncode, time.monotonic() - t0)
+            except subprocess.TimeoutExpired:
+                self._kill(proc)
+                out, _ = proc.communicate()
+                note = f"⏰ Timeout ({timeout_s:g}s)"
+                return ExecResult(cmd, (out or "") + note, 124, time.monotonic() - t0, timed_out=True)
+        finally:
+            with self._cv:
+                self._procs.discard(proc)
+
+    def _kill(self, proc: subprocess.Popen) -> None:
+        """SIGTERM the command's process group, SIGKILL after `kill_grace_s`."""
+        if proc.poll() is not None:
+            return
+        try:
+            if os.name != "nt":
+                os.killpg(proc.pid, signal.SIGTERM)
+            else:
+                proc.terminate()
+            try:
+                proc.wait(self.kill_grace_s)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+            if os.name != "nt":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def build_exec_pool(config: dict) -> Optional[ExecPool]:
+    """Pool from config (`daemon_exec_workers` 0 = run commands inline, as before)."""
+
+    def cfg_float(key: str, default: float) -> float:
+        try:
+            return float(config.get(key, default))
+        except Exception:
+            return default
+
+    workers = int(cfg_float("daemon_exec_workers", 2))
+    if workers <= 0:
+        return None
+    timeouts = config.get("daemon_exec_timeouts") or {}
+    serialize = config.get("daemon_exec_serialize") or []
+    if isinstance(serialize, str):
+        serialize = serialize.replace(",", " ").split()
+    return ExecPool(
+        max_workers=workers,
+        timeout_s=cfg_float("daemon_exec_timeout_s", 60.0),
+        timeouts=timeouts if isinstance(timeouts, dict) else {},
+        serialize=serialize,
+    )
+
+
+__all__ = ["DeadlineExpired", "ExecPool", "ExecResult", "SERIAL_CLASSES", "build_exec_pool", "command_name", "command_names"]
@@ -0,0 +1,438 @@
+"""Shared HTTP client with keep-alive connection pooling for STTS.
+
+Deepgram STT and the nlp2cmd service are queried once (or more) per utterance.
+`urllib.request.urlopen` opens a fresh TCP (and TLS) connection every time,
+so this module keeps persistent `http.client` connections per host instead.
+
+Features:
+  - bounded pool of keep-alive connections per (scheme, host, port)
+  - retry with exponential backoff on connection-level failures
+  - per-request timing metrics (see `HTTPClient.metrics.snapshot()`)
+
+Hosts that must go through an HTTP proxy (per `*_proxy` env vars) fall back
+to `urllib.request.urlopen`, so proxy setups keep working.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+_IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+_RETRY_STATUSES = (502, 503, 504)
+
+# Errors raised by a keep-alive connection that the server already closed.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    http.client.CannotSendRequest,
+    http.client.ResponseNotReady,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+# Errors raised before the request reached the server (safe to retry).
+_CONNECT_ERRORS = (
+    ConnectionRefusedError,
+    socket.gaierror,
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        v = os.environ.get(name, "").strip()
+        return int(v) if v else default
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        v = os.environ.get(name, "").strip()
+        return float(v) if v else default
+    except Exception:
+        return default
+
+
+@dataclass
+class HTTPResponse:
+    """Fully read HTTP response plus timing information."""
+
+    url: str
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    body: bytes
+    elapsed_s: float = 0.0
+    attempts: int = 1
+    reused: bool = False
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8"))
+
+    def raise_for_status(self) -> None:
+        """Raise `urllib.error.HTTPError` for non-2xx responses (urlopen semantics)."""
+        if 200 <= int(self.status) < 300:
+            return
+        raise urllib.error.HTTPError(self.url, int(self.status), self.reason, self.headers, None)
+
+
+@dataclass
+class HTTPMetrics:
+    """Thread-safe request counters and recent latencies."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    reused: int = 0
+    connects: int = 0
+    per_host: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    recent: Deque[Tuple[str, str, int, float]] = field(default_factory=lambda: deque(maxlen=256))
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def record(self, host: str, method: str, status: int, elapsed_s: float, attempts: int, reused: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.retries += max(0, attempts - 1)
+            if reused:
+                self.reused += 1
+            if status <= 0:
+                self.errors += 1
+            h = self.per_host.setdefault(host, {"requests": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0})
+            h["requests"] += 1
+            if status <= 0:
+                h["errors"] += 1
+            h["total_s"] += elapsed_s
+            h["max_s"] = max(h["max_s"], elapsed_s)
+            self.recent.append((host, method, int(status), float(elapsed_s)))
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = {}
+            for k, v in self.per_host.items():
+                n = int(v["requests"]) or 1
+                hosts[k] = {
+                    "requests": int(v["requests"]),
+                    "errors": int(v["errors"]),
+                    "avg_ms": round(v["total_s"] * 1000.0 / n, 1),
+                    "max_ms": round(v["max_s"] * 1000.0, 1),
+                }
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "reused": self.reused,
+                "connects": self.connects,
+                "hosts": hosts,
+            }
+
+
+class _HostPool:
+    """Idle connections for one (scheme, host, port) with a cap on open connections."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, int(max_size))
+        self.idle: List[http.client.HTTPConnection] = []
+        self.open = 0
+        self.cond = threading.Condition()
+
+
+class HTTPClient:
+    """Keep-alive HTTP client shared by STT providers and the nlp2cmd client."""
+
+    def __init__(
+        self,
+        max_per_host: int = 4,
+        retries: int = 2,
+        backoff_s: float = 0.1,
+        max_backoff_s: float = 2.0,
+        user_agent: str = "stts",
+    ):
+        self.max_per_host = max(1, int(max_per_host))
+        self.retries = max(0, int(retries))
+        self.backoff_s = max(0.0, float(backoff_s))
+        self.max_backoff_s = max(0.0, float(max_backoff_s))
+        self.user_agent = user_agent
+        self.metrics = HTTPMetrics()
+        self._pools: Dict[Tuple[str, str, int], _HostPool] = {}
+        self._lock = threading.Lock()
+
+    # -- pool management -------------------------------------------------
+
+    def _pool(self, key: Tuple[str, str, int]) -> _HostPool:
+        with self._lock:
+            p = self._pools.get(key)
+            if p is None:
+                p = _HostPool(self.max_per_host)
+                self._pools[key] = p
+            return p
+
+    def _acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        pool = self._pool(key)
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        with pool.cond:
+            while True:
+                if pool.idle:
+                    return pool.idle.pop(), True
+                if pool.open < pool.max_size:
+                    pool.open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"HTTP pool exhausted for {key[1]}:{key[2]}")
+                pool.cond.wait(remaining)
+
+        scheme, host, port = key
+        try:
+            if scheme == "https":
+                conn: http.client.HTTPConnection = http.client.HTTPSConnection(host, port, timeout=timeout)
+            else:
+                conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        except Exception:
+            self._discard(key)
+            raise
+        self.metrics.record_connect()
+        return conn, False
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        pool = self._pool(key)
+        with pool.cond:
+            pool.idle.append(conn)
+            pool.cond.notify()
+
+    def _discard(self, key: Tuple[str, str, int], conn: Optional[http.client.HTTPConnection] = None) -> None:
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        pool = self._pool(key)
+        with pool.cond:
+            pool.open = max(0, pool.open - 1)
+            pool.cond.notify()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            with pool.cond:
+                idle, pool.idle = pool.idle, []
+                pool.open = max(0, pool.open - len(idle))
+                pool.cond.notify_all()
+            for c in idle:
+                try:
+                    c.close()
+                except Exception:
+                    pass
+
+    # -- requests --------------------------------------------------------
+
+    @staticmethod
+    def _uses_proxy(parsed: urllib.parse.SplitResult) -> bool:
+        try:
+            proxies = urllib.request.getproxies()
+            if parsed.scheme not in proxies:
+                return False
+            return not urllib.request.proxy_bypass(parsed.hostname or "")
+        except Exception:
+            return False
+
+    def _sleep_backoff(self, attempt: int) -> None:
+        delay = min(self.max_backoff_s, self.backoff_s * (2 ** max(0, attempt - 1)))
+        if delay > 0:
+            time.sleep(delay)
+
+    def _urlopen(self, method: str, url: str, body: Optional[bytes], headers: Dict[str, str], timeout: float) -> HTTPResponse:
+        req = urllib.request.Request(url, data=body, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                data = resp.read()
+                return HTTPResponse(
+                    url=url,
+                    status=int(getattr(resp, "status", 200) or 200),
+                    reason=str(getattr(resp, "reason", "") or ""),
+                    headers=dict(resp.headers.items()),
+                    body=data,
+                )
+        except urllib.error.HTTPError as e:
+            return HTTPResponse(
+                url=url,
+                status=int(e.code),
+                reason=str(e.reason or ""),
+                headers=dict(e.headers.items()) if e.headers else {},
+                body=e.read() if e.fp else b"",
+            )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+        retries: Optional[int] = None,
+    ) -> HTTPResponse:
+        """Send a request and return the fully read response.
+
+        Connection-level failures are retried with exponential backoff; a
+        keep-alive connection the server closed while idle is retried at once.
+        HTTP 502/503/504 are retried only for idempotent methods, so a POST
+        with side effects (e.g. nlp2cmd `execute: true`) is never replayed
+        after the server has accepted it. Non-2xx responses are returned, not
+        raised; call `raise_for_status()` for urlopen-like behavior.
+        """
+        method = str(method or "GET").upper()
+        parsed = urllib.parse.urlsplit(url)
+        scheme = (parsed.scheme or "http").lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        host = parsed.hostname or "localhost"
+        port = parsed.port or (443 if scheme == "https" else 80)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        key = (scheme, host, int(port))
+        host_label = f"{host}:{port}"
+
+        hdrs = {"User-Agent": self.user_agent, "Connection": "keep-alive"}
+        hdrs.update(headers or {})
+        max_retries = self.retries if retries is None else max(0, int(retries))
+
+        t0 = time.perf_counter()
+
+        if self._uses_proxy(parsed):
+            try:
+                resp = self._urlopen(method, url, body, hdrs, timeout)
+            except Exception:
+                self.metrics.record(host_label, method, 0, time.perf_counter() - t0, 1, False)
+                raise
+            resp.elapsed_s = time.perf_counter() - t0
+            self.metrics.record(host_label, method, resp.status, resp.elapsed_s, 1, False)
+            return resp
+
+        attempt = 0
+        stale_retried = False
+        while True:
+            attempt += 1
+            conn = None
+            reused = False
+            try:
+                conn, reused = self._acquire(key, timeout)
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                else:
+                    conn.timeout = timeout
+                conn.request(method, path, body=body, headers=hdrs)
+                r = conn.getresponse()
+                data = r.read()
+                resp = HTTPResponse(
+                    url=url,
+                    status=int(r.status),
+                    reason=str(r.reason or ""),
+                    headers=dict(r.getheaders()),
+                    body=data,
+                    attempts=attempt,
+                    reused=reused,
+                )
+                if r.will_close:
+                    self._discard(key, conn)
+                else:
+                    self._release(key, conn)
+                conn = None
+
+                if (
+                    resp.status in _RETRY_STATUSES
+                    and method in _IDEMPOTENT_METHODS
+                    and attempt <= max_retries
+                ):
+                    self._sleep_backoff(attempt)
+                    continue
+
+                resp.elapsed_s = time.perf_counter() - t0
+                self.metrics.record(host_label, method, resp.status, resp.elapsed_s, attempt, reused)
+                return resp
+            except _STALE_ERRORS:
+                if conn is not None:
+                    self._discard(key, conn)
+                if reused and not stale_retried:
+                    # Idle keep-alive connection closed by the server: reconnect once for free.
+                    stale_retried = True
+                    attempt -= 1
+                    continue
+                if attempt <= max_retries and method in _IDEMPOTENT_METHODS:
+                    self._sleep_backoff(attempt)
+                    continue
+                self.metrics.record(host_label, method, 0, time.perf_counter() - t0, attempt, reused)
+                raise
+            except _CONNECT_ERRORS:
+                if conn is not None:
+                    self._discard(key, conn)
+                if attempt <= max_retries:
+                    self._sleep_backoff(attempt)
+                    continue
+                self.metrics.record(host_label, method, 0, time.perf_counter() - t0, attempt, reused)
+                raise
+            except Exception:
+                if conn is not None:
+                    self._discard(key, conn)
+                self.metrics.record(host_label, method, 0, time.perf_counter() - t0, attempt, reused)
+                raise
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30.0) -> HTTPResponse:
+        return self.request("GET", url, headers=headers, timeout=timeout)
+
+    def post_json(
+        self,
+        url: str,
+        payload: Any,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+    ) -> HTTPResponse:
+        hdrs = {"Content-Type": "application/json"}
+        hdrs.update(headers or {})
+        body = json.dumps(payload).encode("utf-8")
+        return self.request("POST", url, body=body, headers=hdrs, timeout=timeout)
+
+
+_DEFAULT_CLIENT: Optional[HTTPClient] = None
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """Return the process-wide shared client (configured via STTS_HTTP_* env)."""
+    global _DEFAULT_CLIENT
+    if _DEFAULT_CLIENT is not None:
+        return _DEFAULT_CLIENT
+    with _DEFAULT_CLIENT_LOCK:
+        if _DEFAULT_CLIENT is None:
+            _DEFAULT_CLIENT = HTTPClient(
+                max_per_host=_env_int("STTS_HTTP_POOL_SIZE", 4),
+                retries=_env_int("STTS_HTTP_RETRIES", 2),
+                backoff_s=_env_float("STTS_HTTP_BACKOFF_S", 0.1),
+            )
+        return _DEFAULT_CLIENT
+
+
+__all__ = ["HTTPClient", "HTTPMetrics", "HTTPResponse", "get_client"]
@@ -0,0 +1,298 @@
+"""Local intent matching for STTS (tier in front of nlp2cmd).
+
+Simple, frequent voice commands ("pokaż pliki", "miejsce na dysku") are
+resolved locally in microseconds instead of a round trip to nlp2cmd.
+Intents are `phrase=command` rules (same format as daemon triggers). Users
+may add parameterized intents to `intents.txt`: `{name}` in the phrase
+captures exactly one word, which is shell-quoted into the same `{name}` in
+the command:
+
+    pokaż plik {file}=cat {file}
+    ping {host}=ping -c 4 {host}
+
+A slot never swallows a longer free-form tail ("pokaż plik konfiguracyjny
+nginxa" is left to nlp2cmd), and no slot intents are enabled by default.
+
+Matching is done on normalized tokens (lowercase, no punctuation, Polish
+diacritics folded) with three tiers: exact phrase (hash lookup), slot
+patterns and fuzzy phrase similarity. Slot and fuzzy matches are scored
+and only returned at or above the confidence threshold.
+
+Literal tokens are compared one by one (same token count), so the tiers
+absorb STT misspellings, not different commands: the first token (the
+verb) must match almost exactly, and utterances that look more like a slot
+intent with its value missing are not fuzzy-matched ("pokaż plik" must
+not become `ls -la`).
+"""
+
+from __future__ import annotations
+
+import datetime
+import difflib
+import json
+import re
+import shlex
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+_SLOT_RE = re.compile(r"^\{([A-Za-z_][A-Za-z0-9_]*)\}$")
+# `{name}` placeholder; `${name}` is left to the shell
+_TEMPLATE_SLOT_RE = re.compile(r"(?<!\$)\{([A-Za-z_][A-Za-z0-9_]*)\}")
+_EDGE_PUNCT = ".,!?;:\"'„”«»()"
+# fuzzy tier: minimum similarity of the first (verb) token ("restart" vs "start" is 0.83)
+_VERB_MIN_RATIO = 0.9
+
+DEFAULT_INTENTS = [
+    "pokaż pliki=ls -la",
+    "lista plików=ls -la",
+    "gdzie jestem=pwd",
+    "kim jestem=whoami",
+    "która godzina=date",
+    "status gita=git status",
+    "git status=git status",
+    "lista kontenerów=docker ps",
+    "pokaż kontenery=docker ps",
+    "pokaż procesy=ps aux",
+    "miejsce na dysku=df -h",
+    "wolne miejsce na dysku=df -h",
+    "ile pamięci=free -h",
+    "pokaż pamięć=free -h",
+    "czas działania=uptime",
+]
+# slot confidence for a perfect literal match (below an exact phrase hit)
+_SLOT_CONFIDENCE = 0.95
+
+
+def fold_token(tok: str) -> str:
+    """Lowercase, strip edge punctuation and fold diacritics (ł → l, ą → a, ...)."""
+    t = str(tok or "").strip(_EDGE_PUNCT).lower().replace("ł", "l")
+    t = unicodedata.normalize("NFKD", t)
+    return "".join(ch for ch in t if not unicodedata.combining(ch))
+
+
+@dataclass
+class Intent:
+    phrase: str
+    command: str
+    tokens: List[str]  # folded literal tokens; slots as "{name}"
+    slots: List[str] = field(default_factory=list)
+
+
+@dataclass
+class IntentMatch:
+    command: str
+    intent: str
+    confidence: float
+    tier: str  # "exact" | "slot" | "fuzzy"
+    slots: Dict[str, str] = field(default_factory=dict)
+
+
+def parse_intent(spec: str) -> Optional[Intent]:
+    """Parse `phrase=command`; None when malformed or the command uses unknown slots."""
+    s = str(spec or "").strip()
+    if not s or s.startswith("#") or "=" not in s:
+        return None
+    phrase, cmd = (x.strip() for x in s.split("=", 1))
+    if not phrase or not cmd:
+        return None
+    tokens: List[str] = []
+    slots: List[str] = []
+    for raw in phrase.split():
+        m = _SLOT_RE.match(raw)
+        if m:
+            slots.append(m.group(1))
+            tokens.append("{" + m.group(1) + "}")
+        else:
+            t = fold_token(raw)
+            if t:
+                tokens.append(t)
+    if not tokens or not template_slots(cmd) <= set(slots):
+        return None
+    return Intent(phrase=phrase, command=cmd, tokens=tokens, slots=slots)
+
+
+def load_intents(specs: Iterable[str] = (), intents_file: Optional[str] = None) -> List[Intent]:
+    intents = [i for i in (parse_intent(s) for s in specs) if i]
+    if intents_file:
+        try:
+            p = Path(intents_file).expanduser()
+            if p.is_file():
+                for line in p.read_text(encoding="utf-8").splitlines():
+                    it = parse_intent(line)
+                    if it:
+                        intents.append(it)
+        except Exception:
+            pass
+    return intents
+
+
+def _token_similarity(folded: List[str], tokens: List[str], threshold: float) -> Optional[float]:
+    """Mean similarity of the literal tokens, or None when a token (or the verb) is too far off.
+
+    A `{slot}` pattern token takes exactly one utterance token and is not scored.
+    """
+    if len(folded) != len(tokens):
+        return None
+    total, n = 0.0, 0
+    for i, (a, b) in enumerate(zip(folded, tokens)):
+        if b.startswith("{"):
+            continue
+        r = 1.0 if a == b else difflib.SequenceMatcher(None, a, b).ratio()
+        if r < (max(threshold, _VERB_MIN_RATIO) if i == 0 else threshold):
+            return None
+        total += r
+        n += 1
+    return total / n if n else 1.0
+
+
+def template_slots(template: str) -> Set[str]:
+    """Names of the `{name}` placeholders in a command template."""
+    return set(_TEMPLATE_SLOT_RE.findall(template))
+
+
+def render_command(template: str, slots: Dict[str, str]) -> str:
+    """Substitute `{name}` placeholders with shell-quoted slot values."""
+    return _TEMPLATE_SLOT_RE.sub(lambda m: shlex.quote(slots.get(m.group(1), "")), template)
+
+
+class IntentEngine:
+    """Indexed local intent matcher."""
+
+    def __init__(self, intents: List[Intent], threshold: float = 0.85):
+        self.threshold = float(threshold)
+        self._exact: Dict[str, Intent] = {}
+        self._slotted: Dict[int, List[Intent]] = {}  # slot intents by token count
+        self._slot_heads: Set[tuple] = set()  # literal tokens before the first slot
+        for it in intents:
+            if not it.slots:
+                self._exact.setdefault(" ".join(it.tokens), it)
+                continue
+            self._slotted.setdefault(len(it.tokens), []).append(it)
+            first_slot = next(i for i, t in enumerate(it.tokens) if t.startswith("{"))
+            if first_slot:
+                self._slot_heads.add(tuple(it.tokens[:first_slot]))
+        self._fuzzy: Dict[int, List[Intent]] = {}  # slot-free intents by token count
+        for it in self._exact.values():
+            self._fuzzy.setdefault(len(it.tokens), []).append(it)
+
+    def __len__(self) -> int:
+        return len(self._exact) + sum(len(v) for v in self._slotted.values())
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        orig = [t.strip(_EDGE_PUNCT) for t in str(text or "").split()]
+        orig = [t for t in orig if t]
+        folded = [fold_token(t) for t in orig]
+        if not folded:
+            return None
+        key = " ".join(folded)
+
+        it = self._exact.get(key)
+        if it is not None:
+            return IntentMatch(it.command, it.phrase, 1.0, "exact")
+
+        best, best_score = None, 0.0
+        for it in self._slotted.get(len(folded), ()):
+            score = _token_similarity(folded, it.tokens, self.threshold)
+            if score is not None and score * _SLOT_CONFIDENCE >= self.threshold and score > best_score:
+                best, best_score = it, score
+        if best is not None:
+            slots = {t[1:-1]: orig[i] for i, t in enumerate(best.tokens) if t.startswith("{")}
+            conf = round(best_score * _SLOT_CONFIDENCE, 3)
+            return IntentMatch(render_command(best.command, slots), best.phrase, conf, "slot", slots)
+
+        if self.threshold < 1.0:
+            # an utterance closer to a slot intent's literal head is that intent with its value missing
+            best, best_score = None, self._slot_head_score(folded)
+            for it in self._fuzzy.get(len(folded), ()):
+                score = _token_similarity(folded, it.tokens, self.threshold)
+                if score is not None and score >= self.threshold and score > best_score:
+                    best, best_score = it, score
+            if best is not None:
+                return IntentMatch(best.command, best.phrase, round(best_score, 3), "fuzzy")
+        return None
+
+    def _slot_head_score(self, folded: List[str]) -> float:
+        """Best similarity of the utterance's start to the literal head of a slot intent (0.0: none)."""
+        best = 0.0
+        for head in self._slot_heads:
+            if len(folded) >= len(head):
+                score = _token_similarity(folded[: len(head)], list(head), self.threshold)
+                if score is not None and score > best:
+                    best = score
+        return best
+
+
+class TierAudit:
+    """Counts (and optionally logs as JSON lines) which tier answered each query."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = str(Path(path).expanduser()) if path else None
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._writer = None
+        if self.path:
+            from .log_writer import BufferedFileWriter
+
+            self._writer = BufferedFileWriter(self.path)
+
+    def record(
+        self,
+        tier: str,
+        text: str,
+        command: Optional[str],
+        confidence: Optional[float] = None,
+        latency_ms: Optional[float] = None,
+    ) -> None:
+        with self._lock:
+            self.counts[tier] = self.counts.get(tier, 0) + 1
+        if self._writer is None:
+            return
+        entry = {
+            "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "tier": tier,
+            "text": text,
+            "command": command,
+            "confidence": confidence,
+        }
+        if latency_ms is not None:
+            entry["latency_ms"] = round(float(latency_ms), 1)
+        self._writer.write_line(json.dumps(entry, ensure_ascii=False))
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def build_intent_engine(config: dict, default_file: Optional[Path] = None) -> Optional[IntentEngine]:
+    """Intent engine from config (`intents_enabled`, `intents_file`, `intent_threshold`)."""
+    if not config.get("intents_enabled", True):
+        return None
+    path = config.get("intents_file") or (str(default_file) if default_file else None)
+    intents = load_intents(DEFAULT_INTENTS, path)
+    try:
+        threshold = float(config.get("intent_threshold", 0.85))
+    except Exception:
+        threshold = 0.85
+    return IntentEngine(intents, threshold=threshold)
+
+
+__all__ = [
+    "DEFAULT_INTENTS",
+    "Intent",
+    "IntentEngine",
+    "IntentMatch",
+    "TierAudit",
+    "build_intent_engine",
+    "fold_token",
+    "load_intents",
+    "parse_intent",
+    "render_command",
+    "template_slots",
+]
@@ -0,0 +1,101 @@
+"""JSON-lines over a Unix domain socket: shared client call and server base.
+
+Both local sockets of STTS (the daemon control socket and the shared nlp2cmd
+translator) speak one JSON object per line. `call()` is the client side (one
+short connection per request); `JsonLinesServer` / `JsonLinesHandler` are the
+server side, where subclasses only implement `handle_request()`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Dict, Optional, Type
+
+
+def call(path: str, payload: Dict[str, Any], timeout_s: float) -> Optional[Dict[str, Any]]:
+    """Send one request and read one response line; None when nobody answers."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(float(timeout_s))
+            s.connect(str(path))
+            s.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+            buf = b""
+            while b"\n" not in buf:
+                chunk = s.recv(65536)
+                if not chunk:
+                    return None
+                buf += chunk
+        res = json.loads(buf.split(b"\n", 1)[0].decode("utf-8"))
+        return res if isinstance(res, dict) else None
+    except Exception:
+        return None
+
+
+class JsonLinesHandler(socketserver.StreamRequestHandler):
+    """One connection: every request line (a JSON object) goes to `handle_request`."""
+
+    def setup(self) -> None:
+        super().setup()
+        self._wlock = threading.Lock()
+
+    def send(self, obj: Dict[str, Any]) -> bool:
+        """Write one response line (thread-safe); False once the client went away."""
+        data = (json.dumps(obj, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        try:
+            with self._wlock:
+                self.wfile.write(data)
+                self.wfile.flush()
+            return True
+        except Exception:
+            return False
+
+    def handle(self) -> None:
+        for raw in self.rfile:
+            try:
+                req = json.loads(raw.decode("utf-8"))
+            except Exception:
+                continue
+            if isinstance(req, dict):
+                self.handle_request(req)
+
+    def handle_request(self, req: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class JsonLinesServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix-socket server (mode 0600) that removes its socket file on close.
+
+    A socket file left by a dead server is replaced; one that still answers
+    `{"op": "ping"}` raises OSError(`in_use_message`).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, handler: Type[JsonLinesHandler], in_use_message: str = "socket in use"):
+        self.path = str(path)
+        if os.path.exists(self.path):
+            if call(self.path, {"op": "ping"}, timeout_s=0.5) is not None:
+                raise OSError(f"{in_use_message}: {self.path}")
+            try:
+                os.unlink(self.path)
+            except Exception:
+                pass
+        super().__init__(self.path, handler)
+        try:
+            os.chmod(self.path, 0o600)
+        except Exception:
+            pass
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except Exception:
+            pass
+
+
+__all__ = ["JsonLinesHandler", "JsonLinesServer", "call"]
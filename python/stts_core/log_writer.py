@@ -0,0 +1,228 @@
+"""Buffered log files with a background writer thread.
+
+The daemon used to open, append to and close its log file for every line.
+`BufferedFileWriter` keeps the file open. A writer thread drains an
+in-memory queue and flushes in batches (every `flush_interval_s`, or
+sooner once `batch` lines are waiting). It rotates `file` → `file.1` → ...
+once the file exceeds `max_bytes` or gets older than `max_age_s`.
+
+`DaemonLogger` is the daemon front end. It prints human-readable lines to
+stderr and writes them to the file, either as plain text or as JSON lines
+(`json_lines=True`). JSON records carry structured fields: utterance id,
+stage and timing. `context(utt=...)` attaches such fields to every line
+logged from the current thread.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import datetime
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+class BufferedFileWriter:
+    """Append lines to a file from a background thread, with rotation."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3,
+        max_age_s: float = 0.0,
+        flush_interval_s: float = 1.0,
+        batch: int = 64,
+    ):
+        self.path = str(Path(path).expanduser())
+        self.max_bytes = max(0, int(max_bytes))
+        self.backups = max(0, int(backups))
+        self.max_age_s = max(0.0, float(max_age_s))
+        self.flush_interval_s = max(0.01, float(flush_interval_s))
+        self.batch = max(1, int(batch))
+        self.stats = {"lines": 0, "flushes": 0, "rotations": 0, "errors": 0}
+        self._q: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._f: Optional[TextIO] = None
+        self._opened_at = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="stts-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write_line(self, line: str) -> None:
+        if not self._closed:
+            self._q.put(line)
+
+    def flush(self, timeout_s: float = 2.0) -> None:
+        """Block until everything queued so far is on disk."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._q.put((_FLUSH, done))
+        done.wait(timeout_s)
+
+    def close(self, timeout_s: float = 2.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(_CLOSE)
+        self._thread.join(timeout_s)
+
+    # -- writer thread -------------------------------------------------------
+
+    def _open(self) -> TextIO:
+        if self._f is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self.path, "a", encoding="utf-8")
+            self._opened_at = time.time()
+        return self._f
+
+    def _needs_rotation(self, f: TextIO) -> bool:
+        if self.max_bytes and f.tell() >= self.max_bytes:
+            return True
+        return bool(self.max_age_s) and f.tell() > 0 and (time.time() - self._opened_at) >= self.max_age_s
+
+    def _rotate(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        if self.backups <= 0:
+            os.unlink(self.path)
+        else:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self.stats["rotations"] += 1
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        try:
+            f = self._open()
+            f.write("".join(l + "\n" for l in lines))
+            f.flush()
+            self.stats["lines"] += len(lines)
+            self.stats["flushes"] += 1
+            if self._needs_rotation(f):
+                self._rotate()
+        except Exception:
+            self.stats["errors"] += 1
+
+    def _run(self) -> None:
+        pending: List[str] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, str):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval_s
+                if len(pending) < self.batch:
+                    continue
+            self._write(pending)
+            pending, deadline = [], None
+            if isinstance(item, tuple) and item and item[0] is _FLUSH:
+                item[1].set()
+            elif item is _CLOSE:
+                if self._f is not None:
+                    self._f.close()
+                    self._f = None
+                return
+
+
+class DaemonLogger:
+    """Daemon log: stderr lines plus a buffered (optionally JSON-lines) file."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        json_lines: bool = False,
+        stream: Optional[TextIO] = None,
+        **writer_kw: Any,
+    ):
+        self.json_lines = bool(json_lines)
+        self.stream = stream if stream is not None else sys.stderr
+        self.writer = BufferedFileWriter(path, **writer_kw) if path else None
+        self._local = threading.local()
+        self._ts_sec = -1
+        self._ts_str = ""
+
+    def _hms(self, now: float) -> str:
+        sec = int(now)
+        if sec != self._ts_sec:  # strftime once per second, not per line
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(sec))
+            self._ts_sec = sec
+        return self._ts_str
+
+    def _fields(self) -> Dict[str, Any]:
+        return getattr(self._local, "fields", None) or {}
+
+    def current_context(self) -> Dict[str, Any]:
+        """Context fields of this thread (to carry them over to another thread)."""
+        return dict(self._fields())
+
+    @contextlib.contextmanager
+    def context(self, **fields: Any) -> Iterator[None]:
+        """Attach `fields` (e.g. utt=42, stage="stt") to lines logged by this thread."""
+        prev = self._fields()
+        self._local.fields = {**prev, **fields}
+        try:
+            yield
+        finally:
+            self._local.fields = prev
+
+    def log(self, msg: str, **fields: Any) -> None:
+        now = time.time()
+        line = f"[{self._hms(now)}] {msg}"
+        try:
+            print(line, file=self.stream, flush=True)
+        except Exception:
+            pass
+        self._to_file(now, line, msg, "log", fields)
+
+    def event(self, event: str, **fields: Any) -> None:
+        """Structured record (per-stage timings etc.); file only, JSON-lines mode only."""
+        if self.writer is not None and self.json_lines:
+            self._to_file(time.time(), "", "", event, fields)
+
+    def _to_file(self, now: float, line: str, msg: str, event: str, fields: Dict[str, Any]) -> None:
+        if self.writer is None:
+            return
+        if not self.json_lines:
+            self.writer.write_line(line)
+            return
+        rec: Dict[str, Any] = {
+            "ts": datetime.datetime.fromtimestamp(now).isoformat(timespec="milliseconds"),
+            "event": event,
+        }
+        if msg:
+            rec["msg"] = msg
+        rec.update(self._fields())
+        rec.update(fields)
+        self.writer.write_line(json.dumps(rec, ensure_ascii=False, default=str))
+
+    def flush(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+__all__ = ["BufferedFileWriter", "DaemonLogger"]
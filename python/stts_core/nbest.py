@@ -0,0 +1,85 @@
+"""Speculative translation of STT n-best hypotheses.
+
+When the STT engine returns several hypotheses (`Transcript.alternatives`),
+all of them are translated concurrently. The result of the best-ranked
+hypothesis that yields an acceptable command wins, so a misrecognized top
+hypothesis costs no extra serial round trip. Each hypothesis runs on its own
+daemon thread: once a winner is known the slower translations are abandoned,
+and they never hold up interpreter exit.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from .safety import is_dangerous_command, is_sql_command
+
+
+def default_acceptable(cmd: str) -> bool:
+    """A translation is usable when it is non-empty, not SQL and not on the denylist."""
+    if not (cmd or "").strip() or is_sql_command(cmd):
+        return False
+    dangerous, _ = is_dangerous_command(cmd)
+    return not dangerous
+
+
+def hypotheses_for(shell: Any, text: str, config: Optional[dict] = None) -> List[str]:
+    """Top-k hypotheses of the shell's last transcript (`stt_nbest`), or just `text`."""
+    try:
+        k = int((config or {}).get("stt_nbest") or 1)
+    except Exception:
+        k = 1
+    tr = getattr(shell, "last_transcript", None)
+    if k <= 1 or tr is None or (tr.text or "").strip() != (text or "").strip():
+        return [text]
+    return tr.hypotheses(k) or [text]
+
+
+def _start(translate: Callable[[str], Optional[str]], text: str) -> "Future[Optional[str]]":
+    fut: "Future[Optional[str]]" = Future()
+
+    def run() -> None:
+        try:
+            fut.set_result(translate(text))
+        except BaseException as e:
+            fut.set_exception(e)
+
+    threading.Thread(target=run, name="stts-nbest", daemon=True).start()
+    return fut
+
+
+def translate_nbest(
+    translate: Callable[[str], Optional[str]],
+    hypotheses: List[str],
+    acceptable: Callable[[str], bool] = default_acceptable,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Translate hypotheses concurrently; return (hypothesis, command) of the best acceptable one.
+
+    Hypotheses are ranked by STT score (best first); a lower-ranked result is
+    used only after every better-ranked translation failed or was rejected by
+    `acceptable`. A single hypothesis is translated as-is.
+    """
+    hyps = [h for h in hypotheses if (h or "").strip()]
+    if not hyps:
+        return None, None
+    if len(hyps) == 1:
+        return hyps[0], translate(hyps[0])
+
+    futs = [_start(translate, h) for h in hyps]
+    top: Optional[str] = None
+    for i, (h, f) in enumerate(zip(hyps, futs)):
+        try:
+            cmd = f.result()
+        except Exception:
+            cmd = None
+        if i == 0:
+            top = cmd
+        if cmd and acceptable(cmd):
+            return h, cmd  # lower-ranked translations still running are abandoned
+    # Nothing acceptable: report the top hypothesis (callers run their own safety checks).
+    return hyps[0], top
+
+
+__all__ = ["default_acceptable", "hypotheses_for", "translate_nbest"]
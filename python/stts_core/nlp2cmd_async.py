@@ -0,0 +1,277 @@
+"""Non-blocking nlp2cmd service client for the STTS daemon.
+
+`nlp2cmd_service_query` blocks for up to `nlp2cmd_timeout` (30 s), which used
+to stall the daemon loop, listening included. `AsyncNLP2CMDClient` runs an
+asyncio event loop in a background thread and returns a cancellable
+`concurrent.futures.Future` per query, so the caller can go back to
+listening while the service works.
+
+With several service URLs configured the client hedges: if the first URL has
+not answered after `hedge_delay_s`, the same query is sent to the next one and
+the first response wins. Hedged requests are translation-only
+(`execute=False`) so a command is never executed twice by two services; the
+daemon executes the winning translation locally.
+
+Each URL has a circuit breaker (opened after `breaker_failures` consecutive
+failures, probed again after `breaker_reset_s`) and a health state refreshed
+by a background `/health` poll.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .nlp2cmd_client import nlp2cmd_service_health, nlp2cmd_service_query
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker: closed -> open -> half_open -> closed."""
+
+    def __init__(self, failure_threshold: int = 3, reset_s: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_s = float(reset_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or (self._clock() - self.opened_at) >= self.reset_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """May a request be sent? In half-open state only one probe is let through."""
+        with self._lock:
+            st = self._state()
+            if st == "closed":
+                return True
+            if st == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+            self._probing = False
+
+
+class AsyncNLP2CMDClient:
+    """Background asyncio client for one or more nlp2cmd service URLs."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        timeout_s: float = 30.0,
+        execute: bool = True,
+        hedge_delay_s: float = 0.5,
+        health_interval_s: float = 10.0,
+        breaker_failures: int = 3,
+        breaker_reset_s: float = 30.0,
+        query_fn: Callable[..., Optional[Dict[str, Any]]] = nlp2cmd_service_query,
+        health_fn: Callable[..., bool] = nlp2cmd_service_health,
+        on_health_change: Optional[Callable[[str, bool], None]] = None,
+    ):
+        self.urls = [u.strip() for u in urls if (u or "").strip()] or ["http://localhost:8000"]
+        self.timeout_s = float(timeout_s)
+        self.hedge_delay_s = max(0.0, float(hedge_delay_s))
+        self.hedging = len(self.urls) > 1 and self.hedge_delay_s > 0
+        self.execute = bool(execute) and not self.hedging
+        self.health_interval_s = float(health_interval_s)
+        self.query_fn = query_fn
+        self.health_fn = health_fn
+        self.on_health_change = on_health_change
+        self.health: Dict[str, Optional[bool]] = {u: None for u in self.urls}
+        self.breakers = {u: CircuitBreaker(breaker_failures, breaker_reset_s) for u in self.urls}
+        self.stats = {
+            "requests": 0, "completed": 0, "failed": 0, "cancelled": 0,
+            "hedged": 0, "hedge_wins": 0, "breaker_skips": 0,
+        }
+        self._stats_lock = threading.Lock()
+        self._pending: Set[Future] = set()
+        self._executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(self.urls)), thread_name_prefix="stts-nlp2cmd-http")
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(self._executor)
+        self._health_task: Optional[Future] = None
+        self._thread = threading.Thread(target=self._loop.run_forever, name="stts-nlp2cmd-async", daemon=True)
+        self._thread.start()
+
+    # -- public API ------------------------------------------------------
+
+    def submit(self, query: str) -> Future:
+        """Start a query; the Future resolves to the service response dict or None."""
+        self._bump("requests")
+        fut = asyncio.run_coroutine_threadsafe(self._query(query), self._loop)
+        with self._stats_lock:
+            self._pending.add(fut)
+        fut.add_done_callback(self._on_done)
+        return fut
+
+    def query(self, query: str) -> Optional[Dict[str, Any]]:
+        """Blocking convenience wrapper around `submit`."""
+        try:
+            return self.submit(query).result(timeout=self.timeout_s + 5.0)
+        except Exception:
+            return None
+
+    def pending(self) -> int:
+        with self._stats_lock:
+            return len(self._pending)
+
+    def cancel_all(self) -> int:
+        with self._stats_lock:
+            futs = list(self._pending)
+        return sum(1 for f in futs if f.cancel())
+
+    def healthy(self) -> bool:
+        return any(self.health.get(u) for u in self.urls)
+
+    def check_health(self, timeout_s: float = 2.5) -> bool:
+        """Refresh the health of every URL now (blocking). True when any is healthy."""
+        try:
+            asyncio.run_coroutine_threadsafe(self._refresh_health(timeout_s), self._loop).result(timeout=timeout_s + 5.0)
+        except Exception:
+            pass
+        return self.healthy()
+
+    def start_health_monitor(self) -> None:
+        if self._health_task is None and self.health_interval_s > 0:
+            self._health_task = asyncio.run_coroutine_threadsafe(self._health_loop(), self._loop)
+
+    def close(self) -> None:
+        self.cancel_all()
+        if self._health_task is not None:
+            self._health_task.cancel()
+        try:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=2.0)
+        except Exception:
+            pass
+        if not self._thread.is_alive() and not self._loop.is_closed():
+            self._loop.close()
+        self._executor.shutdown(wait=False)
+
+    # -- internals -------------------------------------------------------
+
+    def _bump(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _on_done(self, fut: Future) -> None:
+        with self._stats_lock:
+            self._pending.discard(fut)
+        if fut.cancelled():
+            self._bump("cancelled")
+            return
+        try:
+            ok = fut.result() is not None
+        except Exception:
+            ok = False
+        self._bump("completed" if ok else "failed")
+
+    def _candidates(self) -> List[str]:
+        # Healthy URLs first, then unknown, then unhealthy; configured order otherwise.
+        rank = {True: 0, None: 1, False: 2}
+        return sorted(self.urls, key=lambda u: rank[self.health.get(u)])
+
+    def _call(self, url: str, query: str) -> Optional[Dict[str, Any]]:
+        return self.query_fn(query=query, url=url, execute=self.execute, timeout=self.timeout_s)
+
+    async def _query(self, query: str) -> Optional[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_s
+        queue = self._candidates()
+        first_url: Optional[str] = None
+        tasks: Dict[asyncio.Future, str] = {}
+
+        def launch() -> bool:
+            nonlocal first_url
+            while queue:
+                url = queue.pop(0)
+                if not self.breakers[url].allow():
+                    self._bump("breaker_skips")
+                    continue
+                tasks[loop.run_in_executor(None, self._call, url, query)] = url
+                if first_url is None:
+                    first_url = url
+                return True
+            return False
+
+        launch()
+        try:
+            while tasks:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                can_hedge = self.hedging and bool(queue)
+                wait_s = min(remaining, self.hedge_delay_s) if can_hedge else remaining
+                done, _ = await asyncio.wait(list(tasks.keys()), timeout=wait_s, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if can_hedge and launch():
+                        self._bump("hedged")
+                    continue
+                for t in done:
+                    url = tasks.pop(t)
+                    try:
+                        data = t.result()
+                    except Exception:
+                        data = None
+                    if data is not None:
+                        self.breakers[url].record_success()
+                        if url != first_url:
+                            self._bump("hedge_wins")
+                        return data
+                    self.breakers[url].record_failure()
+                if not tasks:
+                    launch()  # fail over to the next URL
+            return None
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    async def _refresh_health(self, timeout_s: float = 2.5) -> None:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, lambda u=u: bool(self.health_fn(u, timeout=timeout_s))) for u in self.urls),
+            return_exceptions=True,
+        )
+        for url, ok in zip(self.urls, results):
+            ok = ok is True
+            prev = self.health.get(url)
+            self.health[url] = ok
+            if ok and self.breakers[url].state != "closed":
+                self.breakers[url].record_success()
+            if prev is not None and prev != ok and self.on_health_change is not None:
+                try:
+                    self.on_health_change(url, ok)
+                except Exception:
+                    pass
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval_s)
+            await self._refresh_health()
+
+
+__all__ = ["AsyncNLP2CMDClient", "CircuitBreaker"]
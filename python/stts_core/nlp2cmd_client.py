@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Dict, Optional, Tuple
 
+from .http_client import get_client
+
 
 def nlp2cmd_service_query_ex(
     query: str,
@@ -11,29 +12,18 @@ def nlp2cmd_service_query_ex(
     timeout: float = 30.0,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
     try:
-        import urllib.request
-
         endpoint = f"{url.rstrip('/')}/query"
-        payload = (
-            json.dumps(
-                {
-                    "query": query,
-                    "dsl": "shell",
-                    "execute": execute,
-                }
-            )
-        ).encode("utf-8")
-
-        req = urllib.request.Request(
+        resp = get_client().post_json(
             endpoint,
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST",
+            {
+                "query": query,
+                "dsl": "shell",
+                "execute": execute,
+            },
+            timeout=timeout,
         )
-
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            return data, None
+        resp.raise_for_status()
+        return resp.json(), None
     except Exception as e:
         return None, e
 
@@ -55,14 +45,12 @@ def nlp2cmd_service_query(
 
 def nlp2cmd_service_health_ex(url: str, timeout: float = 2.5) -> Tuple[bool, Optional[Exception]]:
     try:
-        import urllib.request
-
         endpoint = f"{url.rstrip('/')}/health"
-        with urllib.request.urlopen(endpoint, timeout=timeout) as resp:
-            if getattr(resp, "status", 0) != 200:
-                return False, None
-            data = json.loads(resp.read().decode("utf-8"))
-            return (data or {}).get("status") == "healthy", None
+        resp = get_client().get(endpoint, timeout=timeout)
+        if resp.status != 200:
+            return False, None
+        data = resp.json()
+        return (data or {}).get("status") == "healthy", None
     except Exception as e:
         return False, e
 
@@ -0,0 +1,219 @@
+"""Load driver replaying transcripts through the daemon's nlp2cmd path.
+
+Each transcript goes through `DaemonHandlers.query_nlp2cmd` and
+`execute_from_result` (with a no-op command runner by default), from
+`--concurrency` threads. Reports p50/p95/p99 for the end-to-end time and for
+each stage (`query`, `execute`):
+
+    python3 -m stts_core.nlp2cmd_loadtest --standin --latency lognormal:40:0.5 -n 500 -c 8
+    python3 -m stts_core.nlp2cmd_loadtest --url http://localhost:8008 --transcripts utterances.txt
+
+`--standin` starts `nlp2cmd_standin` in-process on a free port. With
+`--execute` the translated commands really run and pass the daemon's
+safety checks (`stts_core.safety.check_command_safety`) first. Like the
+daemon, the driver shares one keep-alive HTTP pool (`STTS_HTTP_POOL_SIZE`,
+default 4), so at higher concurrency the `query` stage includes queueing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from .daemon_handlers import DaemonHandlers
+from .nlp2cmd_client import nlp2cmd_service_health, nlp2cmd_service_query
+from .safety import check_command_safety
+
+DEFAULT_TRANSCRIPTS = [
+    "pokaż pliki",
+    "lista kontenerów docker",
+    "ile miejsca zostało na dysku",
+    "pokaż procesy pythona",
+    "znajdź pliki większe niż sto megabajtów",
+    "status repozytorium git",
+    "pokaż ostatnie logi systemowe",
+    "sprawdź połączenie z google",
+]
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    v = sorted(values)
+    if not v:
+        return 0.0
+    k = max(0, min(len(v) - 1, int(math.ceil(q / 100.0 * len(v))) - 1))
+    return float(v[k])
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Count, mean and p50/p95/p99/max in milliseconds."""
+    ms = [x * 1000.0 for x in values]
+    return {
+        "n": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 2) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2) if ms else 0.0,
+    }
+
+
+class _Deps:
+    def __init__(self, run_local_tiers: bool, execute_cmd: bool = False):
+        self.nlp2cmd_service_query = nlp2cmd_service_query
+        self.nlp2cmd_service_health = nlp2cmd_service_health
+        if execute_cmd:
+            # commands really run (shell=True): apply the daemon's denylist
+            self.check_command_safety = lambda cmd, cfg, dry_run=False: check_command_safety(
+                cmd, {**(cfg or {}), "_daemon": True}, dry_run, cprint=lambda c, m: print(m, file=sys.stderr)
+            )
+        else:
+            self.check_command_safety = lambda cmd, cfg, dry_run=False: (True, "")
+        if run_local_tiers:
+            from .intents import TierAudit, build_intent_engine
+
+            engine = build_intent_engine({})
+            audit = TierAudit()
+            self.get_intent_engine = lambda cfg: engine
+            self.get_tier_audit = lambda cfg: audit
+
+
+class _Shell:
+    """Minimal VoiceShell stand-in: no TTS, commands are not really executed."""
+
+    def __init__(self, deps: Any, execute_cmd: bool):
+        self.deps = deps
+        self.config: Dict[str, Any] = {}
+        self.tts = None
+        self._execute_cmd = execute_cmd
+
+    def speak(self, text: str) -> None:
+        pass
+
+    def run_command_any(self, cmd: str):
+        if not self._execute_cmd:
+            return "", 0, True
+        import subprocess
+
+        r = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        return (r.stdout or "") + (r.stderr or ""), r.returncode, True
+
+
+class _QuietHandlers(DaemonHandlers):
+    def log(self, msg: str) -> None:
+        pass
+
+
+def run_load(
+    url: str,
+    transcripts: Sequence[str],
+    requests: int = 100,
+    concurrency: int = 4,
+    timeout_s: float = 30.0,
+    local_tiers: bool = False,
+    execute_cmd: bool = False,
+) -> Dict[str, Any]:
+    """Replay `requests` transcripts (round-robin) and return the latency report."""
+    shell = _Shell(_Deps(local_tiers, execute_cmd), execute_cmd)
+    handlers = _QuietHandlers(shell)
+    handlers.nlp2cmd_url = url
+    handlers.nlp2cmd_timeout = float(timeout_s)
+    handlers.execute = False
+    handlers.client = handlers._build_client()
+    lock = threading.Lock()
+    stages: Dict[str, List[float]] = {"query": [], "execute": [], "total": []}
+    failed = [0]
+
+    def one(i: int) -> None:
+        text = transcripts[i % len(transcripts)]
+        t0 = time.perf_counter()
+        result = handlers.query_nlp2cmd(text)
+        t1 = time.perf_counter()
+        if result is None:
+            with lock:
+                failed[0] += 1
+                stages["query"].append(t1 - t0)
+            return
+        handlers.execute_from_result(result)
+        t2 = time.perf_counter()
+        with lock:
+            stages["query"].append(t1 - t0)
+            stages["execute"].append(t2 - t1)
+            stages["total"].append(t2 - t0)
+
+    t_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, int(concurrency))) as ex:
+            list(ex.map(one, range(int(requests))))
+    finally:
+        handlers.close()
+    wall = time.perf_counter() - t_start
+    return {
+        "requests": int(requests),
+        "failed": failed[0],
+        "concurrency": int(concurrency),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(int(requests) / wall, 2) if wall > 0 else 0.0,
+        "stages": {k: summarize(v) for k, v in stages.items()},
+    }
+
+
+def format_report(rep: Dict[str, Any]) -> str:
+    lines = [
+        f"requests: {rep['requests']}  failed: {rep['failed']}  concurrency: {rep['concurrency']}  "
+        f"wall: {rep['wall_s']}s  throughput: {rep['throughput_rps']} req/s",
+        f"{'stage':<8} {'n':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  (ms)",
+    ]
+    for name in ("total", "query", "execute"):
+        s = rep["stages"][name]
+        lines.append(
+            f"{name:<8} {s['n']:>6} {s['mean_ms']:>9.2f} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+            f"{s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description="Replay transcripts through the daemon nlp2cmd path")
+    ap.add_argument("--url", default="http://localhost:8008", help="nlp2cmd service URL(s), comma-separated")
+    ap.add_argument("--standin", action="store_true", help="start a local stand-in service")
+    ap.add_argument("--latency", default="lognormal:40:0.5", help="stand-in latency spec (ms)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="stand-in error rate")
+    ap.add_argument("--transcripts", help="file with one transcript per line")
+    ap.add_argument("-n", "--requests", type=int, default=200)
+    ap.add_argument("-c", "--concurrency", type=int, default=4)
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--local-tiers", action="store_true", help="answer known intents locally first")
+    ap.add_argument("--execute", action="store_true", help="really run the translated commands")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    a = ap.parse_args(argv)
+
+    transcripts = list(DEFAULT_TRANSCRIPTS)
+    if a.transcripts:
+        with open(a.transcripts, encoding="utf-8") as f:
+            transcripts = [l.strip() for l in f if l.strip()] or transcripts
+
+    svc = None
+    url = a.url
+    if a.standin:
+        from .nlp2cmd_standin import StandInService
+
+        svc = StandInService(latency=a.latency, error_rate=a.error_rate, seed=1).start()
+        url = svc.url
+    try:
+        rep = run_load(url, transcripts, a.requests, a.concurrency, a.timeout, a.local_tiers, a.execute)
+    finally:
+        if svc is not None:
+            svc.stop()
+    print(json.dumps(rep, indent=2) if a.json else format_report(rep))
+    return 0 if rep["failed"] < rep["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Standalone nlp2cmd translator daemon on a Unix domain socket.
+
+Short-lived `stts` invocations (e.g. each `./stts nlp2cmd ... {STT}` pipeline
+call) otherwise pay the nlp2cmd import and a cold `RuleBasedPipeline` every
+time. This server hosts an `NLP2CMDWorkerPool` behind a Unix socket so every
+`stts` process on the machine reuses the same warm translator.
+
+The protocol is the worker's JSON lines, one request per line; responses may
+arrive out of order and are matched by id:
+
+    -> {"id": 1, "text": "pokaż pliki"}
+    <- {"id": 1, "ok": true, "command": "ls -la", "error": "", "confidence": 0.9, ...}
+    -> {"op": "ping"}
+    <- {"op": "ping", "ready": true, "error": null, "workers": 2, "pid": 1234}
+
+When the workers could not import nlp2cmd, `ping` reports their `error` and
+translations are answered at once with `"ready": false`; clients then fall
+back to their own translation path.
+
+The server exits after `idle_timeout_s` without requests. Manual control:
+
+    python3 -m stts_core.nlp2cmd_socket serve --socket ~/.config/stts-python/nlp2cmd.sock
+    python3 -m stts_core.nlp2cmd_socket status|stop --socket ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import jsonl_socket
+from .jsonl_socket import JsonLinesHandler, JsonLinesServer
+from .nlp2cmd_worker import NLP2CMDWorkerPool
+
+
+class _Handler(JsonLinesHandler):
+    def handle_request(self, req: Dict[str, Any]) -> None:
+        srv: "NLP2CMDSocketServer" = self.server  # type: ignore[assignment]
+        srv.touch()
+        op = req.get("op")
+        if op == "ping":
+            self.send({
+                "op": "ping",
+                "ready": srv.pool.wait_ready(0.0),
+                "error": srv.pool.init_error,
+                "workers": srv.pool.size,
+                "pid": os.getpid(),
+            })
+            return
+        if op == "shutdown":
+            self.send({"op": "shutdown", "ok": True})
+            threading.Thread(target=srv.shutdown, daemon=True).start()
+            return
+        rid = req.get("id")
+        err = srv.pool.init_error
+        if err is not None:
+            self.send({"id": rid, "ok": False, "ready": False, "command": "", "error": err})
+            return
+        t0 = time.perf_counter()
+        fut = srv.pool.submit(str(req.get("text") or ""), req.get("timeout_s"))
+
+        def done(f) -> None:
+            try:
+                cmd = f.result()
+            except Exception:
+                cmd = None
+            res = getattr(f, "response", None) or {}
+            srv.touch()
+            self.send({
+                "id": rid,
+                "ok": bool(cmd),
+                "command": cmd or "",
+                "error": "" if cmd else (res.get("error") or "no translation"),
+                "confidence": res.get("confidence"),
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+            })
+
+        fut.add_done_callback(done)
+
+
+class NLP2CMDSocketServer(JsonLinesServer):
+    """Unix-socket front end for a shared `NLP2CMDWorkerPool`."""
+
+    def __init__(self, path: str, pool: NLP2CMDWorkerPool, idle_timeout_s: float = 600.0):
+        self.pool = pool
+        self.idle_timeout_s = float(idle_timeout_s)
+        self._last = time.monotonic()
+        super().__init__(path, _Handler, in_use_message="nlp2cmd socket server already running")
+        if self.idle_timeout_s > 0:
+            threading.Thread(target=self._idle_loop, name="stts-nlp2cmd-sock-idle", daemon=True).start()
+
+    def touch(self) -> None:
+        self._last = time.monotonic()
+
+    def _idle_loop(self) -> None:
+        while True:
+            time.sleep(min(5.0, max(0.05, self.idle_timeout_s / 4)))
+            if (time.monotonic() - self._last) >= self.idle_timeout_s and self.pool.inflight() == 0:
+                self.shutdown()
+                return
+
+
+class NLP2CMDSocketClient:
+    """Client for `NLP2CMDSocketServer` (one short connection per call)."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, path: str):
+        self.path = str(path)
+
+    def _call(self, payload: Dict[str, Any], timeout_s: float) -> Optional[Dict[str, Any]]:
+        return jsonl_socket.call(self.path, payload, timeout_s)
+
+    def ping(self, timeout_s: float = 1.0) -> Optional[Dict[str, Any]]:
+        return self._call({"op": "ping"}, timeout_s)
+
+    def shutdown(self, timeout_s: float = 2.0) -> bool:
+        return bool((self._call({"op": "shutdown"}, timeout_s) or {}).get("ok"))
+
+    def translate(self, text: str, timeout_s: float = 20.0) -> Optional[Dict[str, Any]]:
+        """Response dict (`ok`, `command`, `elapsed_ms`, ...) or None when the server is unreachable."""
+        return self._call({"id": next(self._ids), "text": str(text), "timeout_s": float(timeout_s)}, timeout_s + 1.0)
+
+
+def ensure_server(
+    path: str,
+    python_exe: str,
+    workers: int = 1,
+    idle_timeout_s: float = 600.0,
+    wait_s: float = 20.0,
+) -> bool:
+    """Start a detached socket server unless one is running; wait until it is ready."""
+    client = NLP2CMDSocketClient(path)
+    if (client.ping() or {}).get("ready"):
+        return True
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    lock_path = str(path) + ".lock"
+    try:
+        import fcntl
+
+        lock_f = open(lock_path, "w")
+        fcntl.flock(lock_f, fcntl.LOCK_EX)
+    except Exception:
+        lock_f = None
+    try:
+        if client.ping() is None:  # nobody started it while we waited for the lock
+            env = os.environ.copy()
+            pkg_root = str(Path(__file__).resolve().parents[1])
+            env["PYTHONPATH"] = pkg_root + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+            subprocess.Popen(
+                [
+                    sys.executable, "-m", "stts_core.nlp2cmd_socket", "serve",
+                    "--socket", str(path), "--python", python_exe,
+                    "--workers", str(int(workers)), "--idle-timeout", str(float(idle_timeout_s)),
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=env,
+                start_new_session=True,
+            )
+        deadline = time.monotonic() + float(wait_s)
+        while time.monotonic() < deadline:
+            st = client.ping(timeout_s=0.5)
+            if st is not None and st.get("ready"):
+                return True
+            if st is not None and st.get("error"):
+                return False  # workers cannot import nlp2cmd: waiting will not help
+            time.sleep(0.05)
+        return False
+    finally:
+        if lock_f is not None:
+            lock_f.close()
+
+
+def translate_via_socket(
+    path: str,
+    text: str,
+    autostart_python: Optional[str] = None,
+    workers: int = 1,
+    idle_timeout_s: float = 600.0,
+    timeout_s: float = 20.0,
+) -> Optional[Dict[str, Any]]:
+    """Translate through the shared server; start it first when `autostart_python` is given.
+
+    None when no server answers or its workers cannot translate (`ready: false`).
+    """
+    if not autostart_python and not os.path.exists(path):
+        return None
+    client = NLP2CMDSocketClient(path)
+    resp = client.translate(text, timeout_s) if os.path.exists(path) else None
+    if resp is None and autostart_python:
+        if ensure_server(path, autostart_python, workers=workers, idle_timeout_s=idle_timeout_s):
+            resp = client.translate(text, timeout_s)
+    if resp is not None and resp.get("ready") is False:
+        return None
+    return resp
+
+
+def server_available(path: str, timeout_s: float = 0.5) -> bool:
+    """True when a server answers on `path` and its workers did not fail to import nlp2cmd."""
+    if not os.path.exists(path):
+        return False
+    st = NLP2CMDSocketClient(path).ping(timeout_s=timeout_s)
+    return st is not None and not st.get("error")
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description="Shared nlp2cmd translator on a Unix socket")
+    ap.add_argument("action", choices=["serve", "status", "stop"])
+    ap.add_argument("--socket", required=True)
+    ap.add_argument("--python", default=sys.executable, help="Python with nlp2cmd installed")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--idle-timeout", type=float, default=600.0)
+    a = ap.parse_args(argv)
+    path = str(Path(a.socket).expanduser())
+
+    if a.action == "status":
+        st = NLP2CMDSocketClient(path).ping()
+        print(json.dumps(st) if st else "not running")
+        return 0 if st else 1
+    if a.action == "stop":
+        return 0 if NLP2CMDSocketClient(path).shutdown() else 1
+
+    pool = NLP2CMDWorkerPool(a.python, size=a.workers)
+    try:
+        srv = NLP2CMDSocketServer(path, pool, idle_timeout_s=a.idle_timeout)
+    except OSError as e:
+        pool.close()
+        print(str(e), file=sys.stderr)
+        return 1
+    try:
+        srv.serve_forever(poll_interval=0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
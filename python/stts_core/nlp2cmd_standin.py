@@ -0,0 +1,193 @@
+"""Lightweight stand-in for the nlp2cmd HTTP service (offline load testing).
+
+Implements the two endpoints the daemon uses (`GET /health`, `POST /query`)
+with a configurable latency distribution, error rate and canned
+translations, so daemon throughput and tail latency can be measured in CI or
+on air-gapped machines:
+
+    python3 -m stts_core.nlp2cmd_standin --port 8008 --latency lognormal:40:0.5 --error-rate 0.02
+
+Latency specs (milliseconds):
+    fixed:MS | uniform:LO:HI | normal:MEAN:STDDEV | lognormal:MEDIAN:SIGMA
+
+Translations come from a JSON object file (`{"pokaż pliki": "ls -la"}`),
+then the built-in intent table; anything else becomes `echo <text>`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import shlex
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+from .intents import build_intent_engine
+
+
+def parse_latency(spec: Optional[str], rng: Optional[random.Random] = None) -> Callable[[], float]:
+    """Latency sampler (seconds) from a spec such as `uniform:20:80` (ms)."""
+    rng = rng or random.Random()
+    parts = str(spec or "fixed:0").strip().lower().split(":")
+    kind, args = parts[0], [float(x) for x in parts[1:] if x != ""]
+    if kind == "fixed" and len(args) == 1:
+        return lambda: max(0.0, args[0]) / 1000.0
+    if kind == "uniform" and len(args) == 2:
+        return lambda: max(0.0, rng.uniform(args[0], args[1])) / 1000.0
+    if kind == "normal" and len(args) == 2:
+        return lambda: max(0.0, rng.gauss(args[0], args[1])) / 1000.0
+    if kind == "lognormal" and len(args) == 2:
+        mu = math.log(max(args[0], 1e-6))
+        return lambda: rng.lognormvariate(mu, args[1]) / 1000.0
+    raise ValueError(f"invalid latency spec: {spec!r}")
+
+
+class StandInService:
+    """Threaded HTTP server speaking the nlp2cmd service protocol."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        translations: Optional[Dict[str, str]] = None,
+        seed: Optional[int] = None,
+    ):
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._sample = parse_latency(latency, self._rng)
+        self.error_rate = max(0.0, min(1.0, float(error_rate)))
+        self.translations = {k.strip().lower(): v for k, v in (translations or {}).items()}
+        self._intents = build_intent_engine({"intent_threshold": 1.0})
+        self.healthy = True
+        self.stats = {"health": 0, "queries": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, int(port)), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInService":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stts-nlp2cmd-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def translate(self, query: str) -> str:
+        text = str(query or "").strip()
+        if text.lower().startswith("shell:"):
+            text = text.split(":", 1)[1].strip()
+        hit = self.translations.get(text.lower())
+        if hit:
+            return hit
+        m = self._intents.match(text) if self._intents is not None else None
+        return m.command if m is not None else f"echo {shlex.quote(text)}"
+
+    def _bump(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _roll(self) -> tuple:
+        with self._rng_lock:
+            return self._sample(), self._rng.random() < self.error_rate
+
+    def _handler_class(self):
+        svc = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # headers and body are written separately; avoid Nagle/delayed-ACK stalls
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, fmt, *args):  # keep load tests quiet
+                pass
+
+            def _send(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/") != "/health":
+                    self._send(404, {"error": "not found"})
+                    return
+                svc._bump("health")
+                self._send(200 if svc.healthy else 503, {"status": "healthy" if svc.healthy else "unhealthy"})
+
+            def do_POST(self):
+                n = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(n) if n else b""
+                if self.path.rstrip("/") != "/query":
+                    self._send(404, {"error": "not found"})
+                    return
+                try:
+                    req = json.loads(raw.decode("utf-8") or "{}")
+                except Exception:
+                    self._send(400, {"success": False, "errors": ["invalid JSON"]})
+                    return
+                svc._bump("queries")
+                delay, fail = svc._roll()
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    svc._bump("errors")
+                    self._send(500, {"success": False, "errors": ["injected failure"]})
+                    return
+                cmd = svc.translate(req.get("query", ""))
+                self._send(200, {
+                    "success": True,
+                    "command": cmd,
+                    "confidence": 0.9,
+                    "errors": [],
+                    "latency_ms": round(delay * 1000.0, 1),
+                })
+
+        return Handler
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description="Stand-in nlp2cmd service (GET /health, POST /query)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8008)
+    ap.add_argument("--latency", default="fixed:0", help="fixed:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--translations", help="JSON file: {\"tekst\": \"komenda\"}")
+    ap.add_argument("--seed", type=int)
+    a = ap.parse_args(argv)
+    translations = None
+    if a.translations:
+        with open(a.translations, encoding="utf-8") as f:
+            translations = json.load(f)
+    svc = StandInService(a.host, a.port, a.latency, a.error_rate, translations, a.seed)
+    print(f"nlp2cmd stand-in listening on {svc.url}", file=sys.stderr, flush=True)
+    try:
+        svc.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        svc.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,391 @@
+"""Persistent nlp2cmd translation worker processes for STTS.
+
+Each worker is a long-lived Python subprocess hosting nlp2cmd's
+`RuleBasedPipeline`, speaking JSON lines over stdin/stdout:
+
+    -> {"id": 7, "text": "pokaż pliki"}
+    <- {"id": 7, "ok": true, "command": "ls -la", "error": "", "confidence": 0.9, "elapsed_ms": 3.1}
+
+On start a worker announces `{"ready": true, "error": null}` once the
+pipeline is imported. `NLP2CMDWorkerPool` runs N workers, routes each request
+to the least-loaded one, matches responses by id (so they may complete out of
+order), enforces per-request deadlines and respawns workers that exit or hang.
+`translate_once` speaks the same protocol for one-shot calls.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+WORKER_CODE = """
+import sys, json, time
+
+pipeline = None
+err = None
+try:
+    from nlp2cmd.generation.pipeline import RuleBasedPipeline
+    try:
+        pipeline = RuleBasedPipeline(use_enhanced_context=False)
+    except TypeError:
+        pipeline = RuleBasedPipeline()
+except Exception as e:
+    err = str(e)
+
+sys.stdout.write(json.dumps({'ready': pipeline is not None, 'error': err}) + '\\n')
+sys.stdout.flush()
+
+for line in sys.stdin:
+    s = (line or '').strip()
+    if not s:
+        continue
+    try:
+        req = json.loads(s)
+    except Exception:
+        req = {'text': s}
+    rid = req.get('id')
+    text = str(req.get('text', '') or '')
+    if not pipeline:
+        out = {'ok': False, 'command': '', 'error': err or 'nlp2cmd not available'}
+    else:
+        try:
+            t0 = time.perf_counter()
+            r = pipeline.process(text)
+            cmd = (getattr(r, 'command', '') or '').strip()
+            conf = getattr(r, 'confidence', None)
+            out = {
+                'ok': bool(cmd), 'command': cmd, 'error': '',
+                'confidence': conf if isinstance(conf, (int, float)) else None,
+                'elapsed_ms': round((time.perf_counter() - t0) * 1000.0, 1),
+            }
+        except Exception as e:
+            out = {'ok': False, 'command': '', 'error': str(e)}
+    out['id'] = rid
+    sys.stdout.write(json.dumps(out, ensure_ascii=False) + '\\n')
+    sys.stdout.flush()
+"""
+
+
+@dataclass
+class _Request:
+    req_id: int
+    text: str
+    deadline: float
+    future: Future
+    attempts: int = 0
+
+
+class _WorkerProc:
+    """One nlp2cmd worker subprocess plus its stdout reader thread."""
+
+    def __init__(self, pool: "NLP2CMDWorkerPool", slot: int):
+        self.pool = pool
+        self.slot = slot
+        self.started_at = time.monotonic()
+        self.inflight: Dict[int, _Request] = {}
+        self.ready = threading.Event()
+        self.error: Optional[str] = None
+        self._write_lock = threading.Lock()
+        env = os.environ.copy()
+        env.setdefault("NLP2CMD_USE_ENHANCED_CONTEXT", "0")
+        self.proc = subprocess.Popen(
+            [pool.python_exe, "-u", "-c", pool.code],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            env=env,
+        )
+        self._reader = threading.Thread(target=self._read_loop, name=f"stts-nlp2cmd-{slot}", daemon=True)
+        self._reader.start()
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def send(self, req: _Request) -> None:
+        payload = json.dumps({"id": req.req_id, "text": req.text}, ensure_ascii=False)
+        with self._write_lock:
+            assert self.proc.stdin is not None
+            self.proc.stdin.write(payload + "\n")
+            self.proc.stdin.flush()
+
+    def _read_loop(self) -> None:
+        try:
+            assert self.proc.stdout is not None
+            for line in self.proc.stdout:
+                self.pool._on_line(self, line)
+        except Exception:
+            pass
+        self.ready.set()  # unblock waiters; health check notices the exit
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=1.0)
+        except Exception:
+            pass
+        for f in (self.proc.stdin, self.proc.stdout):
+            try:
+                if f:
+                    f.close()
+            except Exception:
+                pass
+
+
+class NLP2CMDWorkerPool:
+    """Pool of nlp2cmd worker subprocesses with pipelined, id-tagged requests."""
+
+    def __init__(
+        self,
+        python_exe: str,
+        size: int = 1,
+        default_timeout_s: float = 20.0,
+        code: str = WORKER_CODE,
+        health_interval_s: float = 0.2,
+    ):
+        self.python_exe = python_exe
+        self.code = code
+        self.size = max(1, int(size))
+        self.default_timeout_s = float(default_timeout_s)
+        self.health_interval_s = float(health_interval_s)
+        self.stats = {"requests": 0, "completed": 0, "failed": 0, "timeouts": 0, "retries": 0, "respawns": 0}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._workers: List[_WorkerProc] = [_WorkerProc(self, i) for i in range(self.size)]
+        self._monitor = threading.Thread(target=self._health_loop, name="stts-nlp2cmd-health", daemon=True)
+        self._monitor.start()
+
+    # -- public API ------------------------------------------------------
+
+    def submit(self, text: str, timeout_s: Optional[float] = None) -> Future:
+        """Queue a translation; the Future resolves to the command or None.
+
+        The worker's full reply is attached as `future.response` when it arrives.
+        """
+        fut: Future = Future()
+        if not text:
+            fut.set_result(None)
+            return fut
+        t = self.default_timeout_s if timeout_s is None else float(timeout_s)
+        req = _Request(next(self._ids), str(text), time.monotonic() + t, fut)
+        with self._lock:
+            self.stats["requests"] += 1
+        self._dispatch(req)
+        return fut
+
+    def translate(self, text: str, timeout_s: Optional[float] = None) -> Optional[str]:
+        t = self.default_timeout_s if timeout_s is None else float(timeout_s)
+        try:
+            return self.submit(text, t).result(timeout=t + 1.0)
+        except Exception:
+            return None
+
+    def translate_many(self, texts: List[str], timeout_s: Optional[float] = None) -> List[Optional[str]]:
+        """Translate several candidates concurrently (one result per input, in order)."""
+        t = self.default_timeout_s if timeout_s is None else float(timeout_s)
+        futs = [self.submit(x, t) for x in texts]
+        out: List[Optional[str]] = []
+        for f in futs:
+            try:
+                out.append(f.result(timeout=t + 1.0))
+            except Exception:
+                out.append(None)
+        return out
+
+    def wait_ready(self, timeout_s: Optional[float] = None) -> bool:
+        """Wait until at least one worker has imported nlp2cmd. Returns readiness."""
+        deadline = None if timeout_s is None else time.monotonic() + float(timeout_s)
+        while True:
+            with self._lock:
+                workers = list(self._workers)
+            if any(w.ready.is_set() and w.error is None and w.alive() for w in workers):
+                return True
+            if all(w.ready.is_set() for w in workers):
+                return False
+            left = None if deadline is None else deadline - time.monotonic()
+            if left is not None and left <= 0:
+                return False
+            workers[0].ready.wait(0.05 if left is None else min(0.05, left))
+
+    @property
+    def init_error(self) -> Optional[str]:
+        """Import error once every worker reported failing to load nlp2cmd (nothing can translate), else None."""
+        with self._lock:
+            workers = list(self._workers)
+        if workers and all(w.ready.is_set() and w.error is not None for w in workers):
+            return workers[0].error
+        return None
+
+    def warm_up(self, text: str = "pokaż pliki", timeout_s: Optional[float] = None) -> bool:
+        """Send one throw-away translation to every worker (fills nlp2cmd's lazy caches).
+
+        Returns True when at least one worker answered.
+        """
+        t = self.default_timeout_s if timeout_s is None else float(timeout_s)
+        if not self.wait_ready(t):
+            return False
+        with self._lock:
+            workers = [w for w in self._workers if w.alive() and w.error is None]
+        futs = []
+        for w in workers:
+            req = _Request(next(self._ids), str(text), time.monotonic() + t, Future())
+            with self._lock:
+                w.inflight[req.req_id] = req
+            try:
+                w.send(req)
+                futs.append(req.future)
+            except Exception:
+                pass
+        ok = False
+        for f in futs:
+            try:
+                f.result(timeout=t + 1.0)
+                ok = True
+            except Exception:
+                pass
+        return ok
+
+    def inflight(self) -> int:
+        with self._lock:
+            return sum(len(w.inflight) for w in self._workers)
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        with self._lock:
+            workers = list(self._workers)
+            reqs = [r for w in workers for r in w.inflight.values()]
+            for w in workers:
+                w.inflight.clear()
+        for r in reqs:
+            if not r.future.done():
+                r.future.set_result(None)
+        for w in workers:
+            w.kill()
+
+    # -- internals -------------------------------------------------------
+
+    def _dispatch(self, req: _Request) -> None:
+        with self._lock:
+            alive = [w for w in self._workers if w.alive()]
+            if self._closed.is_set() or not alive:
+                self.stats["failed"] += 1
+                req.future.set_result(None)
+                return
+            w = min(alive, key=lambda x: len(x.inflight))
+            w.inflight[req.req_id] = req
+        try:
+            w.send(req)
+        except Exception:
+            # Broken pipe: leave it in-flight; the health check respawns and retries.
+            pass
+
+    def _on_line(self, w: _WorkerProc, line: str) -> None:
+        try:
+            res = json.loads((line or "").strip())
+        except Exception:
+            return
+        if not isinstance(res, dict):
+            return
+        if "ready" in res and "id" not in res:
+            w.error = None if res.get("ready") else str(res.get("error") or "nlp2cmd not available")
+            w.ready.set()
+            return
+        with self._lock:
+            req = w.inflight.pop(res.get("id"), None)
+            if req is not None:
+                self.stats["completed" if res.get("ok") else "failed"] += 1
+        if req is None or req.future.done():
+            return
+        cmd = (res.get("command") or "").strip()
+        req.future.response = res  # full reply (confidence, error) for callers that forward it
+        req.future.set_result(cmd or None)
+
+    def _health_loop(self) -> None:
+        while not self._closed.wait(self.health_interval_s):
+            self._check_health()
+
+    def _check_health(self) -> None:
+        now = time.monotonic()
+        expired: List[_Request] = []
+        retry: List[_Request] = []
+        with self._lock:
+            for i, w in enumerate(self._workers):
+                late = [r for r in w.inflight.values() if r.deadline <= now]
+                if w.alive() and not late:
+                    continue
+                if not w.alive() and (now - w.started_at) < 1.0 and not w.inflight:
+                    continue  # crash loop guard: at most one respawn per second per slot
+                for r in w.inflight.values():
+                    if r.deadline <= now or r.attempts >= 1:
+                        expired.append(r)
+                    else:
+                        r.attempts += 1
+                        retry.append(r)
+                w.inflight.clear()
+                w.kill()
+                try:
+                    self._workers[i] = _WorkerProc(self, i)
+                    self.stats["respawns"] += 1
+                except Exception:
+                    pass
+            self.stats["timeouts"] += len(expired)
+            self.stats["retries"] += len(retry)
+        for r in expired:
+            if not r.future.done():
+                r.future.set_result(None)
+        for r in retry:
+            self._dispatch(r)
+
+
+def translate_once(python_exe: str, text: str, timeout_s: float = 60.0, code: str = WORKER_CODE) -> Optional[dict]:
+    """One-shot translation over the worker JSON protocol.
+
+    Returns the response dict (`ok`, `command`, `confidence`, `elapsed_ms`,
+    `error`) or None when the protocol could not be used (nlp2cmd missing,
+    crash, timeout) and the caller should fall back to the CLI. A reply with
+    `ok: false` (the translator itself failed) is returned as is; the CLI
+    may still succeed, so callers fall back on it too.
+    """
+    env = os.environ.copy()
+    env.setdefault("NLP2CMD_USE_ENHANCED_CONTEXT", "0")
+    try:
+        res = subprocess.run(
+            [python_exe, "-u", "-c", code],
+            input=json.dumps({"id": 1, "text": str(text)}, ensure_ascii=False) + "\n",
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            timeout=float(timeout_s),
+            env=env,
+        )
+    except Exception:
+        return None
+    ready = resp = None
+    for line in (res.stdout or "").splitlines():
+        try:
+            obj = json.loads(line)
+        except Exception:
+            continue
+        if not isinstance(obj, dict):
+            continue
+        if "ready" in obj and "id" not in obj:
+            ready = obj
+        elif obj.get("id") == 1:
+            resp = obj
+    if not ready or not ready.get("ready") or resp is None:
+        return None
+    return resp
+
+
+__all__ = ["NLP2CMDWorkerPool", "WORKER_CODE", "translate_once"]
@@ -5,6 +5,10 @@ import sys
 from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
+from .nbest import hypotheses_for, translate_nbest
+from .speculative import SpeculativeTranslator, attach_partials
+from .text import TextNormalizer
+
 
 def _yaml_mode() -> bool:
     return os.environ.get("STTS_OUTPUT_FORMAT", "yaml").strip().lower() in ("yaml", "yml")
@@ -14,6 +18,15 @@ def _yaml_out():
     return sys.__stdout__ if _yaml_mode() else sys.stdout
 
 
+def _yaml_transcript_lines(shell) -> list:
+    """`  stt:` block with the shell's last Transcript metrics (empty if unknown)."""
+    tr = getattr(shell, "last_transcript", None)
+    if tr is None:
+        return []
+    items = [(k, v) for k, v in tr.summary().items() if v is not None]
+    return ["  stt:"] + [f"    {k}: {_yaml_quote_scalar(v)}" for k, v in items]
+
+
 def _yaml_quote_scalar(v: Any) -> str:
     if v is None:
         return "null"
@@ -71,6 +84,7 @@ class PipelineDeps:
     nlp2cmd_prewarm_force: Callable[..., Any]
     nlp2cmd_translate: Callable[..., Any]
     nlp2cmd_confirm: Callable[..., Any]
+    nlp2cmd_translate_speculative: Optional[Callable[..., Any]] = None
 
 
 def run_stt_stream_shell(deps: PipelineDeps, shell, config, stt_file, stream_shell_cmd, dry_run):
@@ -147,7 +161,7 @@ def run_stt_once(deps: PipelineDeps, shell, stt_file):
                     "  type: stt",
                     f"  text: {_yaml_quote_scalar(text)}",
                     "  action: recognized",
-                ]) + "\n")
+                ] + _yaml_transcript_lines(shell)) + "\n")
                 _yaml_out().flush()
             except BrokenPipeError:
                 return 0
@@ -157,6 +171,27 @@ def run_stt_once(deps: PipelineDeps, shell, stt_file):
     return 1
 
 
+def _translate_with_refine(deps: PipelineDeps, config, shell, text: str, force: bool = False):
+    """Translate `text` (and its STT n-best alternatives, concurrently); on failure
+    re-decode with the accurate STT model (cascade) and retry.
+
+    Returns (text, translated).
+    """
+    kw = {"config": config, "force": True} if force else {"config": config}
+    hyp, translated = translate_nbest(
+        lambda t: deps.nlp2cmd_translate(t, **kw),
+        hypotheses_for(shell, text, config),
+    )
+    if translated:
+        return hyp or text, translated
+    refine = getattr(shell, "refine_last_transcript", None)
+    refined = refine("nlp2cmd_failed") if callable(refine) else None
+    if refined and refined != text:
+        translated = deps.nlp2cmd_translate(refined, **kw)
+        return refined, translated
+    return text, translated
+
+
 def run_nlp2cmd_parallel_fastpath(deps: PipelineDeps, config, shell, stt_file, stt_only, dry_run, rest):
     bin_name = os.environ.get("STTS_NLP2CMD_BIN", "nlp2cmd")
     if not (rest and rest[0] == bin_name and any("{STT}" in a for a in rest)):
@@ -165,18 +200,40 @@ def run_nlp2cmd_parallel_fastpath(deps: PipelineDeps, config, shell, stt_file, s
     auto_confirm = ("--auto-confirm" in rest)
 
     deps.nlp2cmd_prewarm(config)
-    if stt_file:
-        text = shell.listen(stt_file=stt_file)
-        if stt_only:
-            print(text)
-            return 0 if text else 1
-    else:
-        with contextlib.redirect_stdout(sys.stderr):
-            text = shell.listen()
+    spec = None
+    if not stt_only and config.get("nlp2cmd_speculative", True) and deps.nlp2cmd_translate_speculative is not None:
+        spec = SpeculativeTranslator(
+            lambda t: deps.nlp2cmd_translate_speculative(t, config=config),
+            normalize=TextNormalizer.normalize,
+        )
+        attach_partials(shell.stt, spec.feed)
+    try:
+        if stt_file:
+            text = shell.listen(stt_file=stt_file)
+            if stt_only:
+                print(text)
+                return 0 if text else 1
+        else:
+            with contextlib.redirect_stdout(sys.stderr):
+                text = shell.listen()
+    finally:
+        if spec is not None:
+            attach_partials(shell.stt, None)
     if not text:
+        if spec is not None:
+            spec.close()
         return 1
 
-    translated = deps.nlp2cmd_translate(text, config=config, force=True)
+    translated = None
+    if spec is not None:
+        committed, result = spec.finalize(text)
+        spec.close()
+        if committed and result and result[0]:
+            translated, record = result
+            record()  # audit + cache only for the speculation actually used
+            deps.cprint(deps.Colors.CYAN, "⚡ nlp2cmd: speculative translation committed")
+    if not translated:
+        text, translated = _translate_with_refine(deps, config, shell, text, force=True)
     if not translated:
         deps.cprint(deps.Colors.RED, "❌ nlp2cmd: brak wygenerowanej komendy")
         return 1
@@ -193,7 +250,7 @@ def run_nlp2cmd_parallel_fastpath(deps: PipelineDeps, config, shell, stt_file, s
                     "  run: true",
                     "  dry_run: true",
                     "  exit_code: 0",
-                ]) + "\n")
+                ] + _yaml_transcript_lines(shell)) + "\n")
                 _yaml_out().flush()
             except BrokenPipeError:
                 return 0
@@ -222,7 +279,7 @@ def run_nlp2cmd_parallel_fastpath(deps: PipelineDeps, config, shell, stt_file, s
                 "  run: true",
                 "  dry_run: false",
                 f"  exit_code: {int(code)}",
-            ]) + "\n")
+            ] + _yaml_transcript_lines(shell)) + "\n")
             _yaml_out().flush()
         except BrokenPipeError:
             return 0
@@ -265,7 +322,7 @@ def run_stt_file_default_mode(deps: PipelineDeps, config, shell, stt_file, stt_o
         if dry_run:
             print(text)
             return 0
-        translated = deps.nlp2cmd_translate(text, config=config)
+        text, translated = _translate_with_refine(deps, config, shell, text)
         if translated and deps.nlp2cmd_confirm(translated):
             text = translated
         out, code, printed = shell.run_command_any(text)
@@ -6,7 +6,87 @@ Base classes (STTProvider, TTSProvider) are defined here.
 
 from __future__ import annotations
 
-from typing import Any, List, Optional, Tuple
+import os
+import re
+import tempfile
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Whisper-style non-speech annotations: "[MUZYKA]", "(music)", "[BLANK_AUDIO]", "*śmiech*"
+_NON_SPEECH_RE = re.compile(r"^\s*(?:[\[\(\*♪][^\]\)\*♪]*[\]\)\*♪]\s*)+$")
+
+
+@dataclass
+class Word:
+    """A recognized word with optional timing (seconds) and confidence (0..1)."""
+
+    word: str
+    start: Optional[float] = None
+    end: Optional[float] = None
+    confidence: Optional[float] = None
+
+
+@dataclass
+class Transcript:
+    """Structured STT result."""
+
+    text: str = ""
+    words: List[Word] = field(default_factory=list)
+    confidence: Optional[float] = None
+    no_speech_prob: Optional[float] = None
+    decode_s: float = 0.0
+    audio_s: Optional[float] = None
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    # n-best list (text, score) when the engine provides one; best first
+    alternatives: List[Tuple[str, Optional[float]]] = field(default_factory=list)
+
+    def hypotheses(self, k: int = 3) -> List[str]:
+        """Top-k distinct non-empty hypotheses, starting with `text`."""
+        out: List[str] = []
+        for t in [self.text] + [a[0] for a in self.alternatives]:
+            t = (t or "").strip()
+            if t and t not in out:
+                out.append(t)
+            if len(out) >= max(1, int(k)):
+                break
+        return out
+
+    @property
+    def rtf(self) -> Optional[float]:
+        """Real-time factor (decode time / audio duration)."""
+        if not self.audio_s:
+            return None
+        return self.decode_s / self.audio_s
+
+    def is_non_speech(self, max_no_speech_prob: float = 0.6) -> bool:
+        """True for empty text, bare annotations like `[MUZYKA]`, or a high no-speech probability."""
+        if not (self.text or "").strip():
+            return True
+        if _NON_SPEECH_RE.match(self.text):
+            return True
+        return self.no_speech_prob is not None and self.no_speech_prob >= float(max_no_speech_prob)
+
+    def summary(self) -> Dict[str, Any]:
+        """Scalar fields for logs / YAML events (no per-word list)."""
+
+        def _r(v: Optional[float], n: int = 3) -> Optional[float]:
+            return None if v is None else round(float(v), n)
+
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "confidence": _r(self.confidence),
+            "no_speech_prob": _r(self.no_speech_prob),
+            "words": len(self.words),
+            "decode_s": _r(self.decode_s),
+            "audio_s": _r(self.audio_s),
+            "rtf": _r(self.rtf),
+            "alternatives": len(self.alternatives) or None,
+        }
 
 
 class STTProvider:
@@ -16,6 +96,9 @@ class STTProvider:
     description: str = "Base"
     min_ram_gb: float = 0.5
     models: List[Tuple[str, str, float]] = []
+    last_transcript: Optional[Transcript] = None
+    # Called with the running (partial) transcript while decoding, if the engine supports it.
+    on_partial: Optional[Callable[[str], None]] = None
 
     @classmethod
     def is_available(cls, info: Any):
@@ -44,6 +127,133 @@ class STTProvider:
     def transcribe(self, audio_path: str) -> str:
         raise NotImplementedError
 
+    # -- structured results ------------------------------------------------
+
+    def _set_details(
+        self,
+        words: Optional[List[Word]] = None,
+        confidence: Optional[float] = None,
+        no_speech_prob: Optional[float] = None,
+        alternatives: Optional[List[Tuple[str, Optional[float]]]] = None,
+    ) -> None:
+        """Record engine details of the current decode (called from `transcribe`)."""
+        words = list(words or [])
+        if confidence is None:
+            confs = [w.confidence for w in words if w.confidence is not None]
+            if confs:
+                confidence = sum(confs) / len(confs)
+        self._details = {
+            "words": words,
+            "confidence": confidence,
+            "no_speech_prob": no_speech_prob,
+            "alternatives": list(alternatives or []),
+        }
+
+    def _emit_partial(self, text: str) -> None:
+        """Report a running transcript (normalized like the final one) to `on_partial`."""
+        cb = self.on_partial
+        if cb is None or not (text or "").strip():
+            return
+        try:
+            from stts_core.text import TextNormalizer
+
+            cb(TextNormalizer.normalize(text.strip(), self.language))
+        except Exception:
+            pass
+
+    def nbest(self) -> int:
+        """Requested n-best size (`stt_nbest`); 1 disables alternatives."""
+        try:
+            return max(1, int((self.config or {}).get("stt_nbest") or 1))
+        except Exception:
+            return 1
+
+    @property
+    def last_confidence(self) -> Optional[float]:
+        return (getattr(self, "_details", None) or {}).get("confidence")
+
+    @last_confidence.setter
+    def last_confidence(self, value: Optional[float]) -> None:
+        details = dict(getattr(self, "_details", None) or {})
+        details["confidence"] = value
+        self._details = details
+
+    def _build_transcript(self, text: str, decode_s: float, audio_s: Optional[float]) -> Transcript:
+        d = getattr(self, "_details", None) or {}
+        tr = Transcript(
+            text=text or "",
+            words=list(d.get("words") or []),
+            confidence=d.get("confidence"),
+            no_speech_prob=d.get("no_speech_prob"),
+            decode_s=decode_s,
+            audio_s=audio_s,
+            provider=self.name,
+            model=self.model,
+            alternatives=list(d.get("alternatives") or []),
+        )
+        self.last_transcript = tr
+        return tr
+
+    def transcribe_detailed(self, audio_path: str) -> Transcript:
+        """Like `transcribe()`, but returns a `Transcript` with confidence and timing."""
+        self._details = {}
+        t0 = time.perf_counter()
+        text = self.transcribe(audio_path)
+        decode_s = time.perf_counter() - t0
+        audio_s = None
+        try:
+            with wave.open(audio_path, "rb") as wf:
+                rate = int(wf.getframerate() or 0)
+                audio_s = (float(wf.getnframes()) / rate) if rate > 0 else None
+        except Exception:
+            audio_s = None
+        return self._build_transcript(text, decode_s, audio_s)
+
+    def transcribe_pcm_detailed(self, pcm: bytes, sample_rate: int = 16000) -> Transcript:
+        """Like `transcribe_pcm()`, but returns a `Transcript`."""
+        self._details = {}
+        t0 = time.perf_counter()
+        text = self.transcribe_pcm(pcm, sample_rate)
+        decode_s = time.perf_counter() - t0
+        audio_s = (len(pcm or b"") / 2.0 / float(sample_rate)) if sample_rate else None
+        return self._build_transcript(text, decode_s, audio_s)
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = 16000) -> str:
+        """Transcribe mono S16LE PCM held in memory.
+
+        Providers that can decode from a buffer override this; the default
+        writes a temporary WAV file and delegates to `transcribe()`.
+        """
+        fd, path = tempfile.mkstemp(prefix="stts_pcm_", suffix=".wav")
+        os.close(fd)
+        try:
+            with wave.open(path, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(int(sample_rate))
+                wf.writeframes(bytes(pcm or b""))
+            return self.transcribe(path)
+        finally:
+            try:
+                os.unlink(path)
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """Release engine resources held by the provider (no-op by default)."""
+        return None
+
+
+def read_wav_pcm(audio_path: str) -> Tuple[bytes, int, int, int]:
+    """Read a WAV file. Returns (frames, sample_rate, channels, sample_width)."""
+    with wave.open(audio_path, "rb") as wf:
+        return (
+            wf.readframes(wf.getnframes()),
+            int(wf.getframerate()),
+            int(wf.getnchannels()),
+            int(wf.getsampwidth()),
+        )
+
 
 class TTSProvider:
     """Base class for TTS (Text-to-Speech) providers."""
@@ -67,4 +277,4 @@ class TTSProvider:
         raise NotImplementedError
 
 
-__all__ = ["STTProvider", "TTSProvider"]
+__all__ = ["STTProvider", "TTSProvider", "Transcript", "Word", "read_wav_pcm"]
@@ -2,14 +2,11 @@
 
 from __future__ import annotations
 
-import os
-import subprocess
-import sys
-import wave
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
-from stts_core.providers import STTProvider
+from stts_core.providers import STTProvider, read_wav_pcm
 from stts_core.config import MODELS_DIR
 from stts_core.shell_utils import cprint, Colors
 from stts_core.text import TextNormalizer
@@ -34,26 +31,66 @@ class CoquiSTT(STTProvider):
     def get_recommended_model(cls, info) -> Optional[str]:
         return "model.tflite"
 
-    def transcribe(self, audio_path: str) -> str:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._model: Any = None
+        self._lock = threading.RLock()
+
+    def _get_model(self) -> Any:
+        """Load `stt.Model` once and keep it resident for the provider lifetime."""
+        if self._model is not None:
+            return self._model
         try:
             from stt import Model
         except ImportError:
             cprint(Colors.RED, "❌ coqui-stt not installed: pip install coqui-stt")
-            return ""
+            return None
 
         model_path = self.model or str(MODELS_DIR / "coqui" / "model.tflite")
         if not Path(model_path).exists():
             cprint(Colors.RED, f"❌ Coqui model not found: {model_path}")
-            return ""
+            return None
+
+        self._model = Model(model_path)
+        return self._model
+
+    def close(self) -> None:
+        with self._lock:
+            self._model = None
 
+    @staticmethod
+    def _as_buffer(pcm: bytes) -> Any:
         try:
-            wf = wave.open(audio_path, "rb")
-            audio = wf.readframes(wf.getnframes())
-            wf.close()
+            import numpy as np
 
-            model = Model(model_path)
-            text = model.stt(audio)
-            return TextNormalizer.normalize(text or "", self.language)
+            return np.frombuffer(pcm, dtype=np.int16)
+        except ImportError:
+            return pcm
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = 16000) -> str:
+        with self._lock:
+            try:
+                model = self._get_model()
+                if model is None:
+                    return ""
+                model_rate = int(getattr(model, "sampleRate", lambda: sample_rate)() or sample_rate)
+                if int(sample_rate) != model_rate:
+                    cprint(Colors.YELLOW, f"⚠️ Coqui model expects {model_rate} Hz, got {sample_rate} Hz")
+                text = model.stt(self._as_buffer(pcm))
+                return TextNormalizer.normalize(text or "", self.language)
+            except Exception as e:
+                # Reload the model on the next call.
+                self._model = None
+                cprint(Colors.RED, f"❌ Coqui STT error: {e}")
+                return ""
+
+    def transcribe(self, audio_path: str) -> str:
+        try:
+            pcm, rate, channels, width = read_wav_pcm(audio_path)
         except Exception as e:
             cprint(Colors.RED, f"❌ Coqui STT error: {e}")
             return ""
+        if channels != 1 or width != 2:
+            cprint(Colors.YELLOW, "⚠️ Audio must be mono 16-bit WAV")
+            return ""
+        return self.transcribe_pcm(pcm, rate)
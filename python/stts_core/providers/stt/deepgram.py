@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import json
 import os
-import urllib.request
+import urllib.parse
 from pathlib import Path
 from typing import Optional
 
-from stts_core.providers import STTProvider
+from stts_core.http_client import get_client
+from stts_core.providers import STTProvider, Word
 from stts_core.shell_utils import cprint, Colors
 from stts_core.text import TextNormalizer
 
@@ -60,31 +61,51 @@ class DeepgramSTT(STTProvider):
             "language": language,
             "smart_format": "true",
         }
+        if self.nbest() > 1:
+            params["alternatives"] = str(self.nbest())
         url = "https://api.deepgram.com/v1/listen?" + urllib.parse.urlencode(params)
-        req = urllib.request.Request(
-            url,
-            data=data,
-            method="POST",
-            headers={
-                "Authorization": f"Token {key}",
-                "Content-Type": "audio/wav",
-            },
-        )
 
         try:
-            with urllib.request.urlopen(req, timeout=120) as resp:
-                payload = resp.read().decode("utf-8", errors="replace")
+            resp = get_client().request(
+                "POST",
+                url,
+                body=data,
+                headers={
+                    "Authorization": f"Token {key}",
+                    "Content-Type": "audio/wav",
+                },
+                timeout=120,
+            )
+            resp.raise_for_status()
+            payload = resp.text()
         except Exception as e:
             cprint(Colors.RED, f"❌ Deepgram error: {e}")
             return ""
 
         try:
             j = json.loads(payload)
-            txt = (
-                (((j.get("results") or {}).get("channels") or [None])[0] or {}).get("alternatives") or [None]
-            )[0]
+            alts = (((j.get("results") or {}).get("channels") or [None])[0] or {}).get("alternatives") or [None]
+            txt = alts[0]
             if isinstance(txt, dict):
                 transcript = (txt.get("transcript") or "").strip()
+                self._set_details(
+                    words=[
+                        Word(
+                            word=str(w.get("word") or ""),
+                            start=w.get("start"),
+                            end=w.get("end"),
+                            confidence=w.get("confidence"),
+                        )
+                        for w in (txt.get("words") or [])
+                        if isinstance(w, dict)
+                    ],
+                    confidence=txt.get("confidence"),
+                    alternatives=[
+                        (TextNormalizer.normalize(str(a.get("transcript") or ""), self.language), a.get("confidence"))
+                        for a in alts[1:]
+                        if isinstance(a, dict) and a.get("transcript")
+                    ],
+                )
             else:
                 transcript = ""
         except Exception:
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import math
 import os
 import subprocess
 import sys
-from typing import Optional
+from typing import List, Optional
 
-from stts_core.providers import STTProvider
+from stts_core.providers import STTProvider, Word
 from stts_core.shell_utils import cprint, Colors
 from stts_core.text import TextNormalizer
 
@@ -60,6 +61,31 @@ class FasterWhisperSTT(STTProvider):
             return "medium"
         return "large-v3"
 
+    @staticmethod
+    def _segment_details(segments) -> dict:
+        """Words, confidence (exp of mean avg_logprob) and max no_speech_prob from segments."""
+        words: List[Word] = []
+        logprobs: List[float] = []
+        no_speech: Optional[float] = None
+        for seg in segments:
+            lp = getattr(seg, "avg_logprob", None)
+            if lp is not None:
+                logprobs.append(float(lp))
+            ns = getattr(seg, "no_speech_prob", None)
+            if ns is not None:
+                no_speech = float(ns) if no_speech is None else max(no_speech, float(ns))
+            for w in getattr(seg, "words", None) or []:
+                words.append(
+                    Word(
+                        word=str(getattr(w, "word", "")).strip(),
+                        start=getattr(w, "start", None),
+                        end=getattr(w, "end", None),
+                        confidence=getattr(w, "probability", None),
+                    )
+                )
+        confidence = math.exp(sum(logprobs) / len(logprobs)) if logprobs else None
+        return {"words": words, "confidence": confidence, "no_speech_prob": no_speech}
+
     def transcribe(self, audio_path: str) -> str:
         try:
             from faster_whisper import WhisperModel
@@ -87,12 +113,19 @@ class FasterWhisperSTT(STTProvider):
             model = WhisperModel(model_name, device=device, compute_type=compute_type)
 
             lang = str(self.language or "").strip()
-            if lang.lower() in ("", "auto"):
-                segments, info = model.transcribe(audio_path)
-            else:
-                segments, info = model.transcribe(audio_path, language=lang)
-
+            kwargs = {"word_timestamps": True}
+            if lang.lower() not in ("", "auto"):
+                kwargs["language"] = lang
+            segments, info = model.transcribe(audio_path, **kwargs)
+
+            # Segments are decoded lazily; report the running text as a partial transcript.
+            decoded = []
+            for seg in segments:
+                decoded.append(seg)
+                self._emit_partial(" ".join(x.text.strip() for x in decoded))
+            segments = decoded
             text = " ".join(seg.text for seg in segments).strip()
+            self._set_details(**self._segment_details(segments))
             return TextNormalizer.normalize(text, self.language)
 
         except Exception as e:
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+import struct
+import threading
+from typing import Any, Optional
 
-from stts_core.providers import STTProvider
+from stts_core.providers import STTProvider, read_wav_pcm
 from stts_core.shell_utils import cprint, Colors
 from stts_core.text import TextNormalizer
 
@@ -29,23 +31,90 @@ class PicovoiceSTT(STTProvider):
     def get_recommended_model(cls, info) -> Optional[str]:
         return None
 
-    def transcribe(self, audio_path: str) -> str:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._leopard: Any = None
+        self._lock = threading.RLock()
+
+    def _get_leopard(self) -> Any:
+        """Create the Leopard handle on first use and keep it for the provider lifetime."""
+        if self._leopard is not None:
+            return self._leopard
         try:
             import pvleopard
         except ImportError:
             cprint(Colors.RED, "❌ pvleopard not installed: pip install pvleopard")
-            return ""
+            return None
 
         access_key = os.environ.get("PICOVOICE_ACCESS_KEY", "").strip()
         if not access_key:
             cprint(Colors.RED, "❌ PICOVOICE_ACCESS_KEY not set")
-            return ""
+            return None
+
+        self._leopard = pvleopard.create(access_key=access_key)
+        return self._leopard
+
+    def _drop_leopard(self) -> None:
+        leopard, self._leopard = self._leopard, None
+        if leopard is not None:
+            try:
+                leopard.delete()
+            except Exception:
+                pass
 
+    def close(self) -> None:
+        with self._lock:
+            self._drop_leopard()
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = 16000) -> str:
+        with self._lock:
+            try:
+                leopard = self._get_leopard()
+                if leopard is None:
+                    return ""
+                engine_rate = int(getattr(leopard, "sample_rate", 16000) or 16000)
+                if int(sample_rate) != engine_rate:
+                    return super().transcribe_pcm(pcm, sample_rate)
+                n = len(pcm) // 2
+                samples = list(struct.unpack("<" + "h" * n, pcm[: n * 2])) if n else []
+                transcript, _ = leopard.process(samples)
+                return TextNormalizer.normalize(transcript or "", self.language)
+            except Exception as e:
+                # Recreate the handle on the next call.
+                self._drop_leopard()
+                cprint(Colors.RED, f"❌ Picovoice STT error: {e}")
+                return ""
+
+    def transcribe(self, audio_path: str) -> str:
         try:
-            leopard = pvleopard.create(access_key=access_key)
-            transcript, _ = leopard.process_file(audio_path)
-            leopard.delete()
-            return TextNormalizer.normalize(transcript or "", self.language)
+            pcm, rate, channels, width = read_wav_pcm(audio_path)
         except Exception as e:
             cprint(Colors.RED, f"❌ Picovoice STT error: {e}")
             return ""
+
+        if channels == 1 and width == 2:
+            leopard = None
+            with self._lock:
+                try:
+                    leopard = self._get_leopard()
+                except Exception as e:
+                    self._drop_leopard()
+                    cprint(Colors.RED, f"❌ Picovoice STT error: {e}")
+                    return ""
+            if leopard is None:
+                return ""
+            if rate == int(getattr(leopard, "sample_rate", 16000) or 16000):
+                return self.transcribe_pcm(pcm, rate)
+
+        # Non-native format: let Leopard resample/decode the file itself.
+        with self._lock:
+            try:
+                leopard = self._get_leopard()
+                if leopard is None:
+                    return ""
+                transcript, _ = leopard.process_file(audio_path)
+                return TextNormalizer.normalize(transcript or "", self.language)
+            except Exception as e:
+                self._drop_leopard()
+                cprint(Colors.RED, f"❌ Picovoice STT error: {e}")
+                return ""
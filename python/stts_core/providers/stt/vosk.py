@@ -13,7 +13,7 @@ import zipfile
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-from stts_core.providers import STTProvider
+from stts_core.providers import STTProvider, Word
 from stts_core.config import MODELS_DIR
 from stts_core.download_utils import _download_progress
 from stts_core.shell_utils import cprint, Colors
@@ -179,6 +179,42 @@ class VoskSTT(STTProvider):
 
         return None
 
+    @staticmethod
+    def _parse_words(final_json: str) -> List[Word]:
+        """Per-word results of a `FinalResult()` JSON produced with `SetWords(True)`."""
+        try:
+            j = json.loads(final_json or "{}")
+            items = j.get("result") or ((j.get("alternatives") or [{}])[0].get("result")) or []
+        except Exception:
+            return []
+        words: List[Word] = []
+        for it in items:
+            if not isinstance(it, dict) or not it.get("word"):
+                continue
+            words.append(
+                Word(
+                    word=str(it.get("word")),
+                    start=it.get("start"),
+                    end=it.get("end"),
+                    confidence=it.get("conf"),
+                )
+            )
+        return words
+
+    @staticmethod
+    def _parse_alternatives(final_json: str) -> List[Tuple[str, Optional[float]]]:
+        """n-best (text, score) of a `FinalResult()` produced with `SetMaxAlternatives(n)`."""
+        try:
+            alts = json.loads(final_json or "{}").get("alternatives") or []
+        except Exception:
+            return []
+        out: List[Tuple[str, Optional[float]]] = []
+        for a in alts:
+            t = str((a or {}).get("text") or "").strip()
+            if t:
+                out.append((t, a.get("confidence")))
+        return out
+
     def transcribe(self, audio_path: str) -> str:
         try:
             import vosk
@@ -195,6 +231,7 @@ class VoskSTT(STTProvider):
         try:
             import wave
             model = vosk.Model(str(model_path))
+            nbest = self.nbest()
 
             def _decode_with_grammar(grammar: str) -> Tuple[str, str]:
                 wf = wave.open(audio_path, "rb")
@@ -208,11 +245,17 @@ class VoskSTT(STTProvider):
                         data = wf.readframes(4000)
                         if len(data) == 0:
                             break
-                        r.AcceptWaveform(data)
+                        # PartialResult() does not consume the segment, FinalResult() is unaffected.
+                        if not r.AcceptWaveform(data) and self.on_partial is not None:
+                            try:
+                                self._emit_partial(json.loads(r.PartialResult()).get("partial") or "")
+                            except Exception:
+                                pass
                     fj = r.FinalResult()
                     try:
                         jj = json.loads(fj)
-                        tt = (jj.get("text") or "").strip()
+                        alts = jj.get("alternatives") or [{}]
+                        tt = (jj.get("text") or alts[0].get("text") or "").strip()
                     except Exception:
                         tt = ""
                     return fj, tt
@@ -228,14 +271,18 @@ class VoskSTT(STTProvider):
                             pass
                 else:
                     rec = vosk.KaldiRecognizer(model, wf.getframerate())
-                rec.SetWords(False)
+                rec.SetWords(True)
+                if nbest > 1:
+                    rec.SetMaxAlternatives(nbest)
 
                 final_json, transcript = _run_recognizer(rec)
                 if (not transcript) and grammar:
                     try:
                         wf.rewind()
                         rec2 = vosk.KaldiRecognizer(model, wf.getframerate())
-                        rec2.SetWords(False)
+                        rec2.SetWords(True)
+                        if nbest > 1:
+                            rec2.SetMaxAlternatives(nbest)
                         final_json2, transcript2 = _run_recognizer(rec2)
                         if transcript2:
                             cprint(Colors.YELLOW, "⚠️ Vosk: grammar returned empty, retry without grammar")
@@ -284,6 +331,13 @@ class VoskSTT(STTProvider):
             if (not transcript) and grammar_json:
                 transcript, final_json = _decode_with_grammar("")
 
+            self._set_details(
+                words=self._parse_words(final_json),
+                alternatives=[
+                    (TextNormalizer.normalize(t, self.language), c) for t, c in self._parse_alternatives(final_json)
+                ],
+            )
+
             debug = (os.environ.get("STTS_DEBUG_STT") == "1") or (os.environ.get("STTS_DEBUG_VOSK") == "1")
             if debug and (not transcript):
                 try:
@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import functools
+import json
 import math
 import os
 import re
 import shutil
 import subprocess
+import tempfile
 import urllib.request
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
-from stts_core.providers import STTProvider
+from stts_core.providers import STTProvider, Word
 from stts_core.config import MODELS_DIR
 from stts_core.shell_utils import cprint, Colors, detect_system
 from stts_core.text import TextNormalizer
@@ -222,6 +224,46 @@ class WhisperCppSTT(STTProvider):
             return "-p"
         return None
 
+    @staticmethod
+    def _read_json_words(json_path: str) -> List[Word]:
+        """Merge token probabilities from `-ojf` output into words (and delete the file)."""
+        try:
+            with open(json_path, "r", encoding="utf-8", errors="replace") as f:
+                data = json.load(f)
+        except Exception:
+            return []
+        finally:
+            try:
+                os.unlink(json_path)
+            except Exception:
+                pass
+        words: List[Word] = []
+        probs: List[float] = []
+        for seg in data.get("transcription") or []:
+            for tok in seg.get("tokens") or []:
+                t = str(tok.get("text") or "")
+                if not t.strip() or t.startswith("[_"):
+                    continue
+                offs = tok.get("offsets") or {}
+                start = offs.get("from")
+                end = offs.get("to")
+                start = None if start is None else float(start) / 1000.0
+                end = None if end is None else float(end) / 1000.0
+                p = tok.get("p")
+                if t.startswith(" ") or not words:
+                    if words and probs:
+                        words[-1].confidence = sum(probs) / len(probs)
+                    words.append(Word(word=t.strip(), start=start, end=end))
+                    probs = []
+                else:
+                    words[-1].word += t
+                    words[-1].end = end
+                if p is not None:
+                    probs.append(float(p))
+        if words and probs:
+            words[-1].confidence = sum(probs) / len(probs)
+        return words
+
     def transcribe(self, audio_path: str) -> str:
         whisper_bin = shutil.which("whisper-cli") or shutil.which("whisper-cpp") or shutil.which("main")
         if not whisper_bin:
@@ -272,6 +314,13 @@ class WhisperCppSTT(STTProvider):
             # Add other parameters (max_len, word_thold, etc.)
             # ... (simplified for brevity)
 
+            json_prefix = None
+            if self._supports_help_token(whisper_bin, "--output-json-full"):
+                fd, json_prefix = tempfile.mkstemp(prefix="stts_wcpp_")
+                os.close(fd)
+                os.unlink(json_prefix)
+                cmd.extend(["-ojf", "-of", json_prefix])
+
             result = subprocess.run(
                 cmd,
                 capture_output=True,
@@ -279,6 +328,8 @@ class WhisperCppSTT(STTProvider):
                 timeout=120,
             )
             raw_text = result.stdout.strip()
+            if json_prefix:
+                self._set_details(words=self._read_json_words(json_prefix + ".json"))
             return TextNormalizer.normalize(raw_text, self.language)
         except Exception as e:
             cprint(Colors.RED, f"❌ Transcription error: {e}")
@@ -23,9 +23,14 @@ class VoiceShell:
         self.info = deps.detect_system(fast=bool(self.config.get("fast_start", True)))
         self._stt_unavailable_reason = None
         self._warned_stt_disabled = False
-        self.stt = self._init_stt()
+        self.stt = self._init_cascade(self._init_stt())
         self.tts = self._init_tts()
+        self._stt_pool = None
         self._suppress_wake_word_logging = False
+        self.last_wake_match = None
+        # daemon: `event_sink(event, **fields)` receives structured STT records
+        self.event_sink = None
+        self.last_transcript = None
 
         deps.HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
         if deps.HISTORY_FILE.exists():
@@ -98,6 +103,47 @@ class VoiceShell:
             )
         return None
 
+    def _init_cascade(self, stt):
+        """Wrap `stt` in a draft+accurate cascade when `stt_draft_provider` is set."""
+        if stt is None or not self.config.get("stt_draft_provider"):
+            return stt
+        try:
+            from .stt_cascade import build_cascade
+
+            cascade = build_cascade(stt, getattr(self.deps, "STT_PROVIDERS", {}), self.config, self.info)
+        except Exception as e:
+            cascade = None
+            print(f"[stts] ⚠️  STT cascade unavailable ({e})", file=sys.stderr)
+        if cascade is None:
+            print(
+                f"[stts] ⚠️  STT draft provider '{self.config.get('stt_draft_provider')}' unavailable; single-pass STT",
+                file=sys.stderr,
+            )
+            return stt
+        return cascade
+
+    def refine_last_transcript(self, reason: str = "requested") -> Optional[str]:
+        """Re-decode the last utterance with the accurate model (cascade only).
+
+        Returns the new transcript, or None when there is no cascade or the last
+        decode already used the accurate model.
+        """
+        refine = getattr(self.stt, "refine", None)
+        if not callable(refine):
+            return None
+        t0 = time.perf_counter()
+        try:
+            text = refine(reason)
+        except Exception as e:
+            self.deps.cprint(self.deps.Colors.RED, f"❌ STT refine error: {e}")
+            return None
+        if text:
+            self.deps.cprint(
+                self.deps.Colors.GREEN,
+                f"🎯 Dokładny model: \"{text}\" ({time.perf_counter() - t0:.1f}s)",
+            )
+        return text
+
     def _init_tts(self):
         provider = self.config.get("tts_provider")
         voice = self.config.get("tts_voice", "pl")
@@ -124,6 +170,70 @@ class VoiceShell:
                 return espeak_cls(voice=voice, config=self.config, info=self.info)
         return None
 
+    def _get_stt_pool(self):
+        """Return the STT worker pool when `stt_workers` > 0 (created lazily)."""
+        if self._stt_pool is not None:
+            return self._stt_pool
+        try:
+            workers = int(self.config.get("stt_workers") or 0)
+        except Exception:
+            workers = 0
+        if workers <= 0 or not self.stt:
+            return None
+        if getattr(self.stt, "name", None) == "cascade":
+            # The cascade keeps its draft/accurate state in-process (refine()).
+            return None
+        try:
+            from .stt_worker import STTWorkerPool
+
+            timeout_s = float(self.config.get("stt_worker_timeout_s") or 120.0)
+            self._stt_pool = STTWorkerPool(
+                type(self.stt),
+                provider_kwargs={
+                    "model": self.stt.model,
+                    "language": self.stt.language,
+                    "config": dict(self.config),
+                    "info": self.info,
+                },
+                workers=workers,
+                default_timeout_s=timeout_s,
+            )
+            atexit.register(self._stt_pool.close)
+        except Exception as e:
+            print(f"[stts] ⚠️  STT worker pool unavailable ({e}); decoding in-process", file=sys.stderr)
+            self.config["stt_workers"] = 0
+            self._stt_pool = None
+        return self._stt_pool
+
+    def _stt_overrides(self) -> dict:
+        """Runtime STT config (e.g. daemon wake-word grammar) forwarded to workers."""
+        return {k: self.config.get(k) for k in ("stt_vosk_grammar",)}
+
+    def _decode(self, audio_path: str) -> str:
+        """Decode `audio_path`; the structured result is kept in `last_transcript`."""
+        from .providers import Transcript
+
+        pool = self._get_stt_pool()
+        if pool is not None and pool.init_error:
+            print(f"[stts] ⚠️  STT workers failed to start ({pool.init_error}); decoding in-process", file=sys.stderr)
+            pool.close()
+            self.config["stt_workers"] = 0
+            self._stt_pool = pool = None
+        if pool is None:
+            tr = self.stt.transcribe_detailed(audio_path)
+        else:
+            fut = pool.submit_file(audio_path, overrides=self._stt_overrides())
+            try:
+                # the pool times out running jobs itself; this also bounds queueing
+                text = fut.result(timeout=(pool.default_timeout_s or 120.0) + 10.0) or ""
+                tr = getattr(fut, "transcript", None) or Transcript(text=text)
+            except Exception as e:
+                pool.cancel(fut)
+                self.deps.cprint(self.deps.Colors.RED, f"❌ STT worker error: {str(e) or type(e).__name__}")
+                tr = Transcript()
+        self.last_transcript = tr
+        return tr.text or ""
+
     def speak(self, text: str):
         if self.tts and self.config.get("auto_tts", True):
             threading.Thread(target=self.tts.speak, args=(text[:200],), daemon=True).start()
@@ -132,10 +242,14 @@ class VoiceShell:
         if os.environ.get("STTS_MOCK_STT") == "1":
             sidecar = Path(audio_path).with_suffix(Path(audio_path).suffix + ".txt")
             if sidecar.exists():
+                from .providers import Transcript
+
                 try:
-                    return sidecar.read_text(encoding="utf-8").strip()
+                    text = sidecar.read_text(encoding="utf-8").strip()
                 except Exception:
-                    return ""
+                    text = ""
+                self.last_transcript = Transcript(text=text, provider="mock")
+                return text
 
         if not self.stt:
             if (not self._warned_stt_disabled) and self.config.get("stt_provider"):
@@ -159,24 +273,72 @@ class VoiceShell:
         ts = ts_fn() if callable(ts_fn) else time.strftime("%H:%M:%S")
 
         self.deps.cprint(self.deps.Colors.YELLOW, f"[{ts}] 🔄 Rozpoznawanie...", end=" ")
-        text = self.stt.transcribe(audio_path)
+        text = self._decode(audio_path)
         elapsed = time.perf_counter() - t0
+        tr = self.last_transcript
+        if text and tr is not None and self.config.get("stt_reject_non_speech", True):
+            try:
+                max_ns = float(self.config.get("stt_max_no_speech_prob", 0.6))
+            except Exception:
+                max_ns = 0.6
+            if tr.is_non_speech(max_ns):
+                self.deps.cprint(self.deps.Colors.YELLOW, f"🔇 Odrzucono (brak mowy): \"{text}\" ({elapsed:.1f}s)")
+                return ""
         if text:
             shown = text
-            if self._suppress_wake_word_logging and hasattr(self.deps, "check_wake_word"):
+            match_wake = getattr(self.deps, "match_wake_word", None)
+            if self._suppress_wake_word_logging and callable(match_wake):
                 pats = self.config.get("daemon_wake_patterns") if isinstance(self.config, dict) else None
                 if not isinstance(pats, list):
                     pats = None
-                matched, remaining = self.deps.check_wake_word(text, patterns=pats)
-                if matched and remaining:
-                    shown = remaining
-            self.deps.cprint(self.deps.Colors.GREEN, f"✅ \"{shown}\" ({elapsed:.1f}s)")
+                wm = match_wake(text, patterns=pats)
+                # the daemon reuses this match instead of matching the same text again
+                self.last_wake_match = (text, tuple(pats or ()), wm)
+                if wm is not None and wm.remaining:
+                    shown = wm.remaining
+            res = getattr(self.stt, "last_result", None)
+            if res is not None and getattr(res, "escalated", False):
+                self.deps.cprint(
+                    self.deps.Colors.GREEN,
+                    f"✅ \"{shown}\" ({elapsed:.1f}s; draft {res.draft_s:.1f}s → {res.reason})",
+                )
+            elif tr is not None and tr.confidence is not None:
+                self.deps.cprint(self.deps.Colors.GREEN, f"✅ \"{shown}\" ({elapsed:.1f}s, conf {tr.confidence:.2f})")
+            else:
+                self.deps.cprint(self.deps.Colors.GREEN, f"✅ \"{shown}\" ({elapsed:.1f}s)")
         else:
             self.deps.cprint(self.deps.Colors.RED, f"❌ Nie rozpoznano ({elapsed:.1f}s)")
+        if self.event_sink is not None:
+            self.event_sink(
+                "stt",
+                provider=getattr(self.stt, "name", None),
+                ms=round(elapsed * 1000, 1),
+                chars=len(text or ""),
+                confidence=getattr(tr, "confidence", None),
+            )
         return text
 
     def listen(self, stt_file: Optional[str] = None) -> str:
-        mic = self.config.get("mic_device")
+        self.last_transcript = None
+        audio_path = self.capture(stt_file=stt_file)
+        if not audio_path:
+            return ""
+        return self.transcribe(audio_path)
+
+    def capture(
+        self,
+        stt_file: Optional[str] = None,
+        output_path: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> Optional[str]:
+        """Record one utterance (or use `stt_file`). Returns the WAV path or None.
+
+        `output_path` lets callers that keep several recordings in flight
+        (the staged daemon pipeline) avoid the shared default file. An
+        explicit `device` overrides `mic_device` and disables auto-switching.
+        """
+        mic = device or self.config.get("mic_device")
+        out_kw = {"output_path": output_path} if output_path else {}
         if stt_file:
             audio_path = stt_file
         elif self.config.get("vad_enabled", True) and getattr(self.info, "os_name", None) == "linux":
@@ -185,15 +347,16 @@ class VoiceShell:
                 device=mic,
                 silence_ms=self.config.get("vad_silence_ms", 800),
                 threshold_db=self.config.get("vad_threshold_db", -45.0),
+                **out_kw,
             )
         else:
-            audio_path = self.deps.record_audio(self.config.get("timeout", 2), device=mic)
+            audio_path = self.deps.record_audio(self.config.get("timeout", 2), device=mic, **out_kw)
 
         if not audio_path:
-            return ""
+            return None
 
         diag = self.deps.analyze_wav(audio_path)
-        if diag.get("ok") and diag.get("class") in ("silence", "noise") and stt_file is None:
+        if diag.get("ok") and diag.get("class") in ("silence", "noise") and stt_file is None and device is None:
             if self.config.get("audio_auto_switch") and getattr(self.info, "os_name", None) == "linux":
                 self.deps.cprint(self.deps.Colors.YELLOW, "🔁 Próba auto-wyboru mikrofonu...")
                 candidates = self.deps.list_capture_devices_linux()
@@ -217,11 +380,11 @@ class VoiceShell:
                     self.deps.cprint(self.deps.Colors.GREEN, f"✅ Wybrano mikrofon: {best}")
                     self.config["mic_device"] = best
                     self.deps.save_config(self.config)
-                    audio_path = self.deps.record_audio(self.config.get("timeout", 5), device=best)
+                    audio_path = self.deps.record_audio(self.config.get("timeout", 5), device=best, **out_kw)
                     if not audio_path:
-                        return ""
+                        return None
 
-        return self.transcribe(audio_path)
+        return audio_path
 
     def run_command(self, cmd: str):
         try:
@@ -402,9 +565,15 @@ class VoiceShell:
         log_file: Optional[str] = None,
         triggers: Optional[List[Tuple[str, str, bool]]] = None,
         wake_word: Optional[str] = None,
+        trigger_loader: Optional[Any] = None,
     ) -> int:
-        """Daemon mode with wake-word detection and nlp2cmd integration."""
+        """Daemon mode with wake-word detection and nlp2cmd integration.
+
+        `trigger_loader` (no-arg callable returning trigger rules) lets the
+        control socket reload triggers without a restart.
+        """
         handlers = DaemonHandlers(self)
+        handlers.trigger_loader = trigger_loader
 
         # Initialize daemon
         init_code = handlers.init(
@@ -418,9 +587,83 @@ class VoiceShell:
         if init_code != 0:
             return init_code
 
-        # Main daemon loop
+        # Staged pipeline (capture keeps running during STT / nlp2cmd / exec);
+        # two-stage vosk mode swaps the grammar per listen, so it stays serial.
+        pipeline = None
+        if self.config.get("daemon_pipeline", True) and not handlers.wake_only_two_stage:
+            from .daemon_pipeline import StagedDaemonPipeline
+
+            try:
+                queue_size = int(self.config.get("daemon_queue_size", 2))
+            except Exception:
+                queue_size = 2
+            devices = self.config.get("daemon_devices") or []
+            if isinstance(devices, str):
+                devices = devices.replace(";", " ").split()
+            handlers.log(f"pipeline: capture → STT → nlp2cmd → exec → TTS (queue {queue_size})")
+            if devices:
+                handlers.log(f"microphones: {', '.join(devices)} (shared STT model)")
+            def cfg_float(key: str, default: float) -> float:
+                try:
+                    return float(self.config.get(key, default))
+                except Exception:
+                    return default
+
+            deadline_s = cfg_float("daemon_deadline_s", 45.0)
+            if 0 < deadline_s <= nlp2cmd_timeout:
+                handlers.log(
+                    f"⚠️  daemon_deadline_s ({deadline_s:g}s) <= nlp2cmd timeout ({nlp2cmd_timeout:g}s): "
+                    "slow translations will be dropped"
+                )
+            pipeline = StagedDaemonPipeline(
+                handlers,
+                queue_size=queue_size,
+                devices=devices,
+                deadline_s=deadline_s,
+                coalesce_s=cfg_float("daemon_coalesce_s", 2.0),
+                max_queries=int(cfg_float("daemon_max_queries", 3)),
+            )
+
+        control = self._start_daemon_control(handlers, pipeline)
+        try:
+            if pipeline is not None:
+                try:
+                    pipeline.run()
+                except KeyboardInterrupt:
+                    handlers.log("🛑 Stopping daemon...")
+            else:
+                self._run_daemon_serial(handlers)
+        finally:
+            if control is not None:
+                control.stop()
+        handlers.close()
+        handlers.log("👋 Daemon stopped")
+        handlers.close_log()
+        return 0
+
+    def _start_daemon_control(self, handlers: DaemonHandlers, pipeline: Any = None) -> Any:
+        """Control/metrics socket (config `daemon_control_socket`), or None."""
+        from .config import CONFIG_DIR
+        from .daemon_control import DaemonControlServer, control_socket_path
+
+        path = control_socket_path(self.config, CONFIG_DIR)
+        if path is None:
+            return None
+        try:
+            server = DaemonControlServer(str(path), handlers, pipeline).start()
+        except Exception as e:
+            handlers.log(f"⚠️  control socket unavailable: {e}")
+            return None
+        handlers.log(f"control: {path} (python3 -m stts_core.daemon_control metrics)")
+        return server
+
+    def _run_daemon_serial(self, handlers: DaemonHandlers) -> None:
+        """Main daemon loop: listen, wake word, trigger / nlp2cmd, repeat."""
         while True:
             try:
+                if handlers.paused.is_set():
+                    time.sleep(0.2)
+                    continue
                 handlers.log("🎤 Listening...")
                 text = handlers.listen_with_wake_word()
 
@@ -438,18 +681,11 @@ class VoiceShell:
                 if handlers.check_triggers(command):
                     continue
 
-                # Query nlp2cmd service
-                result = handlers.query_nlp2cmd(command)
-                if result is None:
-                    continue
-
-                # Execute result
-                handlers.execute_from_result(result)
+                # Intent / cache / nlp2cmd service; service queries run in the
+                # background so the loop goes straight back to listening.
+                handlers.dispatch_nlp2cmd(command)
 
             except Exception as e:
                 if handlers.handle_error(e):
                     break
                 continue
-
-        handlers.log("👋 Daemon stopped")
-        return 0
@@ -0,0 +1,114 @@
+"""Speculative translation of partial STT transcripts.
+
+Streaming-capable STT engines report running transcripts while decoding
+(`STTProvider.on_partial`). `SpeculativeTranslator` watches them and, once a
+word prefix has stayed the same for `stable_count` consecutive partials,
+starts translating it in the background. The prefix is translated as
+spoken (original case, punctuation and paths), and a speculation is only
+committed when the final transcript is the same text after `normalize`
+(e.g. `TextNormalizer.normalize`); all others are discarded. This overlaps
+nlp2cmd with the tail of decoding.
+
+The `translate` callable must not have lasting side effects (cache writes,
+audit records) for prefixes that end up discarded; it may return a value
+that the caller finishes once `finalize` commits it.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _collapse_ws(text: str) -> str:
+    return " ".join(str(text or "").split())
+
+
+class SpeculativeTranslator:
+    """Translate stable prefixes of partial transcripts ahead of the final one."""
+
+    def __init__(
+        self,
+        translate: Callable[[str], Any],
+        stable_count: int = 2,
+        min_words: int = 2,
+        max_speculations: int = 4,
+        normalize: Optional[Callable[[str], str]] = None,
+    ):
+        self.translate = translate
+        self.normalize = normalize or _collapse_ws
+        self.stable_count = max(1, int(stable_count))
+        self.min_words = max(1, int(min_words))
+        self.max_speculations = max(1, int(max_speculations))
+        self.stats = {"partials": 0, "speculated": 0, "committed": 0, "discarded": 0}
+        self._recent: List[List[str]] = []
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stts-speculate")
+
+    def feed(self, partial: str) -> None:
+        """Accept a running transcript (safe to call from the decoding thread)."""
+        words = str(partial or "").split()
+        with self._lock:
+            self.stats["partials"] += 1
+            self._recent.append(words)
+            self._recent = self._recent[-self.stable_count:]
+            if len(self._recent) < self.stable_count:
+                return
+            stable: List[str] = []
+            for column in zip(*self._recent):
+                if any(w != column[0] for w in column):
+                    break
+                stable.append(column[0])
+            if len(stable) < self.min_words:
+                return
+            prefix = " ".join(stable)
+            key = self.normalize(prefix)
+            if key in self._futures or len(self._futures) >= self.max_speculations:
+                return
+            self.stats["speculated"] += 1
+            self._futures[key] = self._executor.submit(self.translate, prefix)
+
+    def finalize(self, final_text: str, timeout_s: Optional[float] = None) -> Tuple[bool, Any]:
+        """(committed, result) for the final transcript.
+
+        `committed` is True when a speculated prefix equals the final
+        transcript after `normalize`; its result is returned (waiting for it
+        if needed). Otherwise every speculation is discarded and the caller
+        translates as usual.
+        """
+        key = self.normalize(final_text)
+        with self._lock:
+            fut = self._futures.pop(key, None)
+            others = list(self._futures.values())
+            self._futures.clear()
+            self._recent = []
+            self.stats["discarded"] += len(others)
+        for f in others:
+            f.cancel()
+        if fut is None:
+            return False, None
+        try:
+            cmd = fut.result(timeout=timeout_s)
+        except Exception:
+            return False, None
+        with self._lock:
+            self.stats["committed"] += 1
+        return True, cmd
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def attach_partials(stt: Any, callback: Optional[Callable[[str], None]]) -> None:
+    """Set (or clear, with None) the partial-transcript callback on a provider and its cascade stages."""
+    for p in (stt, getattr(stt, "draft", None), getattr(stt, "accurate", None)):
+        if p is not None:
+            try:
+                p.on_partial = callback
+            except Exception:
+                pass
+
+
+__all__ = ["SpeculativeTranslator", "attach_partials"]
@@ -0,0 +1,186 @@
+"""Two-pass (draft + accurate) STT cascade for STTS.
+
+A fast draft provider (e.g. Vosk or whisper.cpp `tiny`) decodes every
+utterance. The accurate provider (the configured `stt_provider`, e.g.
+whisper.cpp `small`) re-decodes the same audio only when:
+  - the draft is empty,
+  - the draft confidence is known and below `min_confidence`,
+  - `accept_patterns` are set (daemon wake-word / trigger patterns) and the
+    draft matches none of them,
+  - or the caller asks for it later via `refine()` (e.g. nlp2cmd could not
+    translate the draft).
+
+Both transcripts and timings are kept in `last_result`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from stts_core.providers import STTProvider
+from stts_core.triggers import pattern_set
+
+
+@dataclass
+class CascadeResult:
+    """Draft/final transcripts and timings of the last cascade decode."""
+
+    text: str
+    draft_text: str
+    draft_s: float
+    draft_confidence: Optional[float] = None
+    final_text: Optional[str] = None
+    final_s: float = 0.0
+    escalated: bool = False
+    reason: Optional[str] = None
+
+
+class CascadeSTT(STTProvider):
+    """Meta-provider: fast draft decode, accurate re-decode on demand."""
+
+    name = "cascade"
+    description = "Two-pass STT (draft + accurate model)"
+
+    def __init__(
+        self,
+        draft: STTProvider,
+        accurate: STTProvider,
+        min_confidence: float = 0.6,
+        accept_patterns: Optional[List[str]] = None,
+        config: Optional[dict] = None,
+    ):
+        super().__init__(
+            model=getattr(accurate, "model", None),
+            language=getattr(accurate, "language", "pl"),
+            config=config if config is not None else getattr(accurate, "config", None),
+            info=getattr(accurate, "info", None),
+        )
+        self.draft = draft
+        self.accurate = accurate
+        self.min_confidence = float(min_confidence)
+        self.accept_patterns = accept_patterns
+        self.last_result: Optional[CascadeResult] = None
+        self._last_decode: Optional[Callable[[STTProvider], str]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _confidence(provider: STTProvider) -> Optional[float]:
+        v = getattr(provider, "last_confidence", None)
+        try:
+            return None if v is None else float(v)
+        except Exception:
+            return None
+
+    def _escalation_reason(self, draft_text: str, confidence: Optional[float]) -> Optional[str]:
+        if not (draft_text or "").strip():
+            return "empty_draft"
+        if confidence is not None and confidence < self.min_confidence:
+            return "low_confidence"
+        pats = self.accept_patterns
+        if pats:
+            if pattern_set(tuple(str(p) for p in pats)).search(draft_text) is not None:
+                return None
+            return "no_pattern_match"
+        return None
+
+    def _run(self, decode: Callable[[STTProvider], str]) -> str:
+        with self._lock:
+            self.draft._details = {}
+            t0 = time.perf_counter()
+            draft_text = decode(self.draft) or ""
+            draft_s = time.perf_counter() - t0
+            confidence = self._confidence(self.draft)
+            self._details = dict(self.draft._details)
+            res = CascadeResult(
+                text=draft_text,
+                draft_text=draft_text,
+                draft_s=draft_s,
+                draft_confidence=confidence,
+            )
+            self._last_decode = decode
+            reason = self._escalation_reason(draft_text, confidence)
+            if reason:
+                self._escalate(res, decode, reason)
+            self.last_result = res
+            return res.text
+
+    def _escalate(self, res: CascadeResult, decode: Callable[[STTProvider], str], reason: str) -> None:
+        self.accurate._details = {}
+        t0 = time.perf_counter()
+        final_text = decode(self.accurate) or ""
+        res.final_s = time.perf_counter() - t0
+        res.final_text = final_text
+        res.escalated = True
+        res.reason = reason
+        if final_text:
+            res.text = final_text
+            self._details = dict(self.accurate._details)
+
+    def transcribe(self, audio_path: str) -> str:
+        return self._run(lambda p: p.transcribe(audio_path))
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = 16000) -> str:
+        data = bytes(pcm or b"")
+        return self._run(lambda p: p.transcribe_pcm(data, sample_rate))
+
+    def refine(self, reason: str = "requested") -> Optional[str]:
+        """Re-decode the last utterance with the accurate model.
+
+        Returns the accurate transcript, or None if the last decode already
+        escalated (or nothing was decoded yet).
+        """
+        with self._lock:
+            res = self.last_result
+            decode = self._last_decode
+            if res is None or decode is None or res.escalated:
+                return None
+            self._escalate(res, decode, reason)
+            return res.final_text or None
+
+    def close(self) -> None:
+        for p in (self.draft, self.accurate):
+            try:
+                p.close()
+            except Exception:
+                pass
+
+
+def build_cascade(
+    accurate: STTProvider,
+    providers: dict,
+    config: dict,
+    info: Any = None,
+) -> Optional[CascadeSTT]:
+    """Wrap `accurate` in a cascade if `stt_draft_provider` is configured and available."""
+    name = str(config.get("stt_draft_provider") or "").strip()
+    if not name:
+        return None
+    if name in ("whisper", "whisper.cpp"):
+        name = "whisper_cpp"
+    cls = providers.get(name)
+    if cls is None:
+        return None
+    try:
+        ok, _ = cls.is_available(info)
+    except Exception:
+        ok = False
+    if not ok:
+        return None
+    draft_model = config.get("stt_draft_model") or (cls.get_recommended_model(info) if name != "whisper_cpp" else "tiny")
+    draft = cls(
+        model=draft_model,
+        language=config.get("language", "pl"),
+        config=config,
+        info=info,
+    )
+    try:
+        min_conf = float(config.get("stt_cascade_min_confidence", 0.6))
+    except Exception:
+        min_conf = 0.6
+    return CascadeSTT(draft=draft, accurate=accurate, min_confidence=min_conf, config=config)
+
+
+__all__ = ["CascadeResult", "CascadeSTT", "build_cascade"]
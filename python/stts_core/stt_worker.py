@@ -0,0 +1,403 @@
+"""STT worker process pool for STTS.
+
+Hosts any `STTProvider` in one or more dedicated worker processes so the
+model stays resident and decoding never blocks the caller's thread
+(recording, TTS, daemon bookkeeping). Jobs are WAV paths or in-memory PCM;
+each `submit_*` call returns a `concurrent.futures.Future` resolving to the
+transcript text; the full `Transcript` is attached as `future.transcript`.
+
+Cancellation and timeouts:
+  - a job still waiting in the queue is dropped when its future is cancelled
+  - `cancel(future)` on a running job terminates that worker and respawns it
+  - jobs exceeding their timeout fail with `TimeoutError` and the worker is
+    restarted (a hung decoder cannot stall the pool)
+  - a worker whose provider fails to initialize is not restarted; once every
+    worker is in that state (`init_error`), queued and new jobs fail at once
+
+PCM is passed to workers over a multiprocessing pipe (one copy per job,
+which is negligible next to decode time for utterance-sized audio).
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple, Type
+
+
+class CancelledJob(Exception):
+    """Raised on futures of jobs cancelled while running or at pool shutdown."""
+
+
+@dataclass
+class _Job:
+    job_id: int
+    kind: str  # "file" | "pcm"
+    payload: Any
+    sample_rate: int
+    timeout_s: Optional[float]
+    future: Future
+    overrides: Optional[dict] = None
+    started_at: float = 0.0
+
+
+def _worker_main(conn, provider_cls, provider_kwargs: dict) -> None:
+    """Worker process entry point: build the provider once, then serve jobs."""
+    try:
+        kwargs = dict(provider_kwargs or {})
+        if kwargs.get("info") is None:
+            try:
+                from stts_core.shell_utils import detect_system
+
+                kwargs["info"] = detect_system(fast=True)
+            except Exception:
+                kwargs["info"] = None
+        provider = provider_cls(**kwargs)
+        conn.send(("ready", os.getpid(), None))
+    except Exception as e:
+        try:
+            conn.send(("ready", os.getpid(), f"{type(e).__name__}: {e}"))
+        except Exception:
+            pass
+        return
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        job_id, kind, payload, sample_rate, overrides = msg
+        t0 = time.perf_counter()
+        try:
+            if overrides and isinstance(getattr(provider, "config", None), dict):
+                for k, v in overrides.items():
+                    if v is None:
+                        provider.config.pop(k, None)
+                    else:
+                        provider.config[k] = v
+            if kind == "pcm":
+                tr = provider.transcribe_pcm_detailed(payload, sample_rate)
+            else:
+                tr = provider.transcribe_detailed(payload)
+            conn.send(("done", job_id, (tr.text or "", None, time.perf_counter() - t0, tr)))
+        except Exception as e:
+            conn.send(("done", job_id, ("", f"{type(e).__name__}: {e}", time.perf_counter() - t0, None)))
+
+    try:
+        provider.close()
+    except Exception:
+        pass
+
+
+class _Worker:
+    def __init__(self, ctx, provider_cls, provider_kwargs: dict):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(
+            target=_worker_main,
+            args=(child, provider_cls, provider_kwargs),
+            daemon=True,
+        )
+        self.proc.start()
+        child.close()
+        self.job: Optional[_Job] = None
+        self.ready = False
+        self.eof = False
+        self.error: Optional[str] = None
+
+    def alive(self) -> bool:
+        return self.proc.is_alive()
+
+    def kill(self) -> None:
+        try:
+            self.proc.terminate()
+            self.proc.join(timeout=1.0)
+            if self.proc.is_alive():
+                self.proc.kill()
+                self.proc.join(timeout=1.0)
+        except Exception:
+            pass
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+class STTWorkerPool:
+    """Pool of processes, each hosting a resident STT provider instance."""
+
+    def __init__(
+        self,
+        provider_cls: Type[Any],
+        provider_kwargs: Optional[dict] = None,
+        workers: int = 1,
+        default_timeout_s: Optional[float] = 120.0,
+        start_method: Optional[str] = None,
+    ):
+        self.provider_cls = provider_cls
+        self.provider_kwargs = dict(provider_kwargs or {})
+        self.size = max(1, int(workers))
+        self.default_timeout_s = default_timeout_s
+        methods = multiprocessing.get_all_start_methods()
+        if start_method is None:
+            start_method = "fork" if "fork" in methods else "spawn"
+        if start_method != "fork":
+            # Objects defined in the entry-point script (e.g. SystemInfo) do not pickle.
+            self.provider_kwargs["info"] = None
+        self._ctx = multiprocessing.get_context(start_method)
+        self._ids = itertools.count(1)
+        self._pending: Deque[_Job] = collections.deque()
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = self._ctx.Pipe(duplex=False)
+        self._closed = False
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "cancelled": 0, "respawns": 0}
+        self._workers: List[_Worker] = [self._spawn() for _ in range(self.size)]
+        self._thread = threading.Thread(target=self._loop, name="stts-stt-pool", daemon=True)
+        self._thread.start()
+
+    # -- public API ------------------------------------------------------
+
+    def submit_file(
+        self,
+        audio_path: str,
+        timeout_s: Optional[float] = None,
+        overrides: Optional[dict] = None,
+    ) -> Future:
+        return self._submit("file", str(audio_path), 0, timeout_s, overrides)
+
+    def submit_pcm(
+        self,
+        pcm: bytes,
+        sample_rate: int = 16000,
+        timeout_s: Optional[float] = None,
+        overrides: Optional[dict] = None,
+    ) -> Future:
+        """Queue in-memory mono S16LE PCM. `overrides` patch the worker provider's config."""
+        return self._submit("pcm", bytes(pcm or b""), int(sample_rate), timeout_s, overrides)
+
+    def cancel(self, future: Future) -> bool:
+        """Cancel a queued or running job. Running jobs terminate their worker."""
+        if future.cancel():
+            self._notify()
+            return True
+        with self._lock:
+            for i, w in enumerate(self._workers):
+                if w.job is not None and w.job.future is future:
+                    w.kill()
+                    self._workers[i] = self._spawn()
+                    self.stats["cancelled"] += 1
+                    self.stats["respawns"] += 1
+                    break
+            else:
+                return False
+        if not future.done():
+            future.set_exception(CancelledJob("cancelled while running"))
+        self._notify()
+        return True
+
+    @property
+    def init_error(self) -> Optional[str]:
+        """Provider init error when no worker could start (the pool cannot decode), else None."""
+        with self._lock:
+            return self._init_error_locked()
+
+    def _init_error_locked(self) -> Optional[str]:
+        errors = [w.error for w in self._workers]
+        return errors[0] if errors and all(e is not None for e in errors) else None
+
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def busy(self) -> int:
+        with self._lock:
+            return sum(1 for w in self._workers if w.job is not None)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            pending = list(self._pending)
+            self._pending.clear()
+            workers = list(self._workers)
+        self._notify()
+        for job in pending:
+            job.future.cancel()
+        for w in workers:
+            if w.error is None and not w.eof and w.alive():
+                # never write to a dead worker: the CLI restores default SIGPIPE handling
+                try:
+                    w.conn.send(None)
+                except Exception:
+                    pass
+            if w.job is not None and not w.job.future.done():
+                w.job.future.set_exception(CancelledJob("pool closed"))
+            w.proc.join(timeout=1.0)
+            w.kill()
+        self._thread.join(timeout=2.0)
+
+    # -- internals -------------------------------------------------------
+
+    def _notify(self) -> None:
+        try:
+            self._wake_w.send(None)
+        except Exception:
+            pass
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.provider_cls, self.provider_kwargs)
+
+    def _submit(
+        self,
+        kind: str,
+        payload: Any,
+        sample_rate: int,
+        timeout_s: Optional[float],
+        overrides: Optional[dict] = None,
+    ) -> Future:
+        fut: Future = Future()
+        job = _Job(
+            job_id=next(self._ids),
+            kind=kind,
+            payload=payload,
+            sample_rate=sample_rate,
+            timeout_s=self.default_timeout_s if timeout_s is None else timeout_s,
+            future=fut,
+            overrides=dict(overrides) if overrides else None,
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("STT worker pool is closed")
+            self.stats["submitted"] += 1
+            err = self._init_error_locked()
+            if err is None:
+                self._pending.append(job)
+            else:
+                self.stats["failed"] += 1
+        if err is not None:
+            fut.set_exception(RuntimeError(f"STT worker init failed: {err}"))
+            return fut
+        self._notify()
+        return fut
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            for w in self._workers:
+                if not self._pending:
+                    return
+                if w.job is not None or not w.ready:
+                    continue
+                job = self._pending.popleft()
+                while job is not None and not job.future.set_running_or_notify_cancel():
+                    self.stats["cancelled"] += 1
+                    job = self._pending.popleft() if self._pending else None
+                if job is None:
+                    return
+                job.started_at = time.monotonic()
+                w.job = job
+                try:
+                    w.conn.send((job.job_id, job.kind, job.payload, job.sample_rate, job.overrides))
+                except Exception as e:
+                    w.job = None
+                    job.future.set_exception(e)
+
+    def _handle_message(self, w: _Worker, msg: Tuple[str, Any, Any]) -> None:
+        tag, a, b = msg
+        if tag == "ready":
+            with self._lock:
+                w.ready = b is None
+                w.error = b
+                pending: List[_Job] = []
+                if self._init_error_locked() is not None:
+                    # No worker can decode: fail queued jobs instead of hanging.
+                    pending = list(self._pending)
+                    self._pending.clear()
+            for job in pending:
+                if job.future.set_running_or_notify_cancel():
+                    job.future.set_exception(RuntimeError(f"STT worker init failed: {b}"))
+            return
+        if tag == "done":
+            job = w.job
+            w.job = None
+            if job is None or job.job_id != a or job.future.done():
+                return
+            text, err, _decode_s, transcript = b
+            if err:
+                self.stats["failed"] += 1
+                job.future.set_exception(RuntimeError(err))
+            else:
+                self.stats["completed"] += 1
+                job.future.transcript = transcript
+                job.future.set_result(text)
+
+    def _check_health(self) -> None:
+        now = time.monotonic()
+        failed: List[Tuple[Future, Exception]] = []
+        with self._lock:
+            for i, w in enumerate(self._workers):
+                job = w.job
+                expired = (
+                    job is not None
+                    and job.timeout_s is not None
+                    and job.timeout_s > 0
+                    and (now - job.started_at) > float(job.timeout_s)
+                )
+                if not (expired or not w.alive()):
+                    continue
+                if job is not None and not job.future.done():
+                    if expired:
+                        self.stats["timeouts"] += 1
+                        failed.append((job.future, TimeoutError(f"STT job exceeded {job.timeout_s}s")))
+                    else:
+                        self.stats["failed"] += 1
+                        failed.append((job.future, RuntimeError("STT worker exited")))
+                w.job = None
+                if w.error is not None and not expired:
+                    continue  # init failure: do not respawn in a tight loop
+                w.kill()
+                self._workers[i] = self._spawn()
+                self.stats["respawns"] += 1
+        for fut, exc in failed:
+            if not fut.done():
+                fut.set_exception(exc)
+
+    def _loop(self) -> None:
+        from multiprocessing.connection import wait
+
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                conns = {w.conn: w for w in self._workers if not w.eof}
+            self._dispatch()
+            try:
+                ready = wait([self._wake_r, *conns.keys()], timeout=0.25)
+            except Exception:
+                ready = []
+            for c in ready:
+                if c is self._wake_r:
+                    try:
+                        while self._wake_r.poll():
+                            self._wake_r.recv()
+                    except Exception:
+                        pass
+                    continue
+                w = conns[c]
+                try:
+                    msg = c.recv()
+                except (EOFError, OSError):
+                    w.eof = True
+                    continue
+                self._handle_message(w, msg)
+            self._check_health()
+
+
+__all__ = ["STTWorkerPool", "CancelledJob"]
@@ -0,0 +1,195 @@
+"""Persistent nlp2cmd translation cache for STTS.
+
+Voice commands repeat a lot ("pokaż pliki", "git status"), so translations
+are cached on disk as normalized text → shell command, with hit counts and a
+TTL. The whole cache is dropped when the nlp2cmd version changes.
+
+Lookups are in-memory dict reads; the JSON file is written atomically on
+new entries and (for updated hit counts) at exit.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+_WS_RE = re.compile(r"\s+")
+_EDGE_PUNCT = " \t\r\n.,!?;:\"'„”«»"
+_HIT_HALF_LIFE_S = 24 * 3600.0
+
+
+def cache_key(text: str) -> str:
+    """Normalize text for lookups: collapsed whitespace, no edge punctuation.
+
+    Only the leading word (the verb, capitalized by STT at sentence start) is
+    lowercased; arguments keep their case, so "plik README" and "plik readme"
+    stay distinct entries.
+    """
+    key = _WS_RE.sub(" ", str(text or "")).strip(_EDGE_PUNCT)
+    head, sep, rest = key.partition(" ")
+    return head.lower() + sep + rest
+
+
+def detect_nlp2cmd_version(bin_name: str = "nlp2cmd", python: Optional[str] = None) -> str:
+    """Best-effort nlp2cmd version used to invalidate the cache.
+
+    `STTS_NLP2CMD_VERSION` overrides; otherwise the package version installed
+    for this interpreter or for `python` (a venv interpreter, found via its
+    `*.dist-info` directory, without spawning it), falling back to the mtime
+    of the CLI binary.
+    """
+    v = os.environ.get("STTS_NLP2CMD_VERSION", "").strip()
+    if v:
+        return v
+    try:
+        from importlib import metadata
+
+        return "pkg:" + metadata.version("nlp2cmd")
+    except Exception:
+        pass
+    if python:
+        try:
+            prefix = Path(python).parent.parent
+            for d in sorted(prefix.glob("lib/python*/site-packages/nlp2cmd-*.dist-info")):
+                return "pkg:" + d.name[len("nlp2cmd-"):-len(".dist-info")]
+        except Exception:
+            pass
+    p = shutil.which(bin_name)
+    if p:
+        try:
+            return f"bin:{int(os.stat(p).st_mtime)}"
+        except Exception:
+            pass
+    return "unknown"
+
+
+class TranslationCache:
+    """Thread-safe persistent text → command cache."""
+
+    def __init__(
+        self,
+        path: Path,
+        version: str = "unknown",
+        ttl_s: float = 7 * 24 * 3600.0,
+        max_entries: int = 2000,
+    ):
+        self.path = Path(path)
+        self.version = str(version)
+        self.ttl_s = float(ttl_s)
+        self.max_entries = max(1, int(max_entries))
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            self._dirty = True  # version changed: start over
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self._entries = {k: v for k, v in entries.items() if isinstance(v, dict) and v.get("cmd")}
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        return self.ttl_s > 0 and (now - float(entry.get("ts") or 0)) > self.ttl_s
+
+    def get(self, text: str) -> Optional[str]:
+        key = cache_key(text)
+        if not key:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, now):
+                if entry is not None:
+                    del self._entries[key]
+                    self._dirty = True
+                self.stats["misses"] += 1
+                return None
+            entry["hits"] = int(entry.get("hits") or 0) + 1
+            entry["last"] = now
+            self._dirty = True
+            self.stats["hits"] += 1
+            return str(entry["cmd"])
+
+    def put(self, text: str, cmd: Optional[str]) -> None:
+        key = cache_key(text)
+        cmd = (cmd or "").strip()
+        if not key or not cmd:
+            return
+        now = time.time()
+        with self._lock:
+            prev = self._entries.get(key)
+            if prev is not None and prev.get("cmd") == cmd and not self._expired(prev, now):
+                return
+            self._entries[key] = {"cmd": cmd, "hits": 0, "ts": now, "last": now}
+            self.stats["stores"] += 1
+            self._evict(now, keep=key)
+            self._dirty = True
+        self.save()
+
+    def invalidate(self, text: Optional[str] = None) -> None:
+        """Drop one entry (or everything when `text` is None)."""
+        with self._lock:
+            if text is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(cache_key(text), None)
+            self._dirty = True
+        self.save()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self, now: float, keep: str = "") -> None:
+        over = len(self._entries) - self.max_entries
+        if over <= 0:
+            return
+
+        # Least valuable first: fewest hits (halved per day since last use, so
+        # old popularity fades), then least recently used. The entry just
+        # stored is never a candidate.
+        def value(entry: dict) -> tuple:
+            last = float(entry.get("last") or 0)
+            decay = 0.5 ** (max(0.0, now - last) / _HIT_HALF_LIFE_S)
+            return (int(entry.get("hits") or 0) * decay, last)
+
+        victims = sorted(
+            ((k, v) for k, v in self._entries.items() if k != keep),
+            key=lambda kv: value(kv[1]),
+        )[:over]
+        for k, _ in victims:
+            del self._entries[k]
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(
+                {"version": self.version, "entries": self._entries},
+                ensure_ascii=False,
+            )
+            self._dirty = False
+        if not self.path.parent.is_dir():
+            return  # config dir removed (e.g. temporary test dir); nothing to persist into
+        try:
+            tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+
+__all__ = ["TranslationCache", "cache_key", "detect_nlp2cmd_version"]
@@ -0,0 +1,242 @@
+"""Compiled daemon trigger rules.
+
+Trigger rules are `(pattern, command, is_regex)` tuples (see `stts
+--trigger`). `TriggerIndex` compiles them once: literal phrases go into a
+dict keyed by the lowercased phrase, regex rules into a `PatternSet`.
+
+Regex rules may capture arguments with named groups and use them in the
+command as `{name}` (same placeholders as local intents), e.g.
+`/restartuj (?P<svc>[\\w.@-]+)/=systemctl restart {svc}`. Captured
+values are shell-quoted. A rule whose command uses a placeholder its
+regex does not define is rejected at load time (`errors`).
+
+`PatternSet` indexes every regex by one 3-gram of the longest literal it
+requires (e.g. "restart " in `^restart (?P<svc>\\w+)`), picking the 3-gram
+that is rarest across all patterns.
+A lookup collects the 3-grams of the utterance (one pass over the text)
+and only runs the regexes whose literal can occur in it, so hundreds of
+triggers cost about as much as a handful. Regexes without such a literal
+are always run. As before, the first matching rule in file order wins.
+
+`TriggerIndex.changed()` notices edits to the triggers file (cheap,
+throttled `stat`), so the daemon can reload it without a restart.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from .intents import render_command, template_slots
+
+try:  # Python 3.11+
+    from re import _parser as _sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+TriggerRule = Tuple[str, str, bool]
+
+_GRAM = 3
+
+
+def _flatten(items: Any) -> Iterator[Tuple[Any, Any]]:
+    """Parsed regex items that always take part in a match (groups inlined)."""
+    for op, av in items:
+        if op is _sre_parse.SUBPATTERN:
+            yield from _flatten(av[-1])
+        else:
+            yield op, av
+
+
+def _grams(s: str) -> set:
+    return {s[i:i + _GRAM] for i in range(len(s) - _GRAM + 1)}
+
+
+def required_literal(pattern: str) -> str:
+    """Longest literal run every match of `pattern` must contain (casefolded), or ""."""
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return ""
+    best, run = "", []
+    for op, av in _flatten(parsed):
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is _sre_parse.AT:  # ^, $, \b: zero-width, keeps the run going
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+    if len(run) > len(best):
+        best = "".join(run)
+    return best.casefold()
+
+
+class PatternSet:
+    """Regexes matched against one text, first matching pattern (in order) wins.
+
+    `search(text)` returns `(index, named_groups)` or None. Patterns that do
+    not compile are skipped and listed in `errors`.
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE):
+        self.patterns = [str(p) for p in patterns]
+        self.errors: List[Tuple[int, str, str]] = []
+        self._compiled: Dict[int, Pattern[str]] = {}
+        self._by_gram: Dict[str, List[int]] = {}
+        self._always: List[int] = []
+        literals: Dict[int, str] = {}
+        for i, pat in enumerate(self.patterns):
+            try:
+                self._compiled[i] = re.compile(pat, flags)
+            except re.error as e:
+                self.errors.append((i, pat, str(e)))
+                continue
+            lit = required_literal(pat)
+            if len(lit) >= _GRAM:
+                literals[i] = lit
+            else:
+                self._always.append(i)
+        # key each pattern by the 3-gram of its literal shared by the fewest other
+        # patterns, so "restart nginx" / "restart redis" do not share a bucket
+        df: Dict[str, int] = {}
+        grams = {i: _grams(lit) for i, lit in literals.items()}
+        for gs in grams.values():
+            for g in gs:
+                df[g] = df.get(g, 0) + 1
+        for i, gs in grams.items():
+            self._by_gram.setdefault(min(sorted(gs), key=df.__getitem__), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def candidates(self, text: str) -> List[int]:
+        """Indices (ascending) of the patterns that can match `text`."""
+        found = set(self._always)
+        by_gram = self._by_gram
+        if by_gram:
+            for g in _grams(text.casefold()):
+                hit = by_gram.get(g)
+                if hit:
+                    found.update(hit)
+        return sorted(found)
+
+    def search(self, text: str, before: Optional[int] = None) -> Optional[Tuple[int, Dict[str, str]]]:
+        """First matching pattern; only indices below `before` when given."""
+        cands = self.candidates(text)
+        if before is not None:
+            cands = cands[: bisect.bisect_left(cands, before)]
+        for i in cands:
+            m = self._compiled[i].search(text)
+            if m is not None:
+                return i, {k: v for k, v in m.groupdict().items() if v is not None}
+        return None
+
+
+@functools.lru_cache(maxsize=32)
+def pattern_set(patterns: Tuple[str, ...]) -> PatternSet:
+    """Cached `PatternSet` for a tuple of regexes (e.g. STT cascade accept patterns)."""
+    return PatternSet(patterns)
+
+
+@dataclass
+class TriggerMatch:
+    rule: TriggerRule
+    command: str
+    groups: Dict[str, str] = field(default_factory=dict)
+
+
+def validate_rule(rule: TriggerRule) -> Optional[str]:
+    """Why `rule` cannot be used (bad regex, unknown `{slot}`), or None."""
+    pat, cmd, is_regex = rule
+    slots = template_slots(cmd)
+    if not is_regex:
+        return f"placeholders need a /regex/ with named groups: {', '.join(sorted(slots))}" if slots else None
+    try:
+        rx = re.compile(pat, re.IGNORECASE)
+    except re.error as e:
+        return str(e)
+    unknown = slots - set(rx.groupindex)
+    if unknown:
+        return f"no named group for: {', '.join(sorted(unknown))}"
+    return None
+
+
+class TriggerIndex(list):
+    """Valid trigger rules (still a list of tuples) plus their compiled lookup structures."""
+
+    def __init__(self, rules: Iterable[TriggerRule] = (), source: Optional[str] = None, check_interval_s: float = 2.0):
+        self.errors: List[Tuple[TriggerRule, str]] = []
+        valid: List[TriggerRule] = []
+        for rule in rules:
+            rule = tuple(rule)  # type: ignore[assignment]
+            err = validate_rule(rule)
+            if err is None:
+                valid.append(rule)
+            else:
+                self.errors.append((rule, err))
+        super().__init__(valid)
+        self.source = source
+        self.check_interval_s = float(check_interval_s)
+        self._exact: Dict[str, int] = {}
+        self._regex_pos: List[int] = []
+        self._templated: set = set()
+        for i, (pat, cmd, is_regex) in enumerate(self):
+            if is_regex:
+                self._regex_pos.append(i)
+                if template_slots(cmd):
+                    self._templated.add(i)
+            else:
+                self._exact.setdefault(str(pat).strip().lower(), i)
+        self._patterns = PatternSet([self[i][0] for i in self._regex_pos])
+        self._stamp = self._file_stamp()
+        self._checked_at = time.monotonic()
+
+    def match(self, text: str) -> Optional[TriggerMatch]:
+        t = (text or "").strip()
+        if not t:
+            return None
+        exact = self._exact.get(t.lower())
+        # a regex rule listed before the exact phrase still takes precedence
+        before = None if exact is None else bisect.bisect_left(self._regex_pos, exact)
+        hit = self._patterns.search(t, before=before)
+        if hit is not None:
+            pos = self._regex_pos[hit[0]]
+            rule, groups = self[pos], hit[1]
+            cmd = render_command(rule[1], groups) if pos in self._templated else rule[1]
+            return TriggerMatch(rule, cmd, groups)
+        if exact is not None:
+            return TriggerMatch(self[exact], self[exact][1])
+        return None
+
+    def _file_stamp(self) -> Optional[Tuple[float, int]]:
+        if not self.source:
+            return None
+        try:
+            st = os.stat(self.source)
+            return st.st_mtime, st.st_size
+        except OSError:
+            return None
+
+    def changed(self) -> bool:
+        """True once the source file was modified (stat at most every `check_interval_s`)."""
+        if not self.source:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval_s:
+            return False
+        self._checked_at = now
+        return self._file_stamp() != self._stamp
+
+
+def as_index(rules: Optional[Iterable[TriggerRule]]) -> TriggerIndex:
+    return rules if isinstance(rules, TriggerIndex) else TriggerIndex(rules or ())
+
+
+__all__ = ["PatternSet", "TriggerIndex", "TriggerMatch", "TriggerRule", "as_index", "pattern_set", "required_literal", "validate_rule"]
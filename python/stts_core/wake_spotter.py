@@ -0,0 +1,149 @@
+"""Cheap first-stage wake-word spotting for the daemon.
+
+Without it every utterance the VAD lets through is decoded by the full STT
+model and only then regex-matched against the wake word, so an idle daemon
+in a noisy room keeps a whisper-class model busy. `VoskWakeSpotter` runs a
+small Vosk recognizer restricted to a grammar of wake-word variants (plus
+`[unk]`) over the first seconds of a recording. Only recordings where it
+hears the wake word go on to the full STT model.
+
+The spotter fails open: unreadable audio, a missing model or a grammar with
+no in-vocabulary words yields None ("don't know") and the caller decodes as
+before.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import wave
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .config import MODELS_DIR
+
+
+def find_vosk_model(model: Optional[str] = None) -> Optional[Path]:
+    """Explicit model path/name, else the smallest-looking installed Vosk model."""
+    if model and Path(str(model)).expanduser().exists():
+        return Path(str(model)).expanduser()
+    vosk_dir = MODELS_DIR / "vosk"
+    if not vosk_dir.exists():
+        return None
+    if model:
+        matches = sorted(vosk_dir.glob(f"*{model}*"))
+        if matches:
+            return matches[0]
+    models = sorted(vosk_dir.glob("vosk-model-small-*")) or sorted(vosk_dir.glob("vosk-model-*"))
+    return models[0] if models else None
+
+
+class VoskWakeSpotter:
+    """Keyword spotter: Vosk grammar recognizer over wake-word variants."""
+
+    name = "vosk"
+
+    def __init__(self, phrases: Sequence[str], model_path: str, window_s: float = 2.5):
+        self.model_path = str(model_path)
+        self.window_s = max(0.5, float(window_s))
+        self.stats: Dict[str, int] = {"checked": 0, "fired": 0, "rejected": 0, "unknown": 0}
+        self._phrases = [str(p).strip().lower() for p in phrases if str(p or "").strip()]
+        self._model: Any = None
+        self._grammar: Optional[str] = None
+        self._keys: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def _load(self) -> bool:
+        if self._model is not None:
+            return bool(self._keys)
+        import vosk
+
+        try:
+            vosk.SetLogLevel(-1)
+        except Exception:
+            pass
+        self._model = vosk.Model(self.model_path)
+        find_word = getattr(self._model, "find_word", None)
+        keep = []
+        for phrase in self._phrases:
+            words = phrase.split()
+            # words missing from the model vocabulary would make the grammar deaf
+            if callable(find_word) and any(find_word(w) < 0 for w in words):
+                continue
+            keep.append(phrase)
+        self._keys = [p.split() for p in keep]
+        self._grammar = json.dumps(keep + ["[unk]"], ensure_ascii=False)
+        return bool(self._keys)
+
+    @property
+    def phrases(self) -> List[str]:
+        return [" ".join(k) for k in self._keys]
+
+    def detect(self, audio_path: str) -> Optional[bool]:
+        """True: wake word heard; False: not heard; None: could not tell."""
+        with self._lock:
+            self.stats["checked"] += 1
+            try:
+                if not self._load():
+                    result = None
+                else:
+                    result = self._spot(audio_path)
+            except Exception:
+                result = None
+            self.stats["unknown" if result is None else ("fired" if result else "rejected")] += 1
+            return result
+
+    def _spot(self, audio_path: str) -> Optional[bool]:
+        import vosk
+
+        with wave.open(audio_path, "rb") as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                return None
+            rate = wf.getframerate()
+            rec = vosk.KaldiRecognizer(self._model, rate, self._grammar)
+            left = int(rate * self.window_s)
+            while left > 0:
+                data = wf.readframes(min(4000, left))
+                if not data:
+                    break
+                left -= len(data) // 2
+                rec.AcceptWaveform(data)
+        heard = str(json.loads(rec.FinalResult() or "{}").get("text") or "").split()
+        for key in self._keys:
+            n = len(key)
+            if any(heard[i:i + n] == key for i in range(len(heard) - n + 1)):
+                return True
+        return False
+
+
+def build_wake_spotter(
+    config: Dict[str, Any],
+    wake_word: str,
+    variants_fn: Optional[Callable[..., List[str]]] = None,
+) -> Optional[VoskWakeSpotter]:
+    """Spotter per config `wake_spotter` (auto/vosk/off), or None.
+
+    `auto` enables it only when vosk and a model are installed and the main
+    STT provider is not vosk itself (then full decoding is already cheap).
+    """
+    mode = str(config.get("wake_spotter", "auto") or "off").strip().lower()
+    if mode in ("0", "off", "false", "no", "none"):
+        return None
+    if mode == "auto" and str(config.get("stt_provider") or "") == "vosk":
+        return None
+    try:
+        import vosk  # noqa: F401
+    except ImportError:
+        return None
+    model = find_vosk_model(config.get("wake_spotter_model"))
+    if model is None:
+        return None
+    phrases = list(variants_fn(wake_word, max_variants=24) if variants_fn else []) or [wake_word]
+    try:
+        window_s = float(config.get("wake_spotter_window_s", 2.5))
+    except Exception:
+        window_s = 2.5
+    return VoskWakeSpotter(phrases, str(model), window_s=window_s)
+
+
+__all__ = ["VoskWakeSpotter", "build_wake_spotter", "find_vosk_model"]
@@ -1,6 +1,8 @@
 """Wake word detection for STTS daemon mode."""
+import functools
 import re
-from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Sequence, Tuple
 
 
 # Wake-word patterns (hejken/heyken + common STT phonetic variants).
@@ -22,23 +24,87 @@ WAKE_WORD_PATTERNS = [
 ]
 
 
+# STT engines may prepend quotes / punctuation before the wake word
+_PREFIX = r"\s*[\W_]*"
+_STRIP_CHARS = " \t\r\n,:;.!?\"'“”‘’—-"
+
+
+@dataclass(frozen=True)
+class WakeMatch:
+    """A wake-word hit: which pattern (variant) matched, where, and what follows it."""
+
+    variant: int
+    pattern: str
+    end: int
+    remaining: str
+
+
+class WakeWordMatcher:
+    """All wake patterns compiled into one anchored regex with named alternatives.
+
+    Alternative `w<i>` is pattern i (tried in order, each with the optional
+    leading punctuation some STT engines emit), so one `match()` finds the
+    first matching variant and its span; the remainder is sliced off, no
+    second regex pass. Patterns that cannot share one regex (e.g. duplicate
+    group names) fall back to one compiled regex per pattern.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = [str(p or "") for p in patterns]
+        bodies = [p[1:] if p.startswith("^") else p for p in self.patterns]
+        self._combined: Optional[Pattern[str]] = None
+        self._single: List[Tuple[int, Pattern[str]]] = []
+        try:
+            alts = "|".join(f"(?P<w{i}>{_PREFIX}(?:{b}))" for i, b in enumerate(bodies))
+            self._combined = re.compile(f"^(?:{alts})", re.IGNORECASE)
+        except re.error:
+            for i, b in enumerate(bodies):
+                try:
+                    self._single.append((i, re.compile(f"^{_PREFIX}(?:{b})", re.IGNORECASE)))
+                except re.error:
+                    continue
+
+    def match(self, text: str) -> Optional[WakeMatch]:
+        src = str(text or "")
+        if not src:
+            return None
+        if self._combined is not None:
+            m = self._combined.match(src)
+            if m is None:
+                return None
+            i = int(m.lastgroup[1:])  # the outer w<i> group closes last
+            end = m.end()
+        else:
+            for i, rx in self._single:
+                m = rx.match(src)
+                if m is not None:
+                    end = m.end()
+                    break
+            else:
+                return None
+        remaining = src[end:].strip(_STRIP_CHARS).strip()
+        return WakeMatch(variant=i, pattern=self.patterns[i], end=end, remaining=remaining)
+
+
+@functools.lru_cache(maxsize=16)
+def compile_wake_patterns(patterns: Tuple[str, ...]) -> WakeWordMatcher:
+    """Cached matcher for a tuple of wake patterns."""
+    return WakeWordMatcher(patterns)
+
+
+def match_wake_word(text: str, patterns: Optional[List[str]] = None) -> Optional[WakeMatch]:
+    """Wake-word match at the start of `text` (default `WAKE_WORD_PATTERNS`), or None."""
+    return compile_wake_patterns(tuple(patterns or WAKE_WORD_PATTERNS)).match(text)
+
+
 def check_wake_word(text: str, patterns: Optional[List[str]] = None) -> Tuple[bool, str]:
     """Check if text starts with wake word. Returns (matched, remaining_text)."""
     if not text:
         return False, ""
-    src = str(text)
-    pats = list(patterns or WAKE_WORD_PATTERNS)
-    for pattern in pats:
-        pat = str(pattern or "")
-        if pat.startswith("^"):
-            pat = pat[1:]
-
-        full = r"^\s*[\W_]*" + pat
-        if re.match(full, src, re.IGNORECASE):
-            remaining = re.sub(full, "", src, count=1, flags=re.IGNORECASE)
-            remaining = remaining.strip(" \t\r\n,:;.!?\"'""''—-")
-            return True, remaining.strip()
-    return False, src
+    m = match_wake_word(text, patterns)
+    if m is None:
+        return False, str(text)
+    return True, m.remaining
 
 
 def phrase_to_pattern(phrase: str) -> Optional[str]:
@@ -0,0 +1,105 @@
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+from stts_core.daemon_control import (
+    DaemonControlClient,
+    DaemonControlServer,
+    LatencyHistogram,
+    control_socket_path,
+)
+from stts_core.daemon_handlers import DaemonHandlers
+from stts_core.daemon_pipeline import StagedDaemonPipeline
+
+
+class _Handlers(DaemonHandlers):
+    def log(self, msg):
+        pass
+
+
+def _handlers(config):
+    deps = types.SimpleNamespace(
+        _wake_word_phrase_to_pattern=lambda w: r"^" + w + r"\b",
+        load_config=lambda: {"vad_silence_ms": 1500, "stt_provider": "from-file"},
+        reset_intent_engine=lambda: None,
+        nlp2cmd_ready_state=lambda: "ready",
+    )
+    shell = types.SimpleNamespace(deps=deps, config=config, stt=None, tts=None, capture=lambda **kw: None)
+    h = _Handlers(shell)
+    h.trigger_loader = lambda: [("kopia", "backup.sh", False)]
+    return h
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_and_quantiles(self):
+        h = LatencyHistogram()
+        for ms in (3, 7, 7, 40, 2000):
+            h.record(ms / 1000.0)
+        snap = h.snapshot()
+        self.assertEqual(snap["n"], 5)
+        self.assertEqual((snap["buckets"]["le_5"], snap["buckets"]["le_10"], snap["buckets"]["le_2500"]), (1, 2, 1))
+        self.assertEqual((snap["p50_le_ms"], snap["p95_le_ms"]), (10.0, 2500.0))
+
+
+class TestDaemonControl(unittest.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.path = str(Path(td.name) / "daemon.sock")
+
+    def test_socket_path_config(self):
+        self.assertEqual(control_socket_path({}, Path("/x")), Path("/x/daemon.sock"))
+        self.assertIsNone(control_socket_path({"daemon_control_socket": "0"}, Path("/x")))
+        self.assertEqual(control_socket_path({"daemon_control_socket": "/run/s.sock"}, Path("/x")), Path("/run/s.sock"))
+
+    def test_metrics_pause_and_reload(self):
+        config = {"vad_silence_ms": 800, "stt_provider": "whisper_cpp"}
+        h = _handlers(config)
+        pipeline = StagedDaemonPipeline(h)
+        srv = DaemonControlServer(self.path, h, pipeline).start()
+        client = DaemonControlClient(self.path)
+        try:
+            m = client.call({"op": "metrics"})["metrics"]
+            self.assertFalse(m["paused"])
+            self.assertEqual(m["nlp2cmd_workers"], "ready")
+            self.assertEqual(m["pipeline"]["utterances"], 0)
+            self.assertIn("latency", m["pipeline"]["stages"]["stt"])
+
+            self.assertTrue(client.call({"op": "pause"})["paused"])
+            self.assertTrue(h.paused.is_set())
+            client.call({"op": "resume"})
+            self.assertFalse(h.paused.is_set())
+
+            resp = client.call({"op": "reload", "wake_word": "komputer"})
+            self.assertTrue(resp["ok"])
+            self.assertEqual(h.triggers, [("kopia", "backup.sh", False)])
+            # only hot-reloadable keys change
+            self.assertEqual((config["vad_silence_ms"], config["stt_provider"]), (1500, "whisper_cpp"))
+            self.assertEqual(h.wake_patterns, [r"^komputer\b"])
+
+            self.assertFalse(client.call({"op": "nope"})["ok"])
+        finally:
+            srv.stop()
+        self.assertFalse(Path(self.path).exists())
+        self.assertIsNone(client.call({"op": "ping"}, timeout_s=0.5))
+
+    def test_pause_stops_capture(self):
+        h = _handlers({})
+        calls = []
+        h.shell.capture = lambda **kw: calls.append(1) or time.sleep(0.01)
+        h.pause()
+        pipeline = StagedDaemonPipeline(h).start()
+        try:
+            time.sleep(0.3)
+            self.assertEqual(calls, [])
+            h.resume()
+            time.sleep(0.3)
+            self.assertTrue(calls)
+        finally:
+            pipeline.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
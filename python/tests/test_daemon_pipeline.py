@@ -0,0 +1,295 @@
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+
+from stts_core.daemon_handlers import DaemonHandlers
+from stts_core.daemon_pipeline import FairQueue, StagedDaemonPipeline
+from stts_core.exec_pool import ExecPool
+from stts_core.wake_word import check_wake_word, normalize_daemon_command
+
+
+class _Deps:
+    check_wake_word = staticmethod(check_wake_word)
+    normalize_daemon_command = staticmethod(normalize_daemon_command)
+
+    def __init__(self):
+        self.check_command_safety = lambda cmd, cfg, dry_run=False: (True, "")
+
+    def match_trigger(self, text, rules):
+        for pattern, cmd, _is_regex in rules:
+            if text.strip().lower() == pattern:
+                return cmd
+        return None
+
+
+class _TTS:
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+
+class _Shell:
+    """Utterances come from a script; commands are recorded, each takes `exec_s`."""
+
+    def __init__(self, utterances, exec_s=0.0):
+        self.deps = _Deps()
+        self.config = {}
+        self.tts = _TTS()
+        # list, or {device: list} for several microphones
+        self.utterances = {k: list(v) for k, v in utterances.items()} if isinstance(utterances, dict) else {None: list(utterances)}
+        self.lock = threading.Lock()
+        self.exec_s = exec_s
+        self.captured_at = []
+        self.ran = []
+        self.paths = []
+
+    def capture(self, stt_file=None, output_path=None, device=None):
+        pending = self.utterances.get(device)
+        if not pending:
+            time.sleep(0.02)
+            return None
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(pending.pop(0))
+        with self.lock:
+            self.captured_at.append(time.monotonic())
+            self.paths.append(output_path)
+        return output_path
+
+    def transcribe(self, audio_path):
+        with open(audio_path, encoding="utf-8") as f:
+            return f.read()
+
+    def run_command_any(self, cmd):
+        time.sleep(self.exec_s)
+        self.ran.append((cmd, time.monotonic()))
+        return "", 0, True
+
+    def speak(self, text):
+        self.tts.speak(text)
+
+
+class _Handlers(DaemonHandlers):
+    def log(self, msg):
+        pass
+
+
+def _handlers(shell, triggers=(), results=None):
+    h = _Handlers(shell)
+    h.triggers = list(triggers)
+    h.query_nlp2cmd = lambda command: (results or {}).get(command)
+    return h
+
+
+def _wait(cond, timeout_s=3.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline and not cond():
+        time.sleep(0.01)
+    return cond()
+
+
+class TestStagedDaemonPipeline(unittest.TestCase):
+    def test_capture_continues_while_command_executes(self):
+        shell = _Shell(["hejken uruchom kopię", "hejken pokaż pliki", "hejken pokaż dysk"], exec_s=0.3)
+        h = _handlers(
+            shell,
+            triggers=[("uruchom kopię", "backup.sh", False)],
+            results={
+                "pokaż pliki": {"success": True, "command": "ls", "confidence": 0.9},
+                "pokaż dysk": {"success": True, "command": "df -h", "confidence": 0.9},
+            },
+        )
+        with tempfile.TemporaryDirectory() as td:
+            p = StagedDaemonPipeline(h, queue_size=2, tmp_dir=td).start()
+            try:
+                self.assertTrue(_wait(lambda: len(shell.ran) == 3))
+            finally:
+                p.stop()
+            self.assertEqual(os.listdir(td), [])
+        self.assertEqual([c for c, _ in shell.ran], ["backup.sh", "ls", "df -h"])
+        # every utterance was captured before the first command finished
+        self.assertLess(shell.captured_at[-1], shell.ran[0][1])
+        self.assertEqual(p.stats["exec"]["processed"], 3)
+        self.assertIn("Wykonuję: ls", shell.tts.spoken)
+
+    def test_bare_wake_word_arms_next_utterance(self):
+        shell = _Shell(["hejken", "pokaż pliki", "pokaż pliki"])
+        h = _handlers(shell, results={"pokaż pliki": {"success": True, "command": "ls", "confidence": 0.9}})
+        p = StagedDaemonPipeline(h).start()
+        try:
+            self.assertTrue(_wait(lambda: p.stats["nlp"]["processed"] == 3))
+            self.assertTrue(_wait(lambda: len(shell.ran) == 1))
+        finally:
+            p.stop()
+        self.assertEqual([c for c, _ in shell.ran], ["ls"])
+        self.assertEqual(shell.tts.spoken[0], "Słucham")
+
+    def test_spotter_passes_command_after_bare_wake_word(self):
+        class _Spotter:
+            stats = {}
+
+            def detect(self, audio_path):
+                with open(audio_path, encoding="utf-8") as f:
+                    return "hejken" in f.read()
+
+        shell = _Shell(["hejken", "pokaż pliki"])
+        h = _handlers(shell, results={"pokaż pliki": {"success": True, "command": "ls", "confidence": 0.9}})
+        h.spotter = _Spotter()
+        slow_nlp = h.process_wake_word
+        # the NLP stage lags behind STT, so it arms the window too late to help the spotter
+        h.process_wake_word = lambda text, **kw: time.sleep(0.2) or slow_nlp(text, **kw)
+        p = StagedDaemonPipeline(h).start()
+        try:
+            self.assertTrue(_wait(lambda: len(shell.ran) == 1))
+        finally:
+            p.stop()
+        self.assertEqual([c for c, _ in shell.ran], ["ls"])
+
+    def test_backpressure_blocks_capture(self):
+        gate = threading.Event()
+        shell = _Shell(["hejken a"] * 10)
+        h = _handlers(shell)
+        h.process_wake_word = lambda text, **kw: (gate.wait(5.0), "")
+        p = StagedDaemonPipeline(h, queue_size=1).start()
+        try:
+            time.sleep(0.3)
+            # held by NLP, queued for NLP, held by STT, queued for STT, held by capture
+            self.assertEqual(len(shell.captured_at), 5)
+            self.assertGreaterEqual(p.stats["backpressure_waits"], 1)
+            gate.set()
+            self.assertTrue(_wait(lambda: p.stats["nlp"]["processed"] == 10))
+        finally:
+            gate.set()
+            p.stop()
+
+    def test_tts_backlog_drops_oldest(self):
+        shell = _Shell([])
+        p = StagedDaemonPipeline(_handlers(shell), tts_queue_size=2)
+        for text in ("a", "b", "c"):
+            p._enqueue_speech(text)
+        self.assertEqual(p.stats["tts_dropped"], 1)
+        self.assertEqual([p.queues["tts"].get_nowait() for _ in range(2)], ["b", "c"])
+
+
+class TestAdmission(unittest.TestCase):
+    RESULTS = {
+        "pokaż pliki": {"success": True, "command": "ls", "confidence": 0.9},
+        "pokaż dysk": {"success": True, "command": "df -h", "confidence": 0.9},
+    }
+
+    def _slow_queries(self, h, delays):
+        def query(command):
+            time.sleep(delays.get(command, 0.0))
+            return self.RESULTS.get(command)
+
+        h.query_nlp2cmd = query
+
+    def test_stale_utterances_are_dropped(self):
+        shell = _Shell(["hejken pokaż pliki", "hejken pokaż dysk", "hejken pokaż dysk"])
+        slow = shell.transcribe
+        shell.transcribe = lambda path: time.sleep(0.3) or slow(path)
+        h = _handlers(shell, results=self.RESULTS)
+        p = StagedDaemonPipeline(h, deadline_s=0.45, coalesce_s=0).start()
+        try:
+            self.assertTrue(_wait(lambda: p.stats["admission"]["shed_stale"] == 2))
+            self.assertTrue(_wait(lambda: len(shell.ran) == 1))
+        finally:
+            p.stop()
+        self.assertEqual([c for c, _ in shell.ran], ["ls"])
+
+    def test_deadline_applies_in_exec_pool(self):
+        shell = _Shell(["hejken uruchom kopię", "hejken pokaż datę"])
+        h = _handlers(shell, triggers=[("uruchom kopię", "sleep 0.6", False), ("pokaż datę", "date", False)])
+        h.exec_pool = ExecPool(max_workers=1)
+        self.addCleanup(h.close)
+        p = StagedDaemonPipeline(h, deadline_s=0.4, coalesce_s=0).start()
+        try:
+            self.assertTrue(_wait(lambda: p.stats["admission"]["shed_stale"] == 1))
+            self.assertTrue(_wait(lambda: p.latency["end_to_end"].n == 1))
+        finally:
+            p.stop()
+        self.assertEqual(h.exec_pool.stats["completed"], 1)
+        self.assertEqual(h.exec_pool.stats["expired"], 1)
+        # recorded when the command finished, not when it was handed to the pool
+        self.assertGreaterEqual(p.latency["end_to_end"].total_ms, 600)
+
+    def test_repeated_command_is_coalesced(self):
+        shell = _Shell({"hw:1,0": ["hejken pokaż pliki"], "hw:2,0": ["hejken pokaż pliki"]})
+        h = _handlers(shell, results=self.RESULTS)
+        p = StagedDaemonPipeline(h, devices=["hw:1,0", "hw:2,0"]).start()
+        try:
+            self.assertTrue(_wait(lambda: p.stats["nlp"]["processed"] == 2))
+            self.assertTrue(_wait(lambda: len(shell.ran) == 1))
+            time.sleep(0.1)
+        finally:
+            p.stop()
+        self.assertEqual([c for c, _ in shell.ran], ["ls"])
+        self.assertEqual(p.snapshot()["admission"]["coalesced"], 1)
+
+    def test_triggers_overtake_queries_which_keep_spoken_order(self):
+        shell = _Shell(["hejken pokaż pliki", "hejken pokaż dysk", "hejken uruchom kopię"])
+        h = _handlers(shell, triggers=[("uruchom kopię", "backup.sh", False)])
+        self._slow_queries(h, {"pokaż pliki": 0.4, "pokaż dysk": 0.05})
+        p = StagedDaemonPipeline(h).start()
+        try:
+            self.assertTrue(_wait(lambda: len(shell.ran) == 3))
+        finally:
+            p.stop()
+        self.assertEqual([c for c, _ in shell.ran], ["backup.sh", "ls", "df -h"])
+        self.assertEqual(p.stats["admission"]["prioritized"], 1)
+        self.assertEqual(p.stats["query"]["processed"], 2)
+
+    def test_query_overload_is_refused(self):
+        shell = _Shell(["hejken pokaż pliki", "hejken pokaż dysk"])
+        h = _handlers(shell)
+        self._slow_queries(h, {"pokaż pliki": 0.4})
+        p = StagedDaemonPipeline(h, max_queries=1).start()
+        try:
+            self.assertTrue(_wait(lambda: len(shell.ran) == 1))
+        finally:
+            p.stop()
+        self.assertEqual([c for c, _ in shell.ran], ["ls"])
+        self.assertEqual(p.stats["admission"]["shed_overload"], 1)
+        self.assertIn("Jestem zajęty, powtórz za chwilę", shell.tts.spoken)
+
+
+class TestFairQueue(unittest.TestCase):
+    def test_round_robin_and_per_key_bound(self):
+        q = FairQueue(2, key=lambda item: item[0])
+        for item in [("a", 1), ("a", 2), ("b", 1)]:
+            q.put(item)
+        with self.assertRaises(queue.Full):
+            q.put(("a", 3), timeout=0.01)
+        q.put(("b", 2), timeout=0.01)  # other keys are not blocked by a full one
+        self.assertEqual([q.get_nowait() for _ in range(4)], [("a", 1), ("b", 1), ("a", 2), ("b", 2)])
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+
+
+class TestMultiDevice(unittest.TestCase):
+    def test_devices_share_stages_with_separate_wake_state(self):
+        shell = _Shell({"hw:1,0": ["hejken", "pokaż pliki"], "hw:2,0": ["pokaż pliki", "hejken pokaż dysk"]})
+        h = _handlers(
+            shell,
+            results={
+                "pokaż pliki": {"success": True, "command": "ls", "confidence": 0.9},
+                "pokaż dysk": {"success": True, "command": "df -h", "confidence": 0.9},
+            },
+        )
+        p = StagedDaemonPipeline(h, devices=["hw:1,0", "hw:2,0"]).start()
+        try:
+            self.assertTrue(_wait(lambda: p.stats["nlp"]["processed"] == 4))
+            self.assertTrue(_wait(lambda: len(shell.ran) == 2))
+        finally:
+            p.stop()
+        # room 1 armed itself with a bare wake word; room 2's "pokaż pliki" had none
+        self.assertEqual(sorted(c for c, _ in shell.ran), ["df -h", "ls"])
+        self.assertEqual(p.stats["devices"]["hw:2,0"], {"captured": 2, "transcribed": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import time
+import types
+import unittest
+
+from stts_core.daemon_handlers import DaemonHandlers
+from stts_core.exec_pool import DeadlineExpired, ExecPool, command_name, command_names
+
+
+class TestCommandName(unittest.TestCase):
+    def test_skips_wrappers_and_env(self):
+        self.assertEqual(command_name("sudo -E apt install -y htop"), "apt")
+        self.assertEqual(command_name("LANG=C /usr/bin/dnf update"), "dnf")
+        self.assertEqual(command_name("ls -la"), "ls")
+        self.assertEqual(command_name(""), "")
+
+    def test_skips_wrapper_option_values(self):
+        self.assertEqual(command_name("sudo -u root apt install x"), "apt")
+        self.assertEqual(command_name("nice -n 10 apt-get upgrade"), "apt-get")
+        self.assertEqual(command_name("timeout -s KILL 300 dnf update"), "dnf")
+        self.assertEqual(command_name("env -u LANG DEBIAN_FRONTEND=noninteractive apt upgrade"), "apt")
+        self.assertEqual(command_name("sudo -E -g adm env FOO=1 dpkg -i x.deb"), "dpkg")
+
+    def test_splits_command_chains(self):
+        self.assertEqual(command_names("cd /tmp && apt install x"), ["cd", "apt"])
+        self.assertEqual(command_names("apt update; snap refresh | tee log"), ["apt", "snap", "tee"])
+        self.assertEqual(command_names("echo 'a && b; c'"), ["echo"])
+
+
+class TestExecPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ExecPool(max_workers=3, timeout_s=10, serialize=["sleep"], kill_grace_s=0.5)
+        self.addCleanup(self.pool.close)
+
+    def test_runs_concurrently(self):
+        t0 = time.monotonic()
+        futs = [self.pool.submit("bash -c 'sleep 0.4'; echo ok") for _ in range(3)]
+        res = [f.result(timeout=5) for f in futs]
+        self.assertLess(time.monotonic() - t0, 1.1)
+        self.assertEqual([(r.output, r.exit_code) for r in res], [("ok\n", 0)] * 3)
+
+    def test_same_class_is_serialized(self):
+        self.assertEqual(self.pool.exec_class("sudo apt-get install x"), "dpkg")
+        self.assertEqual(self.pool.exec_class("cd /tmp && sudo -u root apt install x"), "dpkg")
+        self.assertEqual(self.pool.exec_classes("apt update && snap refresh"), ("dpkg", "snap"))
+        t0 = time.monotonic()
+        futs = [self.pool.submit("sleep 0.3") for _ in range(2)]
+        futs.append(self.pool.submit("bash -c 'sleep 0.3'"))
+        other = futs[2].result(timeout=5)
+        for f in futs[:2]:
+            f.result(timeout=5)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.6)
+        self.assertLess(other.duration_s, 0.6)
+        self.assertEqual(self.pool.stats["completed"], 3)
+
+    def test_timeout_kills_process_group(self):
+        res = self.pool.submit("bash -c 'sleep 30 & sleep 30; echo never'", timeout_s=0.3).result(timeout=5)
+        self.assertTrue(res.timed_out)
+        self.assertEqual(res.exit_code, 124)
+        self.assertNotIn("never", res.output)
+        self.assertLess(res.duration_s, 3)
+        self.assertEqual(self.pool.stats["timeouts"], 1)
+
+    def test_deadline_drops_queued_command(self):
+        pool = ExecPool(max_workers=1)
+        self.addCleanup(pool.close)
+        first = pool.submit("sleep 0.4")
+        late = pool.submit("echo late", deadline=time.monotonic() + 0.1)
+        self.assertEqual(first.result(timeout=3).exit_code, 0)
+        self.assertIsInstance(late.exception(timeout=3), DeadlineExpired)
+        self.assertEqual(pool.stats["expired"], 1)
+
+    def test_close_cancels_queued(self):
+        pool = ExecPool(max_workers=1, kill_grace_s=0.2)
+        first = pool.submit("sleep 5")
+        queued = pool.submit("echo later")
+        time.sleep(0.2)
+        pool.close()
+        self.assertTrue(queued.cancelled())
+        self.assertLess(first.result(timeout=3).duration_s, 3)
+        with self.assertRaises(RuntimeError):
+            pool.submit("true")
+
+
+class TestDaemonUsesPool(unittest.TestCase):
+    def test_trigger_result_reported_asynchronously(self):
+        spoken, logs = [], []
+        deps = types.SimpleNamespace(check_command_safety=lambda cmd, config, dry_run=False: (True, ""))
+        shell = types.SimpleNamespace(deps=deps, config={}, tts=object(), run_command_any=None)
+        h = DaemonHandlers(shell)
+        h.log = logs.append
+        h.speak_sink = spoken.append
+        h.exec_pool = ExecPool(max_workers=1)
+        self.addCleanup(h.close)
+        t0 = time.monotonic()
+        h.run_trigger("sleep 0.3; echo gotowe")
+        self.assertLess(time.monotonic() - t0, 0.2)
+        deadline = time.monotonic() + 3
+        while not spoken and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(spoken, ["gotowe"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ import unittest
 from pathlib import Path
 import importlib.util
 import importlib.machinery
+import itertools
 from unittest.mock import patch
 
 
@@ -25,6 +26,8 @@ class TestFunctional(unittest.TestCase):
     def setUpClass(cls):
         cls._tmp = tempfile.TemporaryDirectory(prefix="stts_tests_")
         cls.stts = _load_stts_module(cls._tmp.name)
+        # stts_core.config may already be imported (with the real config dir) by other test modules
+        cls.stts.CONFIG_DIR = Path(cls._tmp.name)
         cls.samples_dir = Path(__file__).resolve().parents[1] / "samples"
 
     @classmethod
@@ -132,6 +135,98 @@ class TestFunctional(unittest.TestCase):
             else:
                 os.environ["STTS_NLP2CMD_ENABLED"] = old_enabled
 
+    def test_nlp2cmd_translate_uses_cache(self):
+        stts = self.stts
+
+        old_enabled = os.environ.get("STTS_NLP2CMD_ENABLED")
+        os.environ["STTS_NLP2CMD_ENABLED"] = "1"
+        try:
+            fake = type("R", (), {"stdout": "$ docker ps\n", "stderr": "", "returncode": 0})()
+            with patch.object(stts._nlp2cmd_worker, "translate_once", return_value=None), \
+                    patch.object(stts.subprocess, "run", return_value=fake) as run:
+                self.assertEqual(stts.nlp2cmd_translate("uruchomione kontenery", config={}), "docker ps")
+                self.assertEqual(stts.nlp2cmd_translate("Uruchomione kontenery", config={}), "docker ps")
+                self.assertEqual(run.call_count, 1)
+            with patch.object(stts._nlp2cmd_worker, "translate_once", return_value=None), \
+                    patch.object(stts.subprocess, "run", return_value=fake) as run:
+                stts.nlp2cmd_translate("uruchomione kontenery 2", config={"nlp2cmd_cache": False})
+                stts.nlp2cmd_translate("uruchomione kontenery 2", config={"nlp2cmd_cache": False})
+                self.assertEqual(run.call_count, 2)
+            with patch.object(stts.subprocess, "run", return_value=fake) as run:
+                self.assertEqual(stts.nlp2cmd_translate("lista kontenerów", config={}), "docker ps")
+                self.assertEqual(run.call_count, 0)  # answered by the local intent tier
+        finally:
+            if old_enabled is None:
+                os.environ.pop("STTS_NLP2CMD_ENABLED", None)
+            else:
+                os.environ["STTS_NLP2CMD_ENABLED"] = old_enabled
+
+    def test_nlp2cmd_speculative_translation_is_recorded_on_commit(self):
+        stts = self.stts
+
+        counts = dict(stts._get_tier_audit().counts)
+        with patch.object(stts, "_nlp2cmd_translate_uncached", return_value="docker ps -a") as tr:
+            cmd, record = stts.nlp2cmd_translate_speculative("wszystkie kontenery teraz", config={})
+            self.assertEqual(cmd, "docker ps -a")
+            self.assertEqual(stts._get_tier_audit().counts, counts)
+            self.assertIsNone(stts._get_translation_cache({}).get("wszystkie kontenery teraz"))
+            record()
+            self.assertEqual(stts.nlp2cmd_translate("wszystkie kontenery teraz", config={}, force=True), "docker ps -a")
+            self.assertEqual(tr.call_count, 1)  # served from the cache entry written by record()
+        self.assertEqual(stts._get_tier_audit().counts.get("nlp2cmd", 0), counts.get("nlp2cmd", 0) + 1)
+
+    def test_nlp2cmd_force_prefers_socket_server(self):
+        stts = self.stts
+
+        resp = {"ok": True, "command": "du -sh .", "error": "", "confidence": 0.6}
+        with patch.object(stts._nlp2cmd_socket, "translate_via_socket", return_value=resp), \
+                patch.object(stts, "_start_nlp2cmd_workers") as start:
+            self.assertEqual(stts._nlp2cmd_translate_uncached("rozmiar katalogu", config={}, force=True), "du -sh .")
+            start.assert_not_called()
+        self.assertEqual(stts._TRANSLATION_META.info, {"via": "socket", "confidence": 0.6})
+        with patch.object(stts._nlp2cmd_socket, "server_available", return_value=True), \
+                patch.object(stts, "_start_nlp2cmd_workers") as start:
+            stts.nlp2cmd_prewarm({"nlp2cmd_parallel": True})
+            start.assert_not_called()
+
+    def test_nlp2cmd_prewarm_only_for_worker_paths(self):
+        stts = self.stts
+
+        with patch.dict(os.environ, {"STTS_NLP2CMD_ENABLED": "1", "STTS_NLP2CMD_PARALLEL": ""}):
+            self.assertFalse(stts._nlp2cmd_may_be_needed({}, []))
+            self.assertTrue(stts._nlp2cmd_may_be_needed({}, ["nlp2cmd", "-q", "{STT}"]))
+            self.assertTrue(stts._nlp2cmd_may_be_needed({"nlp2cmd_parallel": True}, []))
+
+    def test_nlp2cmd_translate_structured_json(self):
+        stts = self.stts
+
+        old_enabled = os.environ.get("STTS_NLP2CMD_ENABLED")
+        os.environ["STTS_NLP2CMD_ENABLED"] = "1"
+        try:
+            resp = {"ok": True, "command": "$ du -sh .", "confidence": 0.8, "elapsed_ms": 2.0, "error": ""}
+            with patch.object(stts._nlp2cmd_worker, "translate_once", return_value=resp), \
+                    patch.object(stts.subprocess, "run") as run:
+                self.assertEqual(stts.nlp2cmd_translate("rozmiar katalogu", config={"nlp2cmd_cache": False}), "du -sh .")
+                self.assertEqual(run.call_count, 0)
+            self.assertGreaterEqual(stts._get_tier_audit().counts.get("json", 0), 1)
+            resp = {"ok": False, "command": "", "error": "translator crashed"}
+            fake = type("R", (), {"stdout": "$ df -i\n", "stderr": "", "returncode": 0})()
+            with patch.object(stts._nlp2cmd_worker, "translate_once", return_value=resp), \
+                    patch.object(stts.subprocess, "run", return_value=fake) as run:
+                self.assertEqual(stts.nlp2cmd_translate("wolne inody", config={"nlp2cmd_cache": False}), "df -i")
+                self.assertEqual(run.call_count, 1)
+                self.assertLessEqual(run.call_args.kwargs["timeout"], 60.0)
+            with patch.object(stts._nlp2cmd_worker, "translate_once", return_value=None), \
+                    patch.object(stts.time, "monotonic", side_effect=itertools.chain([0.0], itertools.repeat(60.0))), \
+                    patch.object(stts.subprocess, "run") as run:
+                self.assertIsNone(stts._nlp2cmd_translate_uncached("bla bla", config={}))
+                self.assertEqual(run.call_count, 0)  # the one-shot call used up the shared budget
+        finally:
+            if old_enabled is None:
+                os.environ.pop("STTS_NLP2CMD_ENABLED", None)
+            else:
+                os.environ["STTS_NLP2CMD_ENABLED"] = old_enabled
+
     def test_looks_like_natural_language_heuristic(self):
         stts = self.stts
         self.assertTrue(stts._looks_like_natural_language("lista folderów"))
@@ -139,6 +234,13 @@ class TestFunctional(unittest.TestCase):
         self.assertFalse(stts._looks_like_natural_language("/bin/ls -la"))
         self.assertFalse(stts._looks_like_natural_language("./script.sh"))
 
+    def test_parameterized_trigger_specs(self):
+        stts = self.stts
+        self.assertEqual(stts._parse_trigger_spec(r"/(?P<a>\w+) (?P=a)/=echo {a}"), (r"(?P<a>\w+) (?P=a)", "echo {a}", True))
+        rules = stts.load_triggers([r"/^pokaż log (?P<unit>[\w.@-]+)/=journalctl -u {unit} -n 50", "/x/=echo {nope}"])
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(stts.match_trigger("pokaż log nginx.service", rules), "journalctl -u nginx.service -n 50")
+
 
 if __name__ == "__main__":
     unittest.main()
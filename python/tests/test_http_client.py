@@ -0,0 +1,87 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from stts_core.http_client import HTTPClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    ports = []
+
+    def log_message(self, *_args):
+        return None
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        _Handler.ports.append(self.client_address[1])
+        if self.path == "/flaky":
+            self.server.flaky_hits += 1
+            if self.server.flaky_hits < 2:
+                self._send(503, {"status": "busy"})
+                return
+        self._send(200, {"status": "healthy"})
+
+    def do_POST(self):
+        _Handler.ports.append(self.client_address[1])
+        n = int(self.headers.get("Content-Length") or 0)
+        data = json.loads(self.rfile.read(n).decode("utf-8") or "{}")
+        self._send(200, {"echo": data})
+
+
+class TestHTTPClient(unittest.TestCase):
+    def setUp(self):
+        _Handler.ports = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.flaky_hits = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client = HTTPClient(max_per_host=2, retries=2, backoff_s=0.0)
+
+    def tearDown(self):
+        self.client.close()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def test_keep_alive_reuses_connection(self):
+        for _ in range(3):
+            resp = self.client.get(self.base + "/health", timeout=2)
+            self.assertEqual(resp.json(), {"status": "healthy"})
+
+        self.assertEqual(len(set(_Handler.ports)), 1)
+        snap = self.client.metrics.snapshot()
+        self.assertEqual(snap["requests"], 3)
+        self.assertEqual(snap["connects"], 1)
+        self.assertEqual(snap["reused"], 2)
+
+    def test_post_json_roundtrip(self):
+        resp = self.client.post_json(self.base + "/query", {"query": "ls"}, timeout=2)
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.json(), {"echo": {"query": "ls"}})
+
+    def test_idempotent_request_retries_on_503(self):
+        resp = self.client.get(self.base + "/flaky", timeout=2)
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.attempts, 2)
+
+    def test_connection_refused_raises_after_retries(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        with self.assertRaises(OSError):
+            self.client.get(self.base + "/health", timeout=1)
+        self.assertEqual(self.client.metrics.snapshot()["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import types
+import unittest
+
+from stts_core.daemon_handlers import DaemonHandlers
+from stts_core.intents import IntentEngine, TierAudit, build_intent_engine, load_intents, parse_intent
+
+
+class TestIntentEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = build_intent_engine({"intent_threshold": 0.85})
+
+    def test_exact_match_is_normalized(self):
+        m = self.engine.match("Pokaz pliki!")
+        self.assertEqual((m.command, m.tier, m.confidence), ("ls -la", "exact", 1.0))
+        self.assertEqual(self.engine.match("lista kontenerów").command, "docker ps")
+
+    def test_slots_take_one_shell_quoted_token(self):
+        engine = IntentEngine(load_intents(["pokaż plik {file}=cat {file}", "ping {host}=ping -c 4 {host}"]))
+        m = engine.match("pokaż plik Raport.txt")
+        self.assertEqual((m.tier, m.slots, m.command, m.confidence), ("slot", {"file": "Raport.txt"}, "cat Raport.txt", 0.95))
+        self.assertEqual(engine.match("pokaż plik $HOME;reboot").command, "cat '$HOME;reboot'")
+        self.assertIsNone(engine.match("pokaż plik konfiguracyjny nginxa"))
+        self.assertIsNone(engine.match("ping do serwera google"))
+        self.assertIsNone(engine.match("ping example.com; rm -rf ~"))
+        self.assertIsNone(self.engine.match("pokaż pliki w katalogu domowym"))  # no slot intents by default
+
+    def test_slot_match_is_scored(self):
+        engine = IntentEngine(load_intents(["pokaż plik {file}=cat {file}"]))
+        m = engine.match("pokasz plik a.txt")
+        self.assertEqual(m.command, "cat a.txt")
+        self.assertLess(m.confidence, 0.95)
+        strict = IntentEngine(load_intents(["pokaż plik {file}=cat {file}"]), threshold=0.96)
+        self.assertIsNone(strict.match("pokaż plik a.txt"))
+
+    def test_fuzzy_match_respects_threshold(self):
+        m = self.engine.match("pokaż plikki")
+        self.assertEqual((m.command, m.tier), ("ls -la", "fuzzy"))
+        self.assertLess(m.confidence, 1.0)
+        self.assertIsNone(IntentEngine(load_intents(["pokaż pliki=ls -la"]), threshold=0.99).match("pokaż plikki"))
+        self.assertIsNone(self.engine.match("zamów pizzę na wieczór"))
+
+    def test_fuzzy_match_is_per_token(self):
+        engine = IntentEngine(load_intents([
+            "start nginx=systemctl start nginx",
+            "zatrzymaj kontener {name}=docker stop {name}",
+            "zatrzymaj wszystko=docker stop -a",
+        ]))
+        self.assertEqual(engine.match("startt nginx").command, "systemctl start nginx")
+        self.assertIsNone(engine.match("restart nginx"))  # different verb, whole-string ratio 0.92
+        self.assertIsNone(engine.match("zatrzymaj kontener"))  # slot value missing
+        engine = IntentEngine(load_intents(["pokaż pliki=ls -la", "pokaż plik {file}=cat {file}"]))
+        self.assertIsNone(engine.match("pokaż plik"))
+        self.assertEqual(self.engine.match("pokasz pliki").command, "ls -la")
+
+    def test_user_file_and_validation(self):
+        self.assertIsNone(parse_intent("restartuj {svc}=systemctl restart {unit}"))
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "intents.txt")
+            with open(p, "w", encoding="utf-8") as f:
+                f.write("# własne\nrestartuj {svc}=systemctl --user restart {svc}\nzła linia\n")
+            engine = build_intent_engine({}, default_file=p)
+            self.assertEqual(engine.match("restartuj nginx").command, "systemctl --user restart nginx")
+            self.assertIsNone(build_intent_engine({"intents_enabled": False}))
+
+    def test_tier_audit_log(self):
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "audit.jsonl")
+            audit = TierAudit(p)
+            audit.record("intent", "pokaż pliki", "ls -la", 1.0)
+            audit.record("nlp2cmd", "coś", None)
+            self.assertEqual(audit.counts, {"intent": 1, "nlp2cmd": 1})
+            audit.close()
+            with open(p, encoding="utf-8") as f:
+                rows = [json.loads(l) for l in f]
+            self.assertEqual([r["tier"] for r in rows], ["intent", "nlp2cmd"])
+
+
+class TestDaemonLocalTiers(unittest.TestCase):
+    def _handlers(self, config, client_execute):
+        engine = build_intent_engine({})
+        deps = types.SimpleNamespace(get_intent_engine=lambda cfg: engine)
+        h = DaemonHandlers(types.SimpleNamespace(deps=deps, config=config, tts=None))
+        h.log = lambda msg: None
+        h.client = types.SimpleNamespace(execute=client_execute)
+        return h
+
+    def test_local_tiers_answer_by_default(self):
+        h = self._handlers({}, client_execute=True)
+        self.assertEqual(h._local_result("pokaż pliki")["command"], "ls -la")
+
+    def test_service_execution_bypasses_local_tiers(self):
+        h = self._handlers({"daemon_local_tier_exec": "service"}, client_execute=True)
+        self.assertIsNone(h._local_result("pokaż pliki"))
+        # hedged (translation-only) clients execute locally anyway
+        h = self._handlers({"daemon_local_tier_exec": "service"}, client_execute=False)
+        self.assertEqual(h._local_result("pokaż pliki")["command"], "ls -la")
+
+
+if __name__ == "__main__":
+    unittest.main()
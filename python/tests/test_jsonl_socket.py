@@ -0,0 +1,50 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from stts_core.jsonl_socket import JsonLinesHandler, JsonLinesServer, call
+
+
+class _Echo(JsonLinesHandler):
+    def handle_request(self, req):
+        self.send({"op": req.get("op"), "echo": req})
+
+
+class TestJsonLinesSocket(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="stts_jsonl_")
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "s.sock")
+
+    def _serve(self):
+        srv = JsonLinesServer(self.path, _Echo, in_use_message="echo running")
+        threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return srv
+
+    def test_call_roundtrip_and_socket_lifecycle(self):
+        srv = self._serve()
+        try:
+            self.assertEqual(call(self.path, {"op": "x", "n": 1}, timeout_s=2.0)["echo"], {"op": "x", "n": 1})
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+            with self.assertRaisesRegex(OSError, "echo running"):
+                JsonLinesServer(self.path, _Echo, in_use_message="echo running")
+        finally:
+            srv.shutdown()
+            srv.server_close()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(call(self.path, {"op": "ping"}, timeout_s=0.2))
+
+    def test_stale_socket_file_is_replaced(self):
+        srv = JsonLinesServer(self.path, _Echo)
+        srv.socket.close()  # dead server: the file stays behind
+        srv = self._serve()
+        try:
+            self.assertIsNotNone(call(self.path, {"op": "ping"}, timeout_s=2.0))
+        finally:
+            srv.shutdown()
+            srv.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
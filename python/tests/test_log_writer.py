@@ -0,0 +1,72 @@
+import io
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from stts_core.log_writer import BufferedFileWriter, DaemonLogger
+
+
+class TestBufferedFileWriter(unittest.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.path = Path(td.name) / "logs" / "daemon.log"
+
+    def test_batches_and_flushes(self):
+        w = BufferedFileWriter(str(self.path), flush_interval_s=60, batch=1000)
+        for i in range(10):
+            w.write_line(f"line {i}")
+        w.flush()
+        self.assertEqual(self.path.read_text().splitlines(), [f"line {i}" for i in range(10)])
+        self.assertEqual((w.stats["lines"], w.stats["flushes"]), (10, 1))
+        w.close()
+        w.write_line("after close")
+        self.assertNotIn("after close", self.path.read_text())
+
+    def test_rotates_by_size(self):
+        w = BufferedFileWriter(str(self.path), max_bytes=20, backups=2, batch=1)
+        for i in range(5):
+            w.write_line(f"line-{i}-0123456789")
+        w.close()
+        # 18 bytes per line: every second line crosses the limit
+        self.assertEqual(w.stats["rotations"], 2)
+        self.assertEqual(self.path.read_text(), "line-4-0123456789\n")
+        self.assertEqual(Path(f"{self.path}.1").read_text().splitlines(), ["line-2-0123456789", "line-3-0123456789"])
+        self.assertEqual(Path(f"{self.path}.2").read_text().splitlines(), ["line-0-0123456789", "line-1-0123456789"])
+        self.assertFalse(Path(f"{self.path}.3").exists())
+
+class TestDaemonLogger(unittest.TestCase):
+    def test_json_lines_with_context(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "d.log"
+            err = io.StringIO()
+            log = DaemonLogger(str(path), json_lines=True, stream=err)
+            with log.context(utt=7, device="hw:1,0"):
+                log.log("📝 Heard: hejken")
+                log.event("stage", stage="stt", ms=12.5)
+            t = threading.Thread(target=log.log, args=("other thread",))
+            t.start()
+            t.join()
+            log.close()
+            recs = [json.loads(l) for l in path.read_text(encoding="utf-8").splitlines()]
+        self.assertRegex(err.getvalue(), r"^\[\d\d:\d\d:\d\d\] 📝 Heard: hejken\n")
+        self.assertEqual((recs[0]["event"], recs[0]["msg"], recs[0]["utt"]), ("log", "📝 Heard: hejken", 7))
+        self.assertEqual((recs[1]["event"], recs[1]["stage"], recs[1]["ms"], recs[1]["device"]), ("stage", "stt", 12.5, "hw:1,0"))
+        self.assertNotIn("utt", recs[2])
+
+    def test_text_mode_skips_events(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "d.log"
+            log = DaemonLogger(str(path), stream=io.StringIO())
+            log.log("hello")
+            log.event("stage", stage="stt", ms=1.0)
+            log.close()
+            lines = path.read_text().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertRegex(lines[0], r"^\[\d\d:\d\d:\d\d\] hello$")
+
+
+if __name__ == "__main__":
+    unittest.main()
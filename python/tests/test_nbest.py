@@ -0,0 +1,63 @@
+import threading
+import time
+import unittest
+
+from stts_core.nbest import hypotheses_for, translate_nbest
+from stts_core.providers import Transcript
+
+
+class TestNBestTranslation(unittest.TestCase):
+    def test_prefers_best_ranked_success(self):
+        table = {"pokaż pliki": "ls", "pokasz pliki": "ls -la"}
+        hyp, cmd = translate_nbest(table.get, ["pokaż pliki", "pokasz pliki"])
+        self.assertEqual((hyp, cmd), ("pokaż pliki", "ls"))
+
+    def test_falls_back_to_alternative_concurrently(self):
+        def translate(t):
+            time.sleep(0.3)
+            return "docker ps" if t == "lista kontenerów" else None
+
+        t0 = time.monotonic()
+        hyp, cmd = translate_nbest(translate, ["lista kontener", "lista kontenerów", "lista konte"])
+        self.assertEqual((hyp, cmd), ("lista kontenerów", "docker ps"))
+        self.assertLess(time.monotonic() - t0, 0.8)
+
+    def test_slow_alternatives_are_abandoned(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def translate(t):
+            if t != "git status":
+                release.wait(10)
+            return "git status" if t == "git status" else None
+
+        t0 = time.monotonic()
+        self.assertEqual(translate_nbest(translate, ["git status", "kit status"]), ("git status", "git status"))
+        self.assertLess(time.monotonic() - t0, 1.0)
+        stragglers = [t for t in threading.enumerate() if t.name == "stts-nbest" and t.is_alive()]
+        self.assertTrue(stragglers)
+        self.assertTrue(all(t.daemon for t in stragglers))  # never joined at interpreter exit
+
+    def test_rejects_dangerous_alternative(self):
+        table = {"a": "rm -rf /", "b": "ls /"}
+        self.assertEqual(translate_nbest(table.get, ["a", "b"]), ("b", "ls /"))
+        self.assertEqual(translate_nbest(table.get, ["a"]), ("a", "rm -rf /"))
+
+    def test_hypotheses_from_transcript(self):
+        tr = Transcript(text="git status", alternatives=[("git status", 9.0), ("git statusy", 7.0), ("kit status", 5.0)])
+        shell = type("S", (), {"last_transcript": tr})()
+        self.assertEqual(hypotheses_for(shell, "git status", {"stt_nbest": 2}), ["git status", "git statusy"])
+        self.assertEqual(hypotheses_for(shell, "git status", {"stt_nbest": 1}), ["git status"])
+        self.assertEqual(hypotheses_for(shell, "inny tekst", {"stt_nbest": 3}), ["inny tekst"])
+
+    def test_vosk_alternatives_parsing(self):
+        from stts_core.providers.stt.vosk import VoskSTT
+
+        fj = '{"alternatives": [{"confidence": 210.5, "text": "git status", "result": [{"word": "git"}]},' \
+             ' {"confidence": 200.1, "text": "kit status"}]}'
+        self.assertEqual(VoskSTT._parse_alternatives(fj), [("git status", 210.5), ("kit status", 200.1)])
+        self.assertEqual([w.word for w in VoskSTT._parse_words(fj)], ["git"])
+
+
+if __name__ == "__main__":
+    unittest.main()
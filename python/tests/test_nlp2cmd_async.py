@@ -0,0 +1,116 @@
+import threading
+import time
+import unittest
+
+from stts_core.nlp2cmd_async import AsyncNLP2CMDClient, CircuitBreaker
+
+
+class FakeService:
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.calls = []
+        self.healthy = {}
+        self.lock = threading.Lock()
+
+    def query(self, query, url, execute, timeout):
+        with self.lock:
+            self.calls.append((url, execute))
+        time.sleep(self.delays.get(url, 0.0))
+        if url in self.fail:
+            return None
+        return {"success": True, "command": f"echo {url}"}
+
+    def health(self, url, timeout=2.5):
+        return self.healthy.get(url, True)
+
+
+def make_client(svc, urls, **kw):
+    kw.setdefault("hedge_delay_s", 0.1)
+    kw.setdefault("health_interval_s", 0)
+    return AsyncNLP2CMDClient(urls, timeout_s=2.0, query_fn=svc.query, health_fn=svc.health, **kw)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_open_half_open_close(self):
+        now = [0.0]
+        br = CircuitBreaker(failure_threshold=2, reset_s=10.0, clock=lambda: now[0])
+        br.record_failure()
+        self.assertTrue(br.allow())
+        br.record_failure()
+        self.assertEqual(br.state, "open")
+        self.assertFalse(br.allow())
+        now[0] = 11.0
+        self.assertTrue(br.allow())
+        self.assertFalse(br.allow())  # a single probe in half-open
+        br.record_failure()
+        self.assertEqual(br.state, "open")
+        now[0] = 22.0
+        self.assertTrue(br.allow())
+        br.record_success()
+        self.assertEqual(br.state, "closed")
+
+
+class TestAsyncNLP2CMDClient(unittest.TestCase):
+    def test_submit_does_not_block(self):
+        svc = FakeService(delays={"http://a": 0.4})
+        client = make_client(svc, ["http://a"])
+        try:
+            t0 = time.monotonic()
+            fut = client.submit("shell: ls")
+            self.assertLess(time.monotonic() - t0, 0.2)
+            self.assertEqual(client.pending(), 1)
+            self.assertEqual(fut.result(timeout=2.0)["command"], "echo http://a")
+            self.assertEqual(svc.calls, [("http://a", True)])
+        finally:
+            client.close()
+
+    def test_hedged_request_wins_and_is_translation_only(self):
+        svc = FakeService(delays={"http://slow": 1.0})
+        client = make_client(svc, ["http://slow", "http://fast"])
+        try:
+            t0 = time.monotonic()
+            data = client.query("shell: ls")
+            self.assertLess(time.monotonic() - t0, 0.8)
+            self.assertEqual(data["command"], "echo http://fast")
+            self.assertEqual(client.stats["hedged"], 1)
+            self.assertEqual(client.stats["hedge_wins"], 1)
+            self.assertTrue(all(execute is False for _, execute in svc.calls))
+        finally:
+            client.close()
+
+    def test_failover_and_circuit_breaker(self):
+        svc = FakeService(fail=["http://bad"])
+        client = make_client(svc, ["http://bad", "http://good"], hedge_delay_s=0, breaker_failures=2)
+        try:
+            for _ in range(3):
+                self.assertEqual(client.query("q")["command"], "echo http://good")
+            self.assertEqual(client.breakers["http://bad"].state, "open")
+            self.assertEqual([u for u, _ in svc.calls].count("http://bad"), 2)
+            self.assertEqual(client.stats["breaker_skips"], 1)
+        finally:
+            client.close()
+
+    def test_cancel_and_health(self):
+        svc = FakeService(delays={"http://a": 1.0})
+        svc.healthy = {"http://a": False, "http://b": True}
+        client = make_client(svc, ["http://a", "http://b"])
+        try:
+            self.assertTrue(client.check_health())
+            self.assertEqual(client.health, {"http://a": False, "http://b": True})
+            self.assertEqual(client._candidates()[0], "http://b")
+            svc.delays["http://b"] = 1.0
+            fut = client.submit("q")
+            time.sleep(0.05)
+            self.assertEqual(client.cancel_all(), 1)
+            self.assertTrue(fut.cancelled())
+            time.sleep(0.05)
+            self.assertEqual(client.stats["cancelled"], 1)
+        finally:
+            client.close()
+        self.assertTrue(client._loop.is_closed())
+        client.close()  # idempotent
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from stts_core.nlp2cmd_socket import (
+    NLP2CMDSocketClient,
+    NLP2CMDSocketServer,
+    ensure_server,
+    server_available,
+    translate_via_socket,
+)
+from stts_core.nlp2cmd_worker import NLP2CMDWorkerPool
+
+FAKE_WORKER = """
+import sys, json, time
+sys.stdout.write(json.dumps({'ready': True, 'error': None}) + '\\n')
+sys.stdout.flush()
+for line in sys.stdin:
+    req = json.loads(line)
+    text = req['text']
+    if text.startswith('sleep:'):
+        time.sleep(float(text.split(':', 1)[1]))
+    sys.stdout.write(json.dumps({'id': req['id'], 'ok': True, 'command': 'echo ' + text, 'error': '', 'confidence': 0.75}) + '\\n')
+    sys.stdout.flush()
+"""
+
+BROKEN_WORKER = """
+import sys, json
+sys.stdout.write(json.dumps({'ready': False, 'error': 'No module named nlp2cmd'}) + '\\n')
+sys.stdout.flush()
+for line in sys.stdin:
+    req = json.loads(line)
+    sys.stdout.write(json.dumps({'id': req['id'], 'ok': False, 'command': '', 'error': 'No module named nlp2cmd'}) + '\\n')
+    sys.stdout.flush()
+"""
+
+
+class TestNLP2CMDSocketServer(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="stts_sock_")
+        self.path = os.path.join(self._tmp.name, "nlp2cmd.sock")
+        self.pool = NLP2CMDWorkerPool(sys.executable, size=2, code=FAKE_WORKER)
+        self.assertTrue(self.pool.wait_ready(10.0))
+
+    def tearDown(self):
+        self.pool.close()
+        self._tmp.cleanup()
+
+    def _serve(self, idle_timeout_s=0.0):
+        srv = NLP2CMDSocketServer(self.path, self.pool, idle_timeout_s=idle_timeout_s)
+        t = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        t.start()
+        return srv, t
+
+    def test_shared_translator_across_clients(self):
+        srv, t = self._serve()
+        try:
+            self.assertTrue(NLP2CMDSocketClient(self.path).ping()["ready"])
+            resp = translate_via_socket(self.path, "pokaż pliki")
+            self.assertEqual((resp["ok"], resp["command"], resp["confidence"]), (True, "echo pokaż pliki", 0.75))
+            results = {}
+
+            def call(text):
+                results[text] = NLP2CMDSocketClient(self.path).translate(text)["command"]
+
+            threads = [threading.Thread(target=call, args=(x,)) for x in ("sleep:0.3", "a", "b")]
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join(5.0)
+            self.assertEqual(results, {"sleep:0.3": "echo sleep:0.3", "a": "echo a", "b": "echo b"})
+            self.assertTrue(NLP2CMDSocketClient(self.path).shutdown())
+            t.join(3.0)
+            self.assertFalse(t.is_alive())
+        finally:
+            srv.server_close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_idle_shutdown_and_missing_server(self):
+        srv, t = self._serve(idle_timeout_s=0.3)
+        t.join(5.0)
+        self.assertFalse(t.is_alive())
+        srv.server_close()
+        self.assertIsNone(translate_via_socket(self.path, "x"))
+        self.assertIsNone(NLP2CMDSocketClient(self.path).ping(timeout_s=0.2))
+
+    def test_workers_without_nlp2cmd_are_reported(self):
+        self.pool.close()
+        self.pool = NLP2CMDWorkerPool(sys.executable, size=2, code=BROKEN_WORKER)
+        self.assertFalse(self.pool.wait_ready(10.0))
+        srv, t = self._serve()
+        try:
+            st = NLP2CMDSocketClient(self.path).ping()
+            self.assertEqual((st["ready"], st["error"]), (False, "No module named nlp2cmd"))
+            self.assertFalse(NLP2CMDSocketClient(self.path).translate("x")["ready"])
+            self.assertIsNone(translate_via_socket(self.path, "x"))  # caller falls back
+            self.assertFalse(server_available(self.path))
+            t0 = time.monotonic()
+            self.assertFalse(ensure_server(self.path, sys.executable, wait_s=10.0))
+            self.assertLess(time.monotonic() - t0, 2.0)
+        finally:
+            srv.shutdown()
+            srv.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import random
+import unittest
+
+from stts_core.nlp2cmd_client import nlp2cmd_service_health, nlp2cmd_service_query
+from stts_core.nlp2cmd_loadtest import _Deps, percentile, run_load
+from stts_core.nlp2cmd_standin import StandInService, parse_latency
+
+
+class TestStandInService(unittest.TestCase):
+    def test_latency_specs(self):
+        self.assertEqual(parse_latency("fixed:20")(), 0.02)
+        sample = parse_latency("uniform:10:20", random.Random(1))
+        self.assertTrue(all(0.01 <= sample() <= 0.02 for _ in range(50)))
+        self.assertGreater(parse_latency("lognormal:40:0.5", random.Random(1))(), 0.0)
+        with self.assertRaises(ValueError):
+            parse_latency("pareto:1")
+
+    def test_endpoints_and_error_injection(self):
+        svc = StandInService(translations={"zrób kopię": "tar czf backup.tgz ."}).start()
+        try:
+            self.assertTrue(nlp2cmd_service_health(svc.url, timeout=2.0))
+            data = nlp2cmd_service_query("shell: zrób kopię", url=svc.url, timeout=2.0)
+            self.assertEqual((data["success"], data["command"]), (True, "tar czf backup.tgz ."))
+            self.assertEqual(nlp2cmd_service_query("shell: pokaż pliki", url=svc.url, timeout=2.0)["command"], "ls -la")
+            self.assertEqual(nlp2cmd_service_query("shell: cokolwiek", url=svc.url, timeout=2.0)["command"], "echo cokolwiek")
+            self.assertEqual(svc.translate("shell: a; rm -rf ~"), "echo 'a; rm -rf ~'")
+            svc.error_rate = 1.0
+            self.assertIsNone(nlp2cmd_service_query("shell: x", url=svc.url, timeout=2.0))
+            svc.healthy = False
+            self.assertFalse(nlp2cmd_service_health(svc.url, timeout=2.0))
+            self.assertEqual(svc.stats["errors"], 1)
+        finally:
+            svc.stop()
+
+
+class TestLoadDriver(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        vals = list(range(1, 101))
+        self.assertEqual((percentile(vals, 50), percentile(vals, 95), percentile(vals, 99)), (50.0, 95.0, 99.0))
+        self.assertEqual(percentile([], 99), 0.0)
+
+    def test_replay_reports_stage_percentiles(self):
+        svc = StandInService(latency="fixed:5").start()
+        try:
+            rep = run_load(svc.url, ["pokaż pliki", "coś innego"], requests=20, concurrency=4, timeout_s=5.0)
+        finally:
+            svc.stop()
+        self.assertEqual((rep["requests"], rep["failed"]), (20, 0))
+        total = rep["stages"]["total"]
+        self.assertEqual(total["n"], 20)
+        self.assertGreaterEqual(total["p50_ms"], 5.0)
+        self.assertLessEqual(total["p50_ms"], total["p95_ms"])
+        self.assertLessEqual(total["p95_ms"], total["p99_ms"])
+        self.assertEqual(rep["stages"]["execute"]["n"], 20)
+
+    def test_execute_mode_applies_safety_checks(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(_Deps(False, execute_cmd=True).check_command_safety("rm -rf /", {}), (False, "dangerous"))
+        self.assertTrue(_Deps(False, execute_cmd=True).check_command_safety("ls -la", {})[0])
+        self.assertTrue(_Deps(False).check_command_safety("rm -rf /", {})[0])  # never executed
+
+
+if __name__ == "__main__":
+    unittest.main()
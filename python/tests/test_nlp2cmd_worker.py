@@ -0,0 +1,91 @@
+import sys
+import time
+import unittest
+
+from stts_core.nlp2cmd_worker import NLP2CMDWorkerPool, translate_once
+
+# Stand-in worker speaking the same JSON-lines protocol as WORKER_CODE.
+FAKE_WORKER = """
+import sys, json, time, os
+sys.stdout.write(json.dumps({'ready': True, 'error': None}) + '\\n')
+sys.stdout.flush()
+for line in sys.stdin:
+    req = json.loads(line)
+    text = req['text']
+    if text.startswith('sleep:'):
+        time.sleep(float(text.split(':', 1)[1]))
+    if text == 'exit':
+        os._exit(3)
+    cmd = '' if text == 'none' else 'echo ' + text
+    sys.stdout.write(json.dumps({'id': req['id'], 'ok': bool(cmd), 'command': cmd, 'error': ''}) + '\\n')
+    sys.stdout.flush()
+"""
+
+
+class TestNLP2CMDWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = NLP2CMDWorkerPool(sys.executable, size=2, default_timeout_s=5.0, code=FAKE_WORKER,
+                                      health_interval_s=0.05)
+        self.assertTrue(self.pool.wait_ready(10.0))
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_translate_and_pipelining(self):
+        self.assertEqual(self.pool.translate("ls"), "echo ls")
+        self.assertIsNone(self.pool.translate("none"))
+        out = self.pool.translate_many(["a", "b", "c", "d"])
+        self.assertEqual(out, ["echo a", "echo b", "echo c", "echo d"])
+
+    def test_out_of_order_across_workers(self):
+        slow = self.pool.submit("sleep:0.8")
+        fast = self.pool.submit("fast")
+        self.assertEqual(fast.result(timeout=3.0), "echo fast")
+        self.assertFalse(slow.done())
+        self.assertEqual(slow.result(timeout=3.0), "echo sleep:0.8")
+
+    def test_deadline_and_respawn(self):
+        t0 = time.monotonic()
+        self.assertIsNone(self.pool.translate("sleep:30", timeout_s=0.3))
+        self.assertLess(time.monotonic() - t0, 3.0)
+        self.assertGreaterEqual(self.pool.stats["timeouts"], 1)
+        self.assertGreaterEqual(self.pool.stats["respawns"], 1)
+        self.assertEqual(self.pool.translate("ok"), "echo ok")
+
+    def test_exited_worker_is_respawned(self):
+        self.assertIsNone(self.pool.translate("exit", timeout_s=3.0))
+        self.assertTrue(self.pool.wait_ready(10.0))
+        self.assertEqual(self.pool.translate("after"), "echo after")
+        self.assertGreaterEqual(self.pool.stats["respawns"], 1)
+
+    def test_warm_up_reaches_every_worker(self):
+        self.assertTrue(self.pool.warm_up("rozgrzewka", timeout_s=5.0))
+        self.assertGreaterEqual(self.pool.stats["completed"], 2)
+
+
+class TestTranslateOnce(unittest.TestCase):
+    def test_one_shot_json_protocol(self):
+        resp = translate_once(sys.executable, "ls", timeout_s=10.0, code=FAKE_WORKER)
+        self.assertEqual((resp["ok"], resp["command"]), (True, "echo ls"))
+        self.assertFalse(translate_once(sys.executable, "none", timeout_s=10.0, code=FAKE_WORKER)["ok"])
+
+    def test_none_when_protocol_unavailable(self):
+        self.assertIsNone(translate_once(sys.executable, "ls", timeout_s=10.0, code="print('Usage: nlp2cmd')"))
+
+
+class TestNLP2CMDWorkerPoolUnavailable(unittest.TestCase):
+    def test_wait_ready_false_when_nlp2cmd_missing(self):
+        code = "import sys, json\nsys.stdout.write(json.dumps({'ready': False, 'error': 'no nlp2cmd'}) + '\\n')\n" \
+               "sys.stdout.flush()\nfor line in sys.stdin:\n    pass\n"
+        pool = NLP2CMDWorkerPool(sys.executable, size=1, code=code)
+        try:
+            t0 = time.monotonic()
+            self.assertFalse(pool.wait_ready(10.0))
+            self.assertLess(time.monotonic() - t0, 5.0)
+            self.assertFalse(pool.warm_up(timeout_s=1.0))
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
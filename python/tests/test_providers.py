@@ -119,6 +119,75 @@ class TestSTTProviders(unittest.TestCase):
             os.environ.pop("STTS_MOCK_STT", None)
 
 
+class TestEngineReuse(unittest.TestCase):
+    """Engine handles are created once per provider and recreated after errors."""
+
+    def _write_wav(self, path: Path, rate: int = 16000) -> None:
+        import wave
+
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            wf.writeframes(b"\x00\x00" * 160)
+
+    def test_picovoice_reuses_leopard_handle(self):
+        import sys
+        import types
+        from unittest.mock import MagicMock, patch
+
+        from stts_core.providers.stt.picovoice import PicovoiceSTT
+
+        leopard = MagicMock()
+        leopard.sample_rate = 16000
+        leopard.process.return_value = ("ls", [])
+        fake = types.ModuleType("pvleopard")
+        fake.create = MagicMock(return_value=leopard)
+
+        with tempfile.TemporaryDirectory(prefix="stts_pv_") as td, \
+                patch.dict(sys.modules, {"pvleopard": fake}), \
+                patch.dict(os.environ, {"PICOVOICE_ACCESS_KEY": "k"}):
+            wav = Path(td) / "a.wav"
+            self._write_wav(wav)
+            stt = PicovoiceSTT(language="en")
+            self.assertEqual(stt.transcribe(str(wav)), "ls")
+            self.assertEqual(stt.transcribe(str(wav)), "ls")
+            self.assertEqual(fake.create.call_count, 1)
+            self.assertEqual(leopard.process.call_count, 2)
+            leopard.process_file.assert_not_called()
+
+            leopard.process.side_effect = RuntimeError("boom")
+            self.assertEqual(stt.transcribe(str(wav)), "")
+            leopard.delete.assert_called_once()
+            leopard.process.side_effect = None
+            self.assertEqual(stt.transcribe(str(wav)), "ls")
+            self.assertEqual(fake.create.call_count, 2)
+
+    def test_coqui_loads_model_once(self):
+        import sys
+        import types
+        from unittest.mock import MagicMock, patch
+
+        from stts_core.providers.stt.coqui import CoquiSTT
+
+        model = MagicMock()
+        model.sampleRate.return_value = 16000
+        model.stt.return_value = "pwd"
+        fake = types.ModuleType("stt")
+        fake.Model = MagicMock(return_value=model)
+
+        with tempfile.TemporaryDirectory(prefix="stts_coqui_") as td, \
+                patch.dict(sys.modules, {"stt": fake}):
+            wav = Path(td) / "a.wav"
+            self._write_wav(wav)
+            model_file = Path(td) / "model.tflite"
+            model_file.write_bytes(b"")
+            stt = CoquiSTT(model=str(model_file), language="en")
+            self.assertEqual(stt.transcribe(str(wav)), "pwd")
+            self.assertEqual(stt.transcribe(str(wav)), "pwd")
+            self.assertEqual(fake.Model.call_count, 1)
+
+
 class TestTTSProviders(unittest.TestCase):
     """Test TTS provider classes."""
 
@@ -200,5 +269,78 @@ class TestProviderDetection(unittest.TestCase):
             self.assertEqual(len(result), 2, f"{name} is_available should return 2 elements")
 
 
+class TestTranscript(unittest.TestCase):
+    """Structured STT results (Transcript)."""
+
+    def test_non_speech_detection(self):
+        from stts_core.providers import Transcript
+
+        self.assertTrue(Transcript(text="[MUZYKA]").is_non_speech())
+        self.assertTrue(Transcript(text="(music) [BLANK_AUDIO]").is_non_speech())
+        self.assertTrue(Transcript(text="ls", no_speech_prob=0.9).is_non_speech(0.6))
+        self.assertFalse(Transcript(text="pokaż [plik]").is_non_speech())
+        self.assertFalse(Transcript(text="ls -la", no_speech_prob=0.1).is_non_speech())
+
+    def test_transcribe_detailed_timing(self):
+        import wave
+
+        from stts_core.providers import STTProvider, Word
+
+        class _P(STTProvider):
+            name = "p"
+
+            def transcribe(self, audio_path):
+                self._set_details(words=[Word("ls", 0.0, 0.3, 0.8), Word("-la", 0.3, 0.6, 0.6)])
+                return "ls -la"
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "a.wav")
+            with wave.open(path, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(16000)
+                wf.writeframes(b"\x00\x00" * 8000)
+            tr = _P(model="m").transcribe_detailed(path)
+        self.assertEqual(tr.text, "ls -la")
+        self.assertAlmostEqual(tr.audio_s, 0.5)
+        self.assertAlmostEqual(tr.confidence, 0.7)
+        self.assertEqual(tr.summary()["words"], 2)
+        self.assertIsNotNone(tr.rtf)
+
+    def test_vosk_word_parsing(self):
+        from stts_core.providers.stt.vosk import VoskSTT
+
+        words = VoskSTT._parse_words(
+            '{"result": [{"word": "ls", "conf": 0.9, "start": 0.1, "end": 0.4}], "text": "ls"}'
+        )
+        self.assertEqual([(w.word, w.confidence) for w in words], [("ls", 0.9)])
+
+    def test_whisper_cpp_json_words(self):
+        import json
+
+        from stts_core.providers.stt.whisper_cpp import WhisperCppSTT
+
+        data = {
+            "transcription": [
+                {
+                    "tokens": [
+                        {"text": "[_BEG_]", "p": 1.0, "offsets": {"from": 0, "to": 0}},
+                        {"text": " po", "p": 0.8, "offsets": {"from": 0, "to": 200}},
+                        {"text": "każ", "p": 0.6, "offsets": {"from": 200, "to": 400}},
+                        {"text": " pliki", "p": 0.9, "offsets": {"from": 400, "to": 800}},
+                    ]
+                }
+            ]
+        }
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "out.json")
+            Path(path).write_text(json.dumps(data), encoding="utf-8")
+            words = WhisperCppSTT._read_json_words(path)
+            self.assertFalse(os.path.exists(path))
+        self.assertEqual([w.word for w in words], ["pokaż", "pliki"])
+        self.assertAlmostEqual(words[0].confidence, 0.7)
+        self.assertAlmostEqual(words[0].end, 0.4)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+
+from stts_core.speculative import SpeculativeTranslator, attach_partials
+from stts_core.text import TextNormalizer
+
+
+class TestSpeculativeTranslator(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+        def translate(text):
+            with self.lock:
+                self.calls.append(text)
+            time.sleep(0.2)
+            return "cmd:" + text
+
+        self.spec = SpeculativeTranslator(translate, stable_count=2, min_words=2, normalize=TextNormalizer.normalize)
+
+    def tearDown(self):
+        self.spec.close()
+
+    def test_commits_stable_final(self):
+        for p in ("pokaż", "pokaż pliki", "pokaż pliki w", "pokaż pliki w tmp", "pokaż pliki w tmp"):
+            self.spec.feed(p)
+        self.assertEqual(self.spec.stats["speculated"], 3)
+        time.sleep(0.5)
+        self.assertEqual(self.calls, ["pokaż pliki", "pokaż pliki w", "pokaż pliki w tmp"])
+        t0 = time.monotonic()
+        self.assertEqual(self.spec.finalize("pokaż pliki w tmp."), (True, "cmd:pokaż pliki w tmp"))
+        self.assertLess(time.monotonic() - t0, 0.15)
+        self.assertEqual(self.spec.stats["committed"], 1)
+        self.assertEqual(self.spec.stats["discarded"], 2)
+
+    def test_discards_when_final_differs(self):
+        for p in ("lista plików", "lista plików"):
+            self.spec.feed(p)
+        self.assertEqual(self.spec.finalize("lista kontenerów"), (False, None))
+        self.assertEqual(self.spec.stats["discarded"], 1)
+
+    def test_translates_original_text(self):
+        for p in ("pokaż plik /etc/hosts", "pokaż plik /etc/hosts"):
+            self.spec.feed(p)
+        self.assertEqual(self.spec.finalize("pokaż plik /etc/hosts"), (True, "cmd:pokaż plik /etc/hosts"))
+        self.assertEqual(self.calls, ["pokaż plik /etc/hosts"])
+
+    def test_requires_exact_match_after_normalization(self):
+        for p in ("pokaż plik etc hosts", "pokaż plik etc hosts"):
+            self.spec.feed(p)
+        self.assertEqual(self.spec.finalize("pokaż plik /etc/hosts"), (False, None))
+        for p in ("Pokaż pliki", "Pokaż pliki"):
+            self.spec.feed(p)
+        self.assertEqual(self.spec.finalize("pokaż pliki"), (False, None))
+
+    def test_unstable_partials_are_not_translated(self):
+        for p in ("git", "kit status", "git status"):
+            self.spec.feed(p)
+        self.assertEqual(self.calls, [])
+
+    def test_attach_partials_to_cascade_stages(self):
+        class P:
+            on_partial = None
+
+        cascade = P()
+        cascade.draft, cascade.accurate = P(), P()
+        attach_partials(cascade, self.spec.feed)
+        self.assertEqual(cascade.draft.on_partial, self.spec.feed)
+        attach_partials(cascade, None)
+        self.assertIsNone(cascade.accurate.on_partial)
+
+
+if __name__ == "__main__":
+    unittest.main()
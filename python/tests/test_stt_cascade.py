@@ -0,0 +1,68 @@
+import unittest
+
+from stts_core.providers import STTProvider
+from stts_core.stt_cascade import CascadeSTT
+
+
+class _FakeSTT(STTProvider):
+    name = "fake"
+
+    def __init__(self, text, confidence=None):
+        super().__init__(model="m", language="pl", config={})
+        self.text = text
+        self.confidence = confidence
+        self.calls = 0
+
+    def transcribe(self, audio_path: str) -> str:
+        self.calls += 1
+        self._set_details(confidence=self.confidence)
+        return self.text
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = 16000) -> str:
+        return self.transcribe("")
+
+
+class TestCascadeSTT(unittest.TestCase):
+    def test_confident_draft_skips_accurate(self):
+        draft, acc = _FakeSTT("pokaż pliki", 0.9), _FakeSTT("pokaż wszystkie pliki")
+        c = CascadeSTT(draft, acc, min_confidence=0.6)
+        self.assertEqual(c.transcribe("/tmp/x.wav"), "pokaż pliki")
+        self.assertEqual(acc.calls, 0)
+        self.assertFalse(c.last_result.escalated)
+
+    def test_low_confidence_escalates(self):
+        draft, acc = _FakeSTT("pokasz pliki", 0.3), _FakeSTT("pokaż pliki")
+        c = CascadeSTT(draft, acc, min_confidence=0.6)
+        self.assertEqual(c.transcribe_pcm(b"\x00\x00" * 10), "pokaż pliki")
+        res = c.last_result
+        self.assertTrue(res.escalated)
+        self.assertEqual(res.reason, "low_confidence")
+        self.assertEqual(res.draft_text, "pokasz pliki")
+        self.assertGreaterEqual(res.final_s, 0.0)
+
+    def test_empty_draft_escalates(self):
+        c = CascadeSTT(_FakeSTT(""), _FakeSTT("ls"))
+        self.assertEqual(c.transcribe("/tmp/x.wav"), "ls")
+        self.assertEqual(c.last_result.reason, "empty_draft")
+
+    def test_accept_patterns(self):
+        acc = _FakeSTT("hejken pokaż pliki")
+        c = CascadeSTT(_FakeSTT("hej ten pokaż pliki"), acc, accept_patterns=[r"\bhejken\b"])
+        self.assertEqual(c.transcribe("/tmp/x.wav"), "hejken pokaż pliki")
+        self.assertEqual(c.last_result.reason, "no_pattern_match")
+
+        c2 = CascadeSTT(_FakeSTT("hejken ls"), _FakeSTT("x"), accept_patterns=[r"\bhejken\b"])
+        self.assertEqual(c2.transcribe("/tmp/x.wav"), "hejken ls")
+
+    def test_refine_once(self):
+        acc = _FakeSTT("pokaż procesy")
+        c = CascadeSTT(_FakeSTT("pokaż proces", 0.95), acc)
+        self.assertEqual(c.transcribe("/tmp/x.wav"), "pokaż proces")
+        self.assertEqual(c.refine("nlp2cmd_failed"), "pokaż procesy")
+        self.assertEqual(c.last_result.reason, "nlp2cmd_failed")
+        self.assertIsNone(c.refine())
+        self.assertEqual(acc.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
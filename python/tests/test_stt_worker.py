@@ -0,0 +1,84 @@
+import os
+import time
+import unittest
+from concurrent.futures import CancelledError
+
+from stts_core.providers import STTProvider
+from stts_core.stt_worker import STTWorkerPool
+
+
+class _EchoSTT(STTProvider):
+    name = "echo"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pid = os.getpid()
+
+    def transcribe(self, audio_path: str) -> str:
+        if audio_path.startswith("sleep:"):
+            time.sleep(float(audio_path.split(":", 1)[1]))
+        if audio_path == "grammar":
+            return str(self.config.get("stt_vosk_grammar"))
+        return f"{audio_path}@{self.pid}"
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = 16000) -> str:
+        return f"pcm:{len(pcm)}:{sample_rate}"
+
+
+class _BrokenSTT(_EchoSTT):
+    def __init__(self, *args, **kwargs):
+        raise OSError("model not found")
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "fork start method required")
+class TestSTTWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = STTWorkerPool(_EchoSTT, {"language": "en"}, workers=1, default_timeout_s=5.0)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_model_stays_resident_in_worker(self):
+        a = self.pool.submit_file("a").result(timeout=10)
+        b = self.pool.submit_file("b").result(timeout=10)
+        self.assertEqual(a.split("@")[1], b.split("@")[1])
+        self.assertNotEqual(a.split("@")[1], str(os.getpid()))
+
+    def test_pcm_job(self):
+        fut = self.pool.submit_pcm(b"\x00\x00" * 10, 8000)
+        self.assertEqual(fut.result(timeout=10), "pcm:20:8000")
+
+    def test_config_overrides_are_forwarded(self):
+        fut = self.pool.submit_file("grammar", overrides={"stt_vosk_grammar": "[\"ken\"]"})
+        self.assertEqual(fut.result(timeout=10), "[\"ken\"]")
+
+    def test_timeout_respawns_worker(self):
+        slow = self.pool.submit_file("sleep:5", timeout_s=0.3)
+        with self.assertRaises(TimeoutError):
+            slow.result(timeout=10)
+        self.assertEqual(self.pool.stats["respawns"], 1)
+        self.assertTrue(self.pool.submit_file("after").result(timeout=10).startswith("after@"))
+
+    def test_cancel_queued_job(self):
+        running = self.pool.submit_file("sleep:0.5")
+        queued = self.pool.submit_file("never")
+        self.assertTrue(self.pool.cancel(queued))
+        with self.assertRaises(CancelledError):
+            queued.result(timeout=1)
+        self.assertTrue(running.result(timeout=10).startswith("sleep:0.5@"))
+
+    def test_init_failure_fails_jobs(self):
+        pool = STTWorkerPool(_BrokenSTT, {"language": "en"}, workers=2, default_timeout_s=5.0)
+        try:
+            queued = pool.submit_file("a")
+            with self.assertRaisesRegex(RuntimeError, "model not found"):
+                queued.result(timeout=10)
+            self.assertIn("model not found", pool.init_error)
+            with self.assertRaisesRegex(RuntimeError, "init failed"):
+                pool.submit_file("b").result(timeout=0.1)  # rejected at once, not queued
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from stts_core.translation_cache import TranslationCache, cache_key
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="stts_cache_")
+        self.path = Path(self._tmp.name) / "nlp2cmd_cache.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_key_normalization(self):
+        self.assertEqual(cache_key("  Pokaż   pliki. "), "pokaż pliki")
+        self.assertEqual(cache_key("Pokaż PLIKI"), "pokaż PLIKI")
+
+    def test_arguments_keep_case(self):
+        c = TranslationCache(self.path, version="1")
+        c.put("utwórz plik README", "touch README")
+        self.assertIsNone(c.get("utwórz plik readme"))
+        self.assertEqual(c.get("Utwórz plik README"), "touch README")
+
+    def test_hit_miss_and_persistence(self):
+        c = TranslationCache(self.path, version="1")
+        self.assertIsNone(c.get("pokaż pliki"))
+        c.put("pokaż pliki", "ls -la")
+        self.assertEqual(c.get("Pokaż pliki!"), "ls -la")
+        c.save()
+
+        c2 = TranslationCache(self.path, version="1")
+        self.assertEqual(c2.get("pokaż pliki"), "ls -la")
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(data["entries"]["pokaż pliki"]["hits"], 1)
+
+    def test_version_change_invalidates(self):
+        c = TranslationCache(self.path, version="1")
+        c.put("git status", "git status")
+        c2 = TranslationCache(self.path, version="2")
+        self.assertIsNone(c2.get("git status"))
+        self.assertEqual(len(c2), 0)
+
+    def test_ttl_expiry(self):
+        c = TranslationCache(self.path, version="1", ttl_s=60)
+        c.put("lista kontenerów", "docker ps")
+        c._entries["lista kontenerów"]["ts"] = time.time() - 120
+        self.assertIsNone(c.get("lista kontenerów"))
+        self.assertEqual(len(c), 0)
+
+    def test_eviction_keeps_popular(self):
+        c = TranslationCache(self.path, version="1", max_entries=2)
+        c.put("a", "cmd a")
+        c.get("a")
+        c.put("b", "cmd b")
+        c.put("c", "cmd c")
+        self.assertEqual(c.get("a"), "cmd a")
+        self.assertIsNone(c.get("b"))
+        self.assertEqual(c.get("c"), "cmd c")
+
+    def test_eviction_spares_new_entry(self):
+        c = TranslationCache(self.path, version="1", max_entries=3)
+        for t in ("a", "b", "c"):
+            c.put(t, f"cmd {t}")
+            c.get(t)
+        c._entries["a"]["hits"] = 50
+        c._entries["a"]["last"] = time.time() - 30 * 24 * 3600  # popular long ago
+        c.put("nowe polecenie", "cmd new")
+        self.assertEqual(c.get("nowe polecenie"), "cmd new")
+        self.assertIsNone(c.get("a"))
+        self.assertEqual(len(c), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+from stts_core.daemon_handlers import DaemonHandlers
+from stts_core.triggers import PatternSet, TriggerIndex, required_literal, validate_rule
+
+
+class TestTriggerIndex(unittest.TestCase):
+    def test_exact_and_regex_precedence(self):
+        idx = TriggerIndex(
+            [
+                ("pokaż dysk", "df -h", False),
+                (r"dysk", "du -sh .", True),
+                (r"^restart (?P<svc>\w+)", "systemctl restart", True),
+                (r"(?i)^stop (?P<svc>\w+)", "systemctl stop", True),
+                ("Pokaż Dysk", "shadowed", False),
+            ]
+        )
+        self.assertEqual(idx.match("  POKAŻ dysk ").command, "df -h")
+        self.assertEqual(idx.match("ile zajmuje dysk").command, "du -sh .")
+        m = idx.match("Restart nginx teraz")
+        self.assertEqual((m.command, m.groups), ("systemctl restart", {"svc": "nginx"}))
+        self.assertEqual(idx.match("stop redis").groups, {"svc": "redis"})
+        self.assertIsNone(idx.match("uruchom testy"))
+        self.assertIsNone(idx.match(""))
+        # still usable as the plain rule list
+        self.assertEqual(len(idx), 5)
+        self.assertEqual(idx[0], ("pokaż dysk", "df -h", False))
+
+    def test_rule_order_wins_over_exact_phrase(self):
+        idx = TriggerIndex([(r"^pokaż", "ls", True), ("pokaż dysk", "df -h", False)])
+        self.assertEqual(idx.match("pokaż dysk").command, "ls")
+
+    def test_prefilter_by_required_literal(self):
+        self.assertEqual(required_literal(r"(?i)^Restart (?P<svc>\w+)x?"), "restart ")
+        self.assertEqual(required_literal(r"start|stop"), "st")
+        self.assertEqual(required_literal(r"start|koniec"), "")
+        ps = PatternSet([r"(unclosed", r"^restart (\w+)", r"(\w+) \1", r"zatrzymaj"])
+        self.assertEqual([e[0] for e in ps.errors], [0])
+        self.assertEqual(ps.candidates("RESTART nginx"), [1, 2])
+        self.assertEqual(ps.search("restart nginx"), (1, {}))
+        self.assertEqual(ps.search("to to")[0], 2)
+        self.assertEqual(ps.search("Zatrzymaj to"), (3, {}))
+        self.assertIsNone(ps.search("nic"))
+
+    def test_file_change_is_noticed(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "triggers.txt"
+            path.write_text("a=echo a\n")
+            idx = TriggerIndex([("a", "echo a", False)], source=str(path), check_interval_s=0)
+            self.assertFalse(idx.changed())
+            path.write_text("a=echo a\nb=echo b\n")
+            os.utime(path, (time.time() + 5, time.time() + 5))
+            self.assertTrue(idx.changed())
+
+
+class TestParameterizedTriggers(unittest.TestCase):
+    def test_named_groups_fill_the_command_shell_quoted(self):
+        idx = TriggerIndex([(r"^restartuj (?P<svc>\S+)(?: na (?P<host>\S+))?", "ssh {host} systemctl restart {svc}", True)])
+        m = idx.match("restartuj nginx na web1")
+        self.assertEqual((m.command, m.groups), ("ssh web1 systemctl restart nginx", {"svc": "nginx", "host": "web1"}))
+        self.assertEqual(idx.match("restartuj nginx;reboot").command, "ssh '' systemctl restart 'nginx;reboot'")
+        self.assertEqual(idx.match("restartuj $(id)").command, "ssh '' systemctl restart '$(id)'")
+
+    def test_rejected_at_load(self):
+        self.assertIn("svc", validate_rule((r"restartuj (\w+)", "systemctl restart {svc}", True)))
+        self.assertIn("placeholders", validate_rule(("restartuj", "systemctl restart {svc}", False)))
+        self.assertIsNone(validate_rule(("dom", "cd ${HOME} && ls", False)))
+        idx = TriggerIndex([(r"a(?P<x>\w+)", "echo {y}", True), ("b", "echo b", False)])
+        self.assertEqual(list(idx), [("b", "echo b", False)])
+        self.assertEqual(len(idx.errors), 1)
+
+
+class TestDaemonTriggerReload(unittest.TestCase):
+    def test_reloads_when_file_changes(self):
+        deps = types.SimpleNamespace(match_trigger=lambda text, rules: (rules.match(text) or types.SimpleNamespace(command=None)).command)
+        h = DaemonHandlers(types.SimpleNamespace(deps=deps, config={}, stt=None))
+        h.log = lambda msg: None
+        state = {"rules": [("a", "echo a", False)]}
+        changed = iter([False, True])
+        h.trigger_loader = lambda: TriggerIndex(state["rules"])
+        h.reload_triggers()
+        h.triggers.changed = lambda: next(changed)
+        self.assertIsNone(h.match_trigger_command("b"))
+        state["rules"] = [("b", "echo b", False)]
+        self.assertEqual(h.match_trigger_command("b"), "echo b")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import sys
+import tempfile
+import types
+import unittest
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+from stts_core.daemon_handlers import DaemonHandlers
+from stts_core.wake_spotter import VoskWakeSpotter, build_wake_spotter
+
+
+def _fake_vosk(heard, vocab=("hejken", "hej", "ken")):
+    mod = types.ModuleType("vosk")
+    mod.fed = []
+    mod.grammars = []
+
+    class Model:
+        def __init__(self, path):
+            self.path = path
+
+        def find_word(self, w):
+            return 1 if w in vocab else -1
+
+    class KaldiRecognizer:
+        def __init__(self, model, rate, grammar=None):
+            mod.grammars.append(json.loads(grammar))
+
+        def AcceptWaveform(self, data):
+            mod.fed.append(len(data))
+            return False
+
+        def FinalResult(self):
+            return json.dumps({"text": heard})
+
+    mod.Model = Model
+    mod.KaldiRecognizer = KaldiRecognizer
+    mod.SetLogLevel = lambda level: None
+    return mod
+
+
+def _wav(path, seconds, rate=16000):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"\0\0" * int(rate * seconds))
+    return str(path)
+
+
+class TestVoskWakeSpotter(unittest.TestCase):
+    def setUp(self):
+        self.td = tempfile.TemporaryDirectory()
+        self.addCleanup(self.td.cleanup)
+        self.audio = _wav(Path(self.td.name) / "a.wav", 5.0)
+
+    def test_fires_only_on_wake_phrase_and_reads_only_the_window(self):
+        vosk = _fake_vosk("[unk] hej ken [unk]")
+        with patch.dict(sys.modules, {"vosk": vosk}):
+            sp = VoskWakeSpotter(["hej ken", "heyken"], "model", window_s=1.0)
+            self.assertTrue(sp.detect(self.audio))
+        # out-of-vocabulary variants are left out of the grammar
+        self.assertEqual(vosk.grammars[0], ["hej ken", "[unk]"])
+        self.assertEqual(sum(vosk.fed), 16000 * 2)
+
+        with patch.dict(sys.modules, {"vosk": _fake_vosk("[unk] ken")}):
+            sp = VoskWakeSpotter(["hej ken"], "model")
+            self.assertFalse(sp.detect(self.audio))
+        self.assertEqual(sp.stats["rejected"], 1)
+
+    def test_fails_open(self):
+        with patch.dict(sys.modules, {"vosk": _fake_vosk("[unk]", vocab=())}):
+            self.assertIsNone(VoskWakeSpotter(["hejken"], "model").detect(self.audio))
+        with patch.dict(sys.modules, {"vosk": _fake_vosk("hejken")}):
+            self.assertIsNone(VoskWakeSpotter(["hejken"], "model").detect(str(Path(self.td.name) / "missing.wav")))
+
+    def test_build_respects_mode_and_provider(self):
+        self.assertIsNone(build_wake_spotter({"wake_spotter": "off"}, "hejken"))
+        self.assertIsNone(build_wake_spotter({"wake_spotter": "auto", "stt_provider": "vosk"}, "hejken"))
+        with patch.dict(sys.modules, {"vosk": _fake_vosk("hejken")}):
+            sp = build_wake_spotter(
+                {"wake_spotter": "vosk", "wake_spotter_model": self.td.name}, "hejken", lambda w, max_variants: [w, "hej ken"]
+            )
+        self.assertEqual(sp.model_path, self.td.name)
+
+
+class TestWakeGate(unittest.TestCase):
+    def test_armed_daemon_skips_the_spotter(self):
+        shell = types.SimpleNamespace(deps=types.SimpleNamespace(), config={})
+        h = DaemonHandlers(shell)
+        h.spotter = types.SimpleNamespace(detect=lambda path: False)
+        self.assertFalse(h.wake_gate("a.wav"))
+        h._armed_until[None] = float("inf")
+        self.assertTrue(h.wake_gate("a.wav"))
+        h.spotter = types.SimpleNamespace(detect=lambda path: None)
+        h._armed_until.clear()
+        self.assertTrue(h.wake_gate("a.wav"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import types
+import unittest
+from unittest.mock import patch
+
+from stts_core import wake_word
+from stts_core.daemon_handlers import DaemonHandlers
+from stts_core.wake_word import WAKE_WORD_PATTERNS, check_wake_word, compile_wake_patterns, match_wake_word
+
+
+class TestWakeWordMatcher(unittest.TestCase):
+    def test_reports_variant_and_remainder(self):
+        m = match_wake_word("„Hej, ken: pokaż pliki")
+        self.assertEqual((m.variant, m.pattern, m.remaining), (0, WAKE_WORD_PATTERNS[0], "pokaż pliki"))
+        self.assertEqual(match_wake_word("ken ls").pattern, r"^ken\b")
+        self.assertIsNone(match_wake_word("kenia ls"))
+        self.assertEqual(check_wake_word("hej ten ken, proszę ls"), (True, "proszę ls"))
+        self.assertEqual(check_wake_word("nic"), (False, "nic"))
+
+    def test_first_pattern_in_order_wins(self):
+        m = match_wake_word("komputer ls", patterns=[r"^kom\w*", r"^komputer\b"])
+        self.assertEqual((m.variant, m.remaining), (0, "ls"))
+
+    def test_compiled_once_per_pattern_tuple(self):
+        pats = (r"^komputer\b", r"^hej\W*komputer\b")
+        self.assertIs(compile_wake_patterns(pats), compile_wake_patterns(pats))
+        with patch.object(wake_word.re, "compile", side_effect=AssertionError("recompiled")):
+            self.assertEqual(check_wake_word("hej, komputer ls", list(pats)), (True, "ls"))
+
+    def test_falls_back_when_patterns_cannot_be_combined(self):
+        pats = (r"^(?P<a>hej)\W*ken", r"^(?P<a>ken)\b")
+        self.assertEqual(check_wake_word("ken ls", list(pats)), (True, "ls"))
+
+
+class TestDaemonReusesTranscribeMatch(unittest.TestCase):
+    def test_cached_match_and_variant_counts(self):
+        calls = []
+
+        def match(text, patterns=None):
+            calls.append(text)
+            return match_wake_word(text, patterns)
+
+        deps = types.SimpleNamespace(match_wake_word=match, normalize_daemon_command=lambda t: t)
+        shell = types.SimpleNamespace(deps=deps, config={}, tts=None, stt=None)
+        h = DaemonHandlers(shell)
+        h.log = lambda msg: None
+        shell.last_wake_match = ("hejken ls", (), match_wake_word("hejken ls"))
+        self.assertEqual(h.process_wake_word("hejken ls"), (True, "ls"))
+        self.assertEqual(calls, [])
+        self.assertEqual(h.process_wake_word("ken df"), (True, "df"))
+        self.assertEqual(calls, ["ken df"])
+        self.assertEqual(h.metrics()["wake_variants"], {WAKE_WORD_PATTERNS[0]: 1, r"^ken\b": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()